@@ -26,6 +26,15 @@ if [ -d ../build_linux_32bit ] ; then
     rm -rf ../build_linux_32bit
 fi
 source ~/.virtualenvs/weather_app_32b_env/bin/activate
+echo Downloading city list.
+
+python download_cities.py
+if [ $? -ne 0 ] ; then
+    deactivate
+    echo Downloading city list failed. Autocompletion needs the city list.
+    exit 1
+fi
+
 echo Running cx_Freeze script.
 
 python ../Cx_Freeze_Configs/cx_setup_linux_32bit.py </dev/tty build -b ../build_linux_32bit &
@@ -15,6 +15,12 @@ if exist ..\build_32bit (
     echo Deleting build directory.
     rmdir ..\build_32bit /s /q
 )
+echo Downloading city list.
+python download_cities.py
+if %ERRORLEVEL% NEQ 0 (
+echo Downloading city list failed. Autocompletion needs the city list.
+goto terminate
+)
 echo Running cx_Freeze script.
 start /wait python ..\Cx_Freeze_Configs\cx_setup_windows_32bit.py build -b ..\build_32bit
 if %ERRORLEVEL% EQU 0 (
@@ -15,6 +15,12 @@ if exist ..\build_64bit (
     echo Deleting build directory.
     rmdir ..\build_64bit /s /q
 )
+echo Downloading city list.
+python download_cities.py
+if %ERRORLEVEL% NEQ 0 (
+echo Downloading city list failed. Autocompletion needs the city list.
+goto terminate
+)
 echo Running cx_Freeze script.
 start /wait python ..\Cx_Freeze_Configs\cx_setup_windows_64bit.py build -b ..\build_64bit
 if %ERRORLEVEL% EQU 0 (
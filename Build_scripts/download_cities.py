@@ -0,0 +1,107 @@
+"""Downloads the Open Weather city list used for autocompletion.
+
+The list is saved to weather_app/Data/Cities/city.list.json.gz, from
+where the cx_Freeze scripts bundle it with the rest of the Data folder.
+Run it before building the application:
+
+    python download_cities.py [--force]
+
+An existing list is kept unless --force is given.
+
+"""
+import os
+import sys
+import gzip
+import json
+import argparse
+import requests
+
+CITIES_URL = "http://bulk.openweathermap.org/sample/city.list.json.gz"
+CITIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                           "weather_app", "Data", "Cities",
+                           "city.list.json.gz")
+
+
+def download(url, path, timeout=30):
+    """Downloads the city list to path.
+
+    The list is written to a temporary file first and replaces path
+    only when it is a valid city list, so an interrupted download never
+    leaves a broken file behind.
+
+    Args:
+        url (str): Address of the gzipped city list.
+        path (str): Destination of the file.
+        timeout (float): Timeout of the connection in seconds.
+
+    Returns:
+        amount (int): Amount of cities in the list.
+
+    Raises:
+        requests.RequestException: The download failed.
+        ValueError: The file is not a valid city list.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part_path = path + ".part"
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(part_path, "wb") as file:
+                for chunk in response.iter_content(chunk_size=65536):
+                    file.write(chunk)
+        amount = validate(part_path)
+        os.replace(part_path, path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    return amount
+
+
+def validate(path):
+    """Checks if the file is a gzipped city list in the format of
+    city.list.json.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        amount (int): Amount of cities in the list.
+
+    Raises:
+        ValueError: The file is not a valid city list.
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            cities = json.load(file)
+    except (OSError, EOFError, ValueError) as error:
+        raise ValueError("Not a gzipped json file: {0}".format(error))
+    if not isinstance(cities, list) or not cities or \
+            not all(isinstance(city, dict) and "name" in city and
+                    "country" in city for city in cities):
+        raise ValueError("Not a list of cities with names and countries.")
+    return len(cities)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true",
+                        help="download again even if the list exists")
+    parser.add_argument("--url", default=CITIES_URL)
+    args = parser.parse_args()
+
+    path = os.path.normpath(CITIES_FILE)
+    if os.path.exists(path) and not args.force:
+        print("City list already present: {0}".format(path))
+        return 0
+    print("Downloading city list from {0}".format(args.url))
+    try:
+        amount = download(args.url, path)
+    except (requests.RequestException, ValueError) as error:
+        print("Downloading city list failed: {0}".format(error))
+        return 1
+    print("Saved {0} cities to {1}".format(amount, path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,10 @@ base = None
 # base = "Console" # use for testing in deployed version
 
 DATA_DIR = "../weather_app/Data/"
+# City list for autocompletion, bundled with the rest of DATA_DIR.
+CITIES_FILE = os.path.join(DATA_DIR, "Cities", "city.list.json.gz")
+if not os.path.exists(CITIES_FILE):
+    sys.exit("City list missing, run Build_scripts/download_cities.py.")
 
 if sys.platform == "win32":
     base = "Win32GUI"
@@ -29,7 +33,7 @@ include_files = [DATA_DIR,
 
 includes = []
 excludes = ["PyQt5"]
-packages = ["tkinter", "idna", "multiprocessing", "PIL"]
+packages = ["tkinter", "idna", "multiprocessing", "PIL", "numpy"]
 executables = [cx_Freeze.Executable("../weather_app/weather_gui.py",
                                     base=base,
                                     icon=os.path.join(DATA_DIR,
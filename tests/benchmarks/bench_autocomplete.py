@@ -0,0 +1,78 @@
+"""Benchmark of autocompletion of locations in loc_combobox.
+
+Builds LocationIndex out of a synthetic city list of about 200k names
+(the size of the Open Weather city.list.json) and a search history,
+then times LocationIndex.complete for every prefix of typed names, as
+called on each keystroke. Compares it with a scan of all names.
+Not collected by pytest, run it directly:
+
+    python tests/benchmarks/bench_autocomplete.py
+
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import tempfile
+import statistics
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                        "..")
+sys.path[:0] = [os.path.join(root_dir, "weather_app"), root_dir]
+
+from weather_backend import LocationIndex
+from tests.synthetic_report import make_cities
+
+
+def scan_complete(names, calls, text, limit=10):
+    """Scan of all names for comparison with LocationIndex.complete."""
+    prefix = LocationIndex.normalize(text)
+    found = [name for name in names
+             if LocationIndex.normalize(name).startswith(prefix)]
+    found.sort(key=lambda name: (-calls.get(name, 0), name))
+    return found[:limit]
+
+
+def main():
+    cities = make_cities(200000)
+    path = os.path.join(tempfile.mkdtemp(), "city.list.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(cities, file)
+    rnd = random.Random(1)
+    names = sorted({"{0}, {1}".format(city["name"], city["country"])
+                    for city in cities})
+    history = [(name, rnd.randint(1, 50)) for name in rnd.sample(names, 500)]
+
+    index = LocationIndex()
+    start = time.perf_counter()
+    index.load_history(history)
+    index.load_cities(path)
+    print("{0} names, {1} keys indexed in {2:.2f} s".format(
+        len(names), len(index.cities[0]), time.perf_counter() - start))
+
+    # Every prefix of names as typed by the user.
+    typed = [name for name, _ in rnd.sample(history, 50)] + \
+        rnd.sample(names, 50)
+    prefixes = [name[:i] for name in typed for i in range(1, len(name) + 1)]
+    times = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.complete(prefix)
+        times.append(time.perf_counter() - start)
+    print("complete, {0} keystrokes:".format(len(prefixes)))
+    print("  median {0:8.1f} us".format(statistics.median(times) * 1e6))
+    print("  max    {0:8.1f} us".format(max(times) * 1e6))
+
+    calls = dict(history)
+    start = time.perf_counter()
+    scan = scan_complete(names, calls, typed[0][:3])
+    print("scan of all names, one keystroke: {0:.1f} ms".format(
+        (time.perf_counter() - start) * 1e3))
+    # The index also matches later words of names.
+    assert set(scan) <= set(index.complete(typed[0][:3], limit=10 ** 6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark of converting wind directions to cardinal directions.
+
+Compares the lookup used by Report.finish_deg_conv and
+Report.finish_deg_conv_series with the interval scan it replaced.
+Not collected by pytest, run it directly:
+
+    python tests/benchmarks/bench_deg_conv.py
+
+"""
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", "weather_app"))
+
+from weather_backend import Report
+
+
+def interval_deg_conv(wind_dir_deg):
+    """Previous implementation of Report.finish_deg_conv."""
+    directions = {(348.75, 360): "N",
+                  (0, 11.25): "N",
+                  (11.25, 33.75): "NNE",
+                  (33.75, 56.25): "NE",
+                  (56.25, 78.75): "ENE",
+                  (78.75, 101.25): "E",
+                  (101.25, 123.75): "ESE",
+                  (123.75, 146.25): "SE",
+                  (146.25, 168.75): "SSE",
+                  (168.75, 191.25): "S",
+                  (191.25, 213.75): "SSW",
+                  (213.75, 236.25): "SW",
+                  (236.25, 258.75): "WSW",
+                  (258.75, 281.25): "W",
+                  (281.25, 303.75): "WNW",
+                  (303.75, 326.25): "NW",
+                  (326.25, 348.75): "NNW"}
+
+    for interval, wind_dir_cardinal in directions.items():
+        if interval[0] <= wind_dir_deg < interval[1]:
+            return wind_dir_cardinal
+
+
+def bench(name, function, repeat=5, number=200):
+    """Prints the best time of a single call of function."""
+    best = min(timeit.repeat(function, repeat=repeat, number=number))
+    print("{0:<40}{1:>10.2f} us".format(name, best / number * 1e6))
+
+
+def main():
+    random.seed(0)
+    # One forecast (40 items) and a long series.
+    for size in [40, 10000]:
+        degrees = [random.uniform(0, 360) for _ in range(size)]
+        assert [interval_deg_conv(deg) for deg in degrees] == \
+            [Report.finish_deg_conv(deg) for deg in degrees] == \
+            Report.finish_deg_conv_series(degrees)
+
+        print("{0} values:".format(size))
+        bench("  interval scan, per value",
+              lambda: [interval_deg_conv(deg) for deg in degrees])
+        bench("  arithmetic index, per value",
+              lambda: [Report.finish_deg_conv(deg) for deg in degrees])
+        bench("  arithmetic index, series",
+              lambda: Report.finish_deg_conv_series(degrees))
+
+
+if __name__ == "__main__":
+    main()
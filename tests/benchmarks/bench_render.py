@@ -0,0 +1,216 @@
+"""Benchmark of building and drawing weather reports in the GUI.
+
+Replays reports of several scenarios through the debug path of Report
+(controller.debug == 1), which loads metric_w_d_cur.json and the other
+Debug folder files instead of contacting the APIs. Fixtures of every
+scenario are generated by tests/synthetic_report.py and written to a
+temporary application data folder, so files of the installed
+application stay untouched.
+
+Times Report.finish_get_report, redrawing a report with
+DisplayShort.display_report (reusing canvas items and from scratch) and
+switching units before and after the hidden display is rendered. Only
+the Python side is timed, Tk redraws the screen in idle time between
+the runs.
+
+Needs an X server. Without DISPLAY set, a virtual one is started with
+Xvfb. Not collected by pytest, run it directly:
+
+    python tests/benchmarks/bench_render.py [--save-baseline]
+
+Medians are compared with the baseline saved before and measures slower
+by more than 10% are reported as regressions (exit status 1).
+
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                        "..")
+sys.path[:0] = [os.path.join(root_dir, "weather_app"), root_dir]
+
+from tests.synthetic_report import make_report
+
+# Reports of different sizes and contents. Keyword arguments of
+# make_report.
+scenarios = {"no_rain": {"seed": 0, "rain": False, "snow": False},
+             "rain_snow": {"seed": 1, "rain": True, "snow": True},
+             "polar": {"seed": 2, "rain": False, "snow": True, "items": 37,
+                       "country": "", "name": "McMurdo Station",
+                       "lat": -77.85, "lon": 166.67, "dst_offset": 13}}
+
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "bench_render_baseline.json")
+# Allowed slowdown against the baseline.
+tolerance = 0.10
+
+
+def start_xvfb():
+    """Starts a virtual X server and points DISPLAY to it."""
+    for number in range(99, 200):
+        if not os.path.exists("/tmp/.X{0}-lock".format(number)):
+            break
+    server = subprocess.Popen(["Xvfb", ":{0}".format(number), "-screen", "0",
+                               "1920x1080x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    atexit.register(server.terminate)
+    socket = "/tmp/.X11-unix/X{0}".format(number)
+    for _ in range(100):
+        if os.path.exists(socket):
+            break
+        time.sleep(0.05)
+    else:
+        sys.exit("Xvfb did not start.")
+    os.environ["DISPLAY"] = ":{0}".format(number)
+
+
+def write_fixtures(debug_dir, report):
+    """Writes a report as the Debug folder files of Report."""
+    from weather_backend import UnitConverter
+    for units in ["metric", "imperial"]:
+        for key in ["w_d_cur", "w_d_short", "w_d_long"]:
+            weather_dict = report[key]
+            if units == "imperial":
+                weather_dict = UnitConverter.to_imperial(weather_dict, key)
+            path = os.path.join(debug_dir, units + "_" + key + ".json")
+            with open(path, "w") as file:
+                json.dump(weather_dict, file)
+    with open(os.path.join(debug_dir, "time_zone.json"), "w") as file:
+        json.dump(report["timezone"], file)
+
+
+def measure(run, setup=None, repeat=20):
+    """Returns the median time of run in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def bench_scenario(app, report, repeat):
+    """Times all measures of a single scenario."""
+    controller = app.controller
+    v_link = app.v_link
+    debug_dir = controller.model.data_dirs["Debug"]
+    write_fixtures(debug_dir, report)
+    v_link["var_loc"].set(report["w_d_cur"]["name"])
+    results = {}
+
+    def select_metric():
+        v_link["var_units"].set("metric")
+        app.update_buttons()
+        app.update()
+
+    # Time to the first paint of a report. The hidden display is
+    # rendered afterwards in idle time.
+    results["finish_get_report"] = measure(controller.get_report,
+                                           select_metric, repeat)
+    app.update()
+
+    display = app.displays["metric"]
+    results["display_report"] = measure(display.display_report,
+                                        app.update, repeat)
+
+    def release():
+        display.report_pool.release(display.main_canvas)
+        app.update()
+
+    results["display_report_fresh"] = measure(display.display_report,
+                                              release, repeat)
+
+    def new_report():
+        select_metric()
+        controller.get_report()
+
+    # Switching before idle time renders the hidden display first.
+    results["switch_units_pending"] = measure(display.imperial_pushed,
+                                              new_report, repeat)
+
+    def rendered_report():
+        new_report()
+        app.update()
+
+    results["switch_units_ready"] = measure(display.imperial_pushed,
+                                            rendered_report, repeat)
+    return results
+
+
+def compare(results, baseline):
+    """Prints results next to the baseline and returns regressions."""
+    regressions = []
+    print("{0:<34}{1:>12}{2:>12}{3:>9}".format("", "median ms",
+                                               "baseline", "change"))
+    for scenario, measures in results.items():
+        print(scenario)
+        for name, value in measures.items():
+            base = baseline.get(scenario, {}).get(name)
+            if base is None:
+                print("  {0:<32}{1:>12.2f}".format(name, value))
+                continue
+            change = value / base - 1
+            flag = ""
+            if change > tolerance:
+                flag = "  REGRESSION"
+                regressions.append((scenario, name))
+            print("  {0:<32}{1:>12.2f}{2:>12.2f}{3:>+8.0%}{4}".format(
+                name, value, base, change, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--baseline", default=default_baseline,
+                        help="Path of the baseline json file.")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Save results as the new baseline.")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Repetitions of every measure.")
+    args = parser.parse_args()
+
+    if not os.environ.get("DISPLAY"):
+        start_xvfb()
+    # Keep databases, cache and Debug files away from the data of the
+    # installed application.
+    os.environ["XDG_DATA_HOME"] = tempfile.mkdtemp()
+
+    from weather_gui import WeatherApp
+    app = WeatherApp()
+    app.controller.debug = 1
+    app.v_link["var_units"].set("metric")
+
+    results = {}
+    for scenario, kwargs in scenarios.items():
+        results[scenario] = bench_scenario(app, make_report(**kwargs),
+                                           args.repeat)
+    app.destroy()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print("Baseline saved in", args.baseline)
+    elif regressions:
+        print("{0} measures slower than baseline by more than {1:.0%}."
+              .format(len(regressions), tolerance))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
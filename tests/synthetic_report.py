@@ -0,0 +1,175 @@
+"""Synthetic weather reports for exercising the GUI without the API.
+
+Reports are built as Open Weather would send them (metric units) and
+loaded into the Controller the same way Report.finish_get_report does.
+City lists are built in the format of the Open Weather city.list.json.
+
+"""
+import random
+from weather_backend import UnitConverter, CurrentWeather, \
+    ForecastSeries, DaySummary, DailyForecast
+
+syllables = ["lon", "don", "kra", "kow", "war", "sza", "wa", "ber", "lin",
+             "par", "is", "new", "york", "san", "ta", "mar", "ia", "port",
+             "ville", "burg", "ham", "ton", "field", "rio", "de", "la",
+             "ka", "to", "ri", "mo", "sk", "an", "el", "os", "ú", "ø"]
+countries = ["GB", "PL", "US", "DE", "FR", "ES", "IT", "BR", "RU", "JP",
+             "CA", "AU", "IN", "CN", "MX", "NO"]
+
+
+def make_report(seed=0, items=40, rain=True, snow=False, country="GB",
+                name="London", lat=51.51, lon=-0.13, dst_offset=1,
+                start=1504656000, days=16):
+    """Builds metric weather reports and time zone of a location.
+
+    Args:
+        seed (int): Seed of the random values.
+        items (int): Amount of 3-hourly forecast items.
+        rain (bool): Set to True to add rain to some forecast items.
+        snow (bool): Set to True to add snow to some forecast items.
+        country (str): Country code. Empty string for locations outside
+            of any country (e.g. Antarctic).
+        name (str): Name of the location.
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+        dst_offset (float): Offset of the local time from UTC in hours.
+        start (int): Unix time of the first forecast item.
+        days (int): Amount of days of the daily forecast.
+
+    Returns:
+        report (dict): Current weather ("w_d_cur"), 3-hourly forecast
+            ("w_d_short"), daily forecast ("w_d_long") and time zone
+            ("timezone").
+    """
+    rnd = random.Random(seed)
+    icons = ["01d", "02d", "03d", "04d", "09d", "10d", "13d", "01n",
+             "02n", "10n"]
+
+    sys_dict = {"sunrise": start + 5 * 3600, "sunset": start + 19 * 3600}
+    if country:
+        sys_dict["country"] = country
+    w_d_cur = {"coord": {"lon": lon, "lat": lat},
+               "weather": [{"id": 800, "main": "Clear",
+                            "description": "clear sky",
+                            "icon": rnd.choice(icons)}],
+               "main": {"temp": round(rnd.uniform(-30, 35), 2),
+                        "pressure": round(rnd.uniform(960, 1040), 2),
+                        "humidity": rnd.randint(10, 100),
+                        "temp_min": round(rnd.uniform(-30, 0), 2),
+                        "temp_max": round(rnd.uniform(0, 35), 2)},
+               "wind": {"speed": round(rnd.uniform(0, 20), 2),
+                        "deg": round(rnd.uniform(0, 360), 2)},
+               "clouds": {"all": rnd.randint(0, 100)},
+               "dt": start,
+               "sys": sys_dict,
+               "timezone": int(dst_offset * 3600),
+               "name": name}
+
+    forecast = []
+    for i in range(items):
+        item = {"dt": start + i * 10800,
+                "main": {"temp": round(rnd.uniform(-30, 35), 2),
+                         "pressure": round(rnd.uniform(960, 1040), 2),
+                         "humidity": rnd.randint(10, 100)},
+                "weather": [{"icon": rnd.choice(icons)}],
+                "clouds": {"all": rnd.randint(0, 100)},
+                "wind": {"speed": round(rnd.uniform(0, 20), 2),
+                         "deg": round(rnd.uniform(0, 360), 2)}}
+        if rain and rnd.random() < 0.5:
+            item["rain"] = {"3h": round(rnd.uniform(0, 10), 3)}
+        if snow and rnd.random() < 0.5:
+            item["snow"] = {"3h": round(rnd.uniform(0, 10), 3)}
+        forecast.append(item)
+    w_d_short = {"cod": "200", "cnt": items, "list": forecast,
+                 "city": {"name": name, "country": country}}
+
+    descriptions = ["clear sky", "few clouds", "broken clouds",
+                    "light intensity shower rain", "moderate rain",
+                    "light snow"]
+    daily = []
+    for i in range(days):
+        temp_min = round(rnd.uniform(-30, 20), 2)
+        temp_max = round(temp_min + rnd.uniform(0, 15), 2)
+        item = {"dt": start + 12 * 3600 + i * 86400,
+                "temp": {"day": round((temp_min + temp_max) / 2, 2),
+                         "min": temp_min, "max": temp_max,
+                         "night": temp_min, "eve": temp_max,
+                         "morn": temp_min},
+                "pressure": round(rnd.uniform(960, 1040), 2),
+                "humidity": rnd.randint(10, 100),
+                "weather": [{"icon": rnd.choice(icons),
+                             "description": rnd.choice(descriptions)}],
+                "speed": round(rnd.uniform(0, 20), 2),
+                "deg": rnd.randint(0, 359),
+                "clouds": rnd.randint(0, 100)}
+        if rain and rnd.random() < 0.5:
+            item["rain"] = round(rnd.uniform(0, 20), 2)
+        if snow and rnd.random() < 0.5:
+            item["snow"] = round(rnd.uniform(0, 20), 2)
+        daily.append(item)
+    w_d_long = {"cod": "200", "cnt": days, "list": daily,
+                "city": {"name": name, "country": country}}
+
+    timezone = {"dstOffset": dst_offset, "gmtOffset": dst_offset,
+                "rawOffset": dst_offset}
+    return {"w_d_cur": w_d_cur, "w_d_short": w_d_short,
+            "w_d_long": w_d_long, "timezone": timezone}
+
+
+def load_report(controller, report):
+    """Loads a synthetic report into the Controller for displaying.
+
+    Args:
+        controller (Controller): Controller of the application.
+        report (dict): Report built by make_report.
+
+    Returns:
+        None
+    """
+    app_data = controller.app_data
+    app_data["timezone"] = report["timezone"]
+    utc_offset = round(report["timezone"]["dstOffset"] * 3600)
+    for units in ["metric", "imperial"]:
+        if units == "metric":
+            w_d_cur = report["w_d_cur"]
+            w_d_short = report["w_d_short"]
+            w_d_long = report["w_d_long"]
+        else:
+            w_d_cur = UnitConverter.to_imperial(report["w_d_cur"],
+                                                "w_d_cur")
+            w_d_short = UnitConverter.to_imperial(report["w_d_short"],
+                                                  "w_d_short")
+            w_d_long = UnitConverter.to_imperial(report["w_d_long"],
+                                                 "w_d_long")
+        hourly = ForecastSeries.from_list(w_d_short["list"])
+        app_data[units] = {"w_d_cur": w_d_cur,
+                           "current": CurrentWeather.from_dict(w_d_cur),
+                           "hourly": hourly,
+                           "days": DaySummary.from_series(hourly,
+                                                          utc_offset),
+                           "daily": DailyForecast.from_list(
+                               w_d_long["list"])}
+    app_data["time"] = "12:00  06/09/2017"
+    app_data["local_time"] = "13:00  06/09/2017"
+    controller.data_present = True
+
+
+def make_cities(amount, seed=0):
+    """Builds a city list in the format of city.list.json.
+
+    Args:
+        amount (int): Amount of cities, names may repeat.
+        seed (int): Seed of the random names.
+
+    Returns:
+        cities (list[dict]): Id, name and country code of each city.
+    """
+    rnd = random.Random(seed)
+    cities = []
+    for i in range(amount):
+        words = ["".join(rnd.choice(syllables)
+                         for _ in range(rnd.randint(1, 4))).capitalize()
+                 for _ in range(rnd.choice([1, 1, 1, 2, 3]))]
+        cities.append({"id": i, "name": " ".join(words),
+                       "country": rnd.choice(countries)})
+    return cities
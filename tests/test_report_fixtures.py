@@ -3,8 +3,20 @@ from unittest import mock
 import shutil
 import appdirs
 import os
-from weather_backend import Report
+import json
+import gzip
+import math
+import time
+import threading
+import sqlite3
+import requests
+from weather_backend import Report, FetchEngine, UnitConverter, \
+    ResponseCache, TimezoneStore, TimezoneResolver, app_timezones, \
+    ForecastStreamDecoder, CurrentWeather, ForecastSeries, DaySummary, \
+    DailyForecast, ReportPipeline, Database, LocationRanking, \
+    UsageCounter, WeatherHistory, LocationIndex
 from controller import Controller
+from tests.synthetic_report import make_report, make_cities
 from weather_gui import WeatherApp
 
 
@@ -26,7 +38,7 @@ def app_directories():
     """Generate dictionary with paths to the application folders."""
     user_dirs = appdirs.AppDirs("Weather_App", "")
     local_app_dir = user_dirs.user_data_dir
-    data_dirs = {"Database": "", "Debug": ""}
+    data_dirs = {"Database": "", "Debug": "", "Cache": ""}
     for sub_dir in data_dirs:
         path = os.path.join(local_app_dir, sub_dir)
         data_dirs[sub_dir] = path
@@ -35,6 +47,7 @@ def app_directories():
 
 @pytest.fixture(scope="function")
 def fetch_location(report):
+    report.write_database()
     report.cur.execute("SELECT Location FROM locations")
     rows = report.cur.fetchall()
     rows = [row[0] for row in rows]
@@ -43,6 +56,7 @@ def fetch_location(report):
 
 @pytest.fixture(scope="function")
 def fetch_all(report):
+    report.write_database()
     report.cur.execute("SELECT * FROM locations")
     rows = report.cur.fetchall()
     rows = {row[1]: row[2] for row in rows}
@@ -124,6 +138,7 @@ def test_combo_drop_menu(app, report):
     """Test if list of locations in controller.app_data["api_calls"] is
     properly generated out of the database record."""
     report.combo_drop_menu()
+    report.write_database()
     rows = report.view()
     view_list = [row[0] for row in rows]
     assert view_list == app.controller.app_data["api_calls"]
@@ -144,12 +159,298 @@ def test_add_more(report):
 
 def test_view_order(report):
     """Test if report.view gets locations ordered by num_of_calls."""
+    report.write_database()
     rows = report.view()
     view_list = [row[0] for row in rows]
     assert view_list == ['Torun, PL', 'London, GB', 'Wroclaw, PL',
                          'Szczecin, PL', 'Krakow, PL']
 
 
+def test_location_ranking_follows_view(app, report):
+    """Test if the ranking kept in memory matches the database after
+    locations move up and enter it."""
+    for location in ["Gdansk, PL", "Poznan, PL", "Lodz, PL", "Lublin, PL",
+                     "Opole, PL", "Bydgoszcz, PL", "Gdansk, PL",
+                     "Krakow, PL", "Krakow, PL", "Krakow, PL",
+                     "Krakow, PL", "Krakow, PL"]:
+        report.insert(location)
+        report.write_database()
+        assert report.location_ranking.locations == \
+            [row[0] for row in report.view()]
+    report.combo_drop_menu()
+    assert app.controller.app_data["api_calls"][:2] == ["Krakow, PL",
+                                                        "Torun, PL"]
+
+
+def test_insert_write_behind(report):
+    """Test if insert only counts a call, which is written by the next
+    flush on database_writer."""
+    report.write_database()
+    report.insert("Kalisz, PL")
+    assert report.usage_counter.calls["Kalisz, PL"] == 1
+    assert report.database.execute(
+        "SELECT Num_of_calls FROM locations WHERE Location=?",
+        ("Kalisz, PL", )).fetchone() is None
+    report.finish_flush_database()
+    report.write_future.result(timeout=5)
+    assert report.database.execute(
+        "SELECT Num_of_calls FROM locations WHERE Location=?",
+        ("Kalisz, PL", )).fetchone() == (1, )
+
+
+def test_finish_flush_database_off_thread(monkeypatch, report):
+    """Test if flushes run on database_writer and are not queued while
+    the previous one is still running."""
+    started = threading.Event()
+    release = threading.Event()
+    threads = []
+
+    def write_database():
+        threads.append(threading.current_thread())
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(report, "write_database", write_database)
+    report.finish_flush_database()
+    assert started.wait(5)
+    future = report.write_future
+    report.finish_flush_database()
+    assert report.write_future is future
+    release.set()
+    future.result(timeout=5)
+    assert threads[0] is not threading.current_thread()
+    report.finish_flush_database()
+    report.write_future.result(timeout=5)
+    assert len(threads) == 2
+
+
+def test_location_ranking():
+    """Test if LocationRanking keeps the first locations by amount of
+    calls and name."""
+    ranking = LocationRanking(size=3)
+    ranking.load([("B", 2), ("A", 2), ("C", 1), ("D", 1)])
+    assert ranking.locations == ["A", "B", "C"]
+    locations = ranking.locations
+    ranking.update("D", 2)
+    assert ranking.locations == ["A", "B", "D"]
+    # Lists handed out before are not modified.
+    assert locations == ["A", "B", "C"]
+    ranking.update("E", 1)
+    assert ranking.locations == ["A", "B", "D"]
+    ranking.update("D", 3)
+    assert ranking.locations == ["D", "A", "B"]
+
+
+def test_usage_counter(tmpdir):
+    """Test if calls update the ranking at once and get written in one
+    batch by flush."""
+    database = Database(str(tmpdir.join("locations.db")))
+    database.migrate(Report.migrations)
+    with database.transaction() as conn:
+        conn.execute("INSERT INTO locations (Location, Num_of_calls) "
+                     "VALUES ('London, GB', 2)")
+    ranking = LocationRanking()
+    counter = UsageCounter(database, ranking)
+    for location in ["Torun, PL", "Torun, PL", "Torun, PL", "London, GB"]:
+        counter.count(location)
+    assert ranking.locations == ["London, GB", "Torun, PL"]
+    # Nothing written yet.
+    assert database.execute("SELECT Location, Num_of_calls "
+                            "FROM locations").fetchall() == \
+        [("London, GB", 2)]
+
+    with mock.patch.object(database, "transaction",
+                           side_effect=sqlite3.OperationalError):
+        with pytest.raises(sqlite3.OperationalError):
+            counter.flush()
+    assert counter.pending == {"Torun, PL": 3, "London, GB": 1}
+
+    assert counter.flush() == 2
+    assert counter.flush() == 0
+    assert database.execute("SELECT Location, Num_of_calls FROM locations "
+                            "ORDER BY Location").fetchall() == \
+        [("London, GB", 3), ("Torun, PL", 3)]
+    assert counter.count("Torun, PL") == 4
+    database.close()
+
+
+def test_weather_history(tmpdir):
+    """Test if samples are written in batches and read back by ranges
+    of time with observed weather taking precedence."""
+    database = Database(str(tmpdir.join("locations.db")))
+    database.migrate(Report.migrations)
+    history = WeatherHistory(database)
+    report = make_report(items=8, rain=True)
+    forecast = ForecastSeries.from_list(report["w_d_short"]["list"])
+    start = forecast.dt[0]
+    history.append("London, GB", "metric", forecast)
+    history.append("London, GB", "imperial", ForecastSeries.from_list(
+        UnitConverter.to_imperial(report["w_d_short"],
+                                  "w_d_short")["list"]))
+    observed = dict(report["w_d_short"]["list"][2], dt=start + 3 * 10800)
+    observed["main"] = dict(observed["main"], temp=-99.0)
+    observed.pop("rain", None)
+    history.append("London, GB", "metric",
+                   ForecastSeries.from_list([observed]), forecast=False)
+    assert database.execute("SELECT COUNT(*) FROM history").fetchone() == \
+        (0, )
+    assert history.flush() == 17
+
+    series = history.range("London, GB", "metric", start,
+                           start + 4 * 10800)
+    assert list(series.dt) == list(forecast.dt[:5])
+    assert list(series.temp) == list(forecast.temp[:3]) + [-99.0] + \
+        [forecast.temp[4]]
+    assert series.icons[:3] == forecast.icons[:3]
+    # Missing values are kept as NaN.
+    assert math.isnan(series.rain[3])
+    for i in [0, 1, 2, 4]:
+        assert series.rain[i] == forecast.rain[i] or \
+            math.isnan(series.rain[i]) and math.isnan(forecast.rain[i])
+
+    # A newer forecast does not replace an observed sample.
+    history.append("London, GB", "metric", forecast)
+    series = history.range("London, GB", "metric", start, start + 10 ** 6)
+    assert len(series) == 8
+    assert series.temp[3] == -99.0
+    assert len(history.range("London, GB", "imperial", start,
+                             start + 10 ** 6)) == 8
+    assert len(history.range("Torun, PL", "metric", start,
+                             start + 10 ** 6)) == 0
+
+    plan = database.execute(
+        "EXPLAIN QUERY PLAN SELECT Dt, Data, Icon FROM history "
+        "WHERE Location_id=1 AND Dt BETWEEN 0 AND 1 AND Units='metric' "
+        "ORDER BY Dt").fetchall()
+    assert "PRIMARY KEY (Location_id=? AND Dt>? AND Dt<?)" in plan[-1][-1]
+    database.close()
+
+
+def test_database_migrate_rollback(tmpdir):
+    """Test if a failing migration leaves the schema unchanged."""
+    database = Database(str(tmpdir.join("locations.db")))
+    migrations = [["CREATE TABLE numbers(Number INTEGER)"],
+                  ["CREATE TABLE letters(Letter TEXT)",
+                   "CREATE INDEX letters_letter ON letters (Letter)",
+                   "CREATE INDEX numbers_missing ON numbers (Missing)"]]
+    with pytest.raises(sqlite3.OperationalError):
+        database.migrate(migrations)
+    assert database.execute("PRAGMA user_version").fetchone() == (1, )
+    assert database.execute("SELECT name FROM sqlite_master").fetchall() \
+        == [("numbers", )]
+    del migrations[1][2]
+    assert database.migrate(migrations) == 2
+    database.close()
+
+
+def test_location_index(tmpdir):
+    """Test if locations are completed from the start of any word,
+    searched locations first."""
+    path = str(tmpdir.join("city.list.json.gz"))
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump([{"id": 1, "name": "Łódź", "country": "PL"},
+                   {"id": 2, "name": "London", "country": "GB"},
+                   {"id": 3, "name": "London", "country": "CA"},
+                   {"id": 4, "name": "London", "country": "GB"},
+                   {"id": 5, "name": "New York", "country": "US"},
+                   {"id": 6, "name": "York", "country": "GB"},
+                   {"id": 7, "name": "McMurdo Station", "country": ""}],
+                  file)
+    index = LocationIndex()
+    index.load_history([("London, GB", 2), ("Londonderry, GB", 5)])
+    assert index.complete("lon") == ["Londonderry, GB", "London, GB"]
+    index.load_cities(path)
+    assert index.complete("LON") == ["Londonderry, GB", "London, GB",
+                                     "London, CA"]
+    assert index.complete("york") == ["York, GB", "New York, US"]
+    assert index.complete("lodz ") == ["Łódź, PL"]
+    assert index.complete("mcmurdo") == ["McMurdo Station"]
+    assert index.complete("lon", limit=2) == ["Londonderry, GB",
+                                              "London, GB"]
+    assert index.complete(" ,") == []
+    index.update("London, CA", 9)
+    index.update("London, GB", 3)
+    assert index.complete("lon") == ["London, CA", "Londonderry, GB",
+                                     "London, GB"]
+    assert index.complete("ca") == ["London, CA"]
+
+
+def test_location_index_updated_while_loading():
+    """Test if locations updated before the history is loaded keep
+    their amount of calls."""
+    index = LocationIndex()
+    index.update("Londonderry, GB", 6)
+    index.update("Lonsdale, AU", 1)
+    assert not index.ready
+    index.load_history([("London, GB", 2), ("Londonderry, GB", 5)])
+    assert index.ready
+    assert index.complete("lon") == ["Londonderry, GB", "London, GB",
+                                     "Lonsdale, AU"]
+    assert index.complete("au") == ["Lonsdale, AU"]
+
+
+def test_location_index_keystroke_time(tmpdir):
+    """Test if completing every prefix of typed locations takes less
+    than 1 ms with a city list of the size of city.list.json."""
+    cities = make_cities(200000)
+    path = str(tmpdir.join("city.list.json.gz"))
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(cities, file)
+    index = LocationIndex()
+    index.load_history([("London, GB", 2), ("Londonderry, GB", 5)])
+    index.load_cities(path)
+    typed = ["London, GB"] + ["{0}, {1}".format(city["name"], city["country"])
+                              for city in cities[::10000]]
+    for location in typed:
+        for i in range(1, len(location) + 1):
+            # Best of a few runs, a garbage collection or a thread
+            # switch may stop any single one.
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                locations = index.complete(location[:i])
+                times.append(time.perf_counter() - start)
+            assert 0 < len(locations) <= 10
+            assert min(times) < 0.001, location[:i]
+
+
+def test_finish_complete_location(monkeypatch, report):
+    """Test if locations are completed from location_ranking until
+    the index is loaded."""
+    deadline = time.time() + 5
+    while not report.location_index.ready and time.time() < deadline:
+        time.sleep(0.01)
+    assert report.finish_complete_location("tor") == ["Torun, PL"]
+    monkeypatch.setattr(report.location_index, "ready", False)
+    monkeypatch.setattr(report.location_ranking, "locations",
+                        ["Torun, PL", "Krakow, PL", "Torquay, GB"])
+    assert report.finish_complete_location("TOR") == ["Torun, PL",
+                                                      "Torquay, GB"]
+    assert report.finish_complete_location("pl") == ["Torun, PL",
+                                                     "Krakow, PL"]
+    assert report.finish_complete_location(" ") == []
+
+
+def test_database_migrate(tmpdir):
+    """Test if a database of an older version of the application gets
+    the index of locations and keeps its rows."""
+    path = str(tmpdir.join("locations.db"))
+    database = Database(path)
+    with database.transaction() as conn:
+        conn.execute(Report.migrations[0][0])
+        conn.execute("INSERT INTO locations VALUES (1, 'London, GB', 3, "
+                     "'imperial')")
+    assert database.migrate(Report.migrations) == len(Report.migrations)
+    assert database.migrate(Report.migrations) == len(Report.migrations)
+    plan = database.execute(
+        "EXPLAIN QUERY PLAN SELECT Location, Num_of_calls FROM locations "
+        "ORDER BY Num_of_calls DESC, Location LIMIT 10").fetchall()
+    assert "locations_num_of_calls" in plan[0][-1]
+    assert database.execute("SELECT * FROM locations").fetchall() == \
+        [(1, "London, GB", 3, "imperial")]
+    database.close()
+
+
 def test_open_weather_api(monkeypatch, report):
     """Test contacting Open Weather API with a positive response 200."""
     location = "London"
@@ -157,7 +458,10 @@ def test_open_weather_api(monkeypatch, report):
     mock_response = mock.Mock()
     mock_response.return_value.status_code = 200
     mock_response.return_value.json.return_value = expected_dict
-    monkeypatch.setattr("weather_backend.requests.get", mock_response)
+    mock_response.return_value.encoding = None
+    mock_response.return_value.iter_content.return_value = [
+        json.dumps(expected_dict).encode()]
+    monkeypatch.setattr(report.fetch_engine.session, "get", mock_response)
     returned = report.open_weather_api(location)
     assert type(returned) == tuple
     assert mock_response.call_count == 6
@@ -177,15 +481,599 @@ def test_open_weather_api_bad_response(monkeypatch, report):
     mock_response = mock.Mock()
     mock_response.return_value.status_code = 400
     mock_response.return_value.json.return_value = expected_dict
-    monkeypatch.setattr("weather_backend.requests.get", mock_response)
+    monkeypatch.setattr(report.fetch_engine.session, "get", mock_response)
     returned = report.open_weather_api(location)
     assert type(returned) == tuple
-    assert mock_response.call_count == 1
+    assert 1 <= mock_response.call_count <= 6
     assert returned[0] == -1
     assert returned[1] == "Error: {0}, {1}".format(
         expected_dict["cod"], expected_dict["message"])
 
 
+def test_open_weather_api_single_fetch(monkeypatch, report):
+    """Test if only metric reports are downloaded in single_fetch mode
+    and imperial ones are converted locally."""
+    location = "London"
+    expected_dict = {"main": {"temp": 10}, "wind": {"speed": 1}}
+    mock_response = mock.Mock()
+    mock_response.return_value.status_code = 200
+    mock_response.return_value.json.return_value = expected_dict
+    mock_response.return_value.encoding = None
+    mock_response.return_value.iter_content.return_value = [
+        json.dumps(expected_dict).encode()]
+    monkeypatch.setattr(report.fetch_engine.session, "get", mock_response)
+    monkeypatch.setattr(report.controller, "single_fetch", 1)
+    returned = report.open_weather_api(location)
+    assert mock_response.call_count == 3
+    for url in [call[0][0] for call in mock_response.call_args_list]:
+        assert "&units=metric" in url
+    assert returned[0] == 0
+    imperial = returned[1][1]["imperial"]
+    assert imperial["w_d_cur"] == {"main": {"temp": 50},
+                                   "wind": {"speed": 2.24}}
+
+
+def test_to_imperial_current():
+    """Test converting current weather report to imperial units."""
+    metric = {"main": {"temp": 20, "temp_min": -40, "temp_max": 0,
+                       "pressure": 1000, "humidity": 50},
+              "wind": {"speed": 10, "deg": 90}}
+    imperial = UnitConverter.to_imperial(metric, "w_d_cur")
+    assert imperial == {"main": {"temp": 68, "temp_min": -40,
+                                 "temp_max": 32, "pressure": 1000,
+                                 "humidity": 50},
+                        "wind": {"speed": 22.37, "deg": 90}}
+    # Metric report must stay untouched.
+    assert metric["main"]["temp"] == 20
+
+
+def test_to_imperial_daily():
+    """Test converting daily forecast temperatures and wind speed."""
+    metric = {"cnt": 1,
+              "list": [{"temp": {"day": 10, "min": 5, "max": 15,
+                                 "night": 0, "eve": 10, "morn": 5},
+                        "pressure": 1000, "speed": 5, "deg": 180}]}
+    imperial = UnitConverter.to_imperial(metric, "w_d_long")
+    assert imperial["list"][0] == {"temp": {"day": 50, "min": 41,
+                                            "max": 59, "night": 32,
+                                            "eve": 50, "morn": 41},
+                                   "pressure": 1000, "speed": 11.18,
+                                   "deg": 180}
+
+
+def test_open_weather_api_cached(monkeypatch, report, tmpdir):
+    """Test if fresh responses are served from the cache without
+    contacting the API."""
+    cache = ResponseCache(str(tmpdir.join("responses.json")))
+    expected_dict = {"key1": "val1"}
+    mock_response = mock.Mock()
+    mock_response.return_value.status_code = 200
+    mock_response.return_value.json.return_value = expected_dict
+    mock_response.return_value.encoding = None
+    mock_response.return_value.iter_content.return_value = [
+        json.dumps(expected_dict).encode()]
+    monkeypatch.setattr(report.fetch_engine.session, "get", mock_response)
+    report.open_weather_api("London, GB", cache)
+    assert mock_response.call_count == 6
+    returned = report.open_weather_api("london gb", cache)
+    assert mock_response.call_count == 6
+    assert returned[1][0]["metric"]["w_d_short"] == expected_dict
+
+
+@pytest.fixture()
+def response_cache(tmpdir):
+    """Create an empty ResponseCache."""
+    return ResponseCache(str(tmpdir.join("responses.json")), max_entries=2)
+
+
+def test_response_cache_expired(monkeypatch, response_cache):
+    """Test if entries expire after ttl of their endpoint."""
+    response_cache.put("weather", "London", "metric", {"a": 1})
+    response_cache.put("forecast", "London", "metric", {"b": 2})
+    now = time.time()
+    monkeypatch.setattr("weather_backend.time.time",
+                        lambda: now + ResponseCache.ttls["weather"] + 1)
+    assert response_cache.get("weather", "London", "metric") is None
+    assert response_cache.get("forecast", "London", "metric") == {"b": 2}
+
+
+def test_response_cache_lru(response_cache):
+    """Test if the least recently used entry is evicted first."""
+    response_cache.put("weather", "London", "metric", {"a": 1})
+    response_cache.put("weather", "Paris", "metric", {"b": 2})
+    response_cache.get("weather", "London", "metric")
+    response_cache.put("weather", "Rome", "metric", {"c": 3})
+    assert response_cache.get("weather", "Paris", "metric") is None
+    assert response_cache.get("weather", "London", "metric") == {"a": 1}
+    assert response_cache.get("weather", "Rome", "metric") == {"c": 3}
+
+
+def test_response_cache_persistence(response_cache):
+    """Test if saved entries are loaded by a new cache."""
+    response_cache.put("weather", "London", "metric", {"a": 1})
+    response_cache.save()
+    new_cache = ResponseCache(response_cache.path)
+    assert new_cache.get("weather", "london", "metric") == {"a": 1}
+
+
+def test_response_cache_saves_changes_only(response_cache):
+    """Test if the file is written only after entries changed."""
+    with mock.patch("json.dump") as dump:
+        response_cache.save()
+        assert dump.call_count == 0
+        response_cache.put("weather", "London", "metric", {"a": 1})
+        response_cache.save()
+        assert dump.call_count == 1
+        # Cache hits do not change the file.
+        response_cache.get("weather", "London", "metric")
+        response_cache.save()
+        assert dump.call_count == 1
+
+
+def test_database_connections(tmpdir):
+    """Test if every thread keeps its own connection in WAL mode."""
+    database = Database(str(tmpdir.join("locations.db")))
+    conn = database.connection()
+    assert database.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    # NORMAL
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    with database.transaction() as transaction:
+        transaction.execute("CREATE TABLE numbers(Number INTEGER)")
+        transaction.execute("INSERT INTO numbers VALUES (1)")
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(
+        (database.connection(),
+         database.execute("SELECT Number FROM numbers").fetchall())))
+    thread.start()
+    thread.join()
+    assert other[0][0] is not conn
+    assert other[0][1] == [(1, )]
+    assert len(database.connections) == 2
+
+    database.close()
+    assert database.connections == []
+    assert database.connection() is not conn
+
+
+@pytest.fixture()
+def timezone_store(tmpdir):
+    """Create TimezoneStore in an empty database."""
+    database = Database(str(tmpdir.join("locations.db")))
+    database.migrate(Report.migrations)
+    return TimezoneStore(database)
+
+
+def test_timezone_store_rounded_coords(timezone_store):
+    """Test if time zones are found by coordinates rounded to 0.01
+    degree."""
+    time_zone = {"timezoneId": "Europe/London", "rawOffset": 0,
+                 "dstOffset": 1}
+    timezone_store.put(51.5074, -0.1278, time_zone)
+    assert timezone_store.get(51.51, -0.13) == time_zone
+    assert timezone_store.get(51.52, -0.13) is None
+
+
+def test_timezone_store_revalidation(monkeypatch, timezone_store):
+    """Test if a time zone is revalidated after the next daylight
+    saving time transition."""
+    # 01/06/2017, London switches to winter time on 29/10/2017.
+    now = 1496275200
+    monkeypatch.setattr("weather_backend.time.time", lambda: now)
+    timezone_store.put(51.51, -0.13, {"timezoneId": "Europe/London"})
+    monkeypatch.setattr("weather_backend.time.time",
+                        lambda: now + 149 * 86400)
+    assert timezone_store.get(51.51, -0.13) is not None
+    monkeypatch.setattr("weather_backend.time.time",
+                        lambda: now + 151 * 86400)
+    assert timezone_store.get(51.51, -0.13) is None
+
+
+@pytest.fixture(scope="module")
+def timezone_resolver():
+    """Create TimezoneResolver using bundled zone.tab."""
+    return TimezoneResolver(os.path.join(app_timezones, "zone.tab"))
+
+
+# Parameters: latitude, longitude, country code, utc offset in seconds,
+# expected time zone.
+test_resolve_parameters = [(51.51, -0.13, "GB", None, "Europe/London"),
+                           (52.23, 21.01, "PL", None, "Europe/Warsaw"),
+                           (41.88, -87.63, "US", None, "America/Chicago"),
+                           (-33.87, 151.21, "AU", None, "Australia/Sydney"),
+                           (-77.85, 166.67, None, None,
+                            "Antarctica/McMurdo")]
+
+
+@pytest.mark.parametrize("lat, lon, country, utc_offset, expected",
+                         test_resolve_parameters)
+def test_timezone_resolver(timezone_resolver, lat, lon, country,
+                           utc_offset, expected):
+    """Test resolving time zones offline."""
+    time_zone = timezone_resolver.resolve(lat, lon, country, utc_offset)
+    assert time_zone["timezoneId"] == expected
+
+
+def test_timezone_resolver_utc_offset(timezone_resolver):
+    """Test if utc offset given picks a zone other than the nearest
+    one."""
+    # Denver and Chicago offsets always differ by an hour.
+    chicago_offset = TimezoneResolver._utc_offset("America/Chicago")
+    time_zone = timezone_resolver.resolve(39.74, -104.99, "US")
+    assert time_zone["timezoneId"] == "America/Denver"
+    time_zone = timezone_resolver.resolve(39.74, -104.99, "US",
+                                          chicago_offset)
+    assert TimezoneResolver._utc_offset(
+        time_zone["timezoneId"]) == chicago_offset
+
+
+def test_timezone_resolver_offsets(timezone_resolver):
+    """Test if offsets follow geonames.org definitions."""
+    time_zone = timezone_resolver.resolve(51.51, -0.13, "GB")
+    assert time_zone["rawOffset"] == 0
+    assert time_zone["gmtOffset"] == 0
+    assert time_zone["dstOffset"] == 1
+
+
+@pytest.fixture(scope="module")
+def forecast_json():
+    """Generate 3-hourly forecast as sent by Open Weather."""
+    items = []
+    for i in range(8):
+        item = {"dt": 1504656000 + i * 10800,
+                "main": {"temp": 10.5, "temp_min": 9, "temp_max": 11,
+                         "pressure": 1012.25, "humidity": 80},
+                "weather": [{"id": 500, "main": "Rain",
+                             "description": "light rain", "icon": "10d"}],
+                "clouds": {"all": 75},
+                "wind": {"speed": 3.1, "deg": 200.5},
+                "sys": {"pod": "d"},
+                "dt_txt": "2017-09-06 00:00:00"}
+        if i == 1:
+            item["rain"] = {"3h": 0.25}
+        if i == 2:
+            item["rain"] = {}
+        if i == 3:
+            item["snow"] = {"3h": 1}
+        items.append(item)
+    forecast = {"cod": "200", "message": 0.0036, "cnt": len(items),
+                "list": items,
+                "city": {"name": "Łódź", "country": "PL"}}
+    return json.dumps(forecast, ensure_ascii=False, indent=1).encode()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 100000])
+def test_stream_decoder_chunks(forecast_json, chunk_size):
+    """Test if the decoded forecast does not depend on how the body is
+    split into chunks."""
+    response = mock.Mock(encoding=None)
+    response.iter_content.return_value = [
+        forecast_json[i:i + chunk_size]
+        for i in range(0, len(forecast_json), chunk_size)]
+    returned = ForecastStreamDecoder.decode_hourly(response)
+    expected = json.loads(forecast_json.decode())
+    expected["list"] = [ForecastStreamDecoder.hourly_item(item)
+                        for item in expected["list"]]
+    assert returned == expected
+
+
+def test_stream_decoder_hourly_item(forecast_json):
+    """Test if forecast items are reduced to the fields displayed."""
+    items = json.loads(forecast_json.decode())["list"]
+    assert ForecastStreamDecoder.hourly_item(items[1]) == {
+        "dt": 1504666800,
+        "main": {"temp": 10.5, "pressure": 1012.25, "humidity": 80},
+        "clouds": {"all": 75},
+        "wind": {"speed": 3.1, "deg": 200.5},
+        "weather": [{"icon": "10d"}],
+        "rain": {"3h": 0.25}}
+    # Rain without amount is dropped.
+    assert "rain" not in ForecastStreamDecoder.hourly_item(items[2])
+
+
+def test_stream_decoder_incomplete():
+    """Test if a truncated document raises an error."""
+    response = mock.Mock(encoding=None)
+    response.iter_content.return_value = [b'{"cnt": 1, "list": [{"dt": 1}']
+    with pytest.raises(ValueError):
+        ForecastStreamDecoder.decode(response, lambda item: item)
+
+
+def test_forecast_series(forecast_json):
+    """Test if the forecast is stored in columns with NaN for missing
+    values."""
+    items = [ForecastStreamDecoder.hourly_item(item) for item in
+             json.loads(forecast_json.decode())["list"]]
+    series = ForecastSeries.from_list(items)
+    assert len(series) == 8
+    assert series.dt[1] == 1504666800
+    assert series.temp[0] == 10.5
+    assert series.wind_deg[0] == 200.5
+    assert series.icons == ["10d"] * 8
+    assert series.rain[1] == 0.25
+    assert math.isnan(series.rain[0])
+    assert math.isnan(series.rain[2])
+    assert series.snow[3] == 1
+    assert math.isnan(series.snow[1])
+
+
+def test_daily_forecast():
+    """Test if the daily forecast is stored in columns with NaN for
+    missing values."""
+    items = [{"dt": 1504699200,
+              "temp": {"day": 15, "min": 10.5, "max": 18, "night": 11,
+                       "eve": 16, "morn": 10.5},
+              "pressure": 1012.5, "humidity": 80,
+              "weather": [{"icon": "10d", "description": "light rain"}],
+              "speed": 5.5, "deg": 200, "clouds": 75, "rain": 2.25},
+             {"dt": 1504785600,
+              "temp": {"day": 12, "min": 8, "max": 14},
+              "pressure": 1020, "humidity": 60,
+              "weather": [{"icon": "01d", "description": "clear sky"}],
+              "speed": 2, "deg": 90, "clouds": 0, "snow": 1}]
+    items = [ForecastStreamDecoder.daily_item(item) for item in items]
+    daily = DailyForecast.from_list(items)
+    assert len(daily) == 2
+    assert list(daily.dt) == [1504699200, 1504785600]
+    assert list(daily.temp_min) == [10.5, 8]
+    assert list(daily.temp_max) == [18, 14]
+    assert daily.wind_speed[0] == 5.5
+    assert daily.wind_deg[1] == 90
+    assert daily.rain[0] == 2.25
+    assert math.isnan(daily.rain[1])
+    assert math.isnan(daily.snow[0])
+    assert daily.snow[1] == 1
+    assert daily.icons == ["10d", "01d"]
+    assert daily.descriptions == ["light rain", "clear sky"]
+
+
+def test_day_summary():
+    """Test if the forecast is aggregated by days of the local time."""
+    items = []
+    # 06.09.2017 21:00 UTC to 08.09.2017 00:00 UTC every 3 hours.
+    for i in range(10):
+        item = {"dt": 1504731600 + i * 10800,
+                "main": {"temp": float(i)},
+                "weather": [{"icon": "01d" if i in [2, 3] else "10d"}]}
+        if i in [1, 2]:
+            item["rain"] = {"3h": 0.5}
+        if i == 9:
+            item["snow"] = {"3h": 2}
+        items.append(item)
+    series = ForecastSeries.from_list(items)
+
+    summary = DaySummary.from_series(series)
+    assert summary.count.tolist() == [1, 8, 1]
+    assert summary.temp_min.tolist() == [0, 1, 9]
+    assert summary.temp_max.tolist() == [0, 8, 9]
+    assert summary.temp_mean.tolist() == [0, 4.5, 9]
+    assert summary.rain.tolist() == [0, 1, 0]
+    assert summary.snow.tolist() == [0, 0, 2]
+    assert summary.icons == ["10d", "10d", "10d"]
+
+    # Three hours ahead of UTC the first item falls on 07.09.2017.
+    summary = DaySummary.from_series(series, utc_offset=3 * 3600)
+    assert summary.count.tolist() == [8, 2]
+    assert summary.dt.tolist() == [1504731600, 1504818000]
+
+    # Ties go to the icon seen first during the day.
+    series.icons[8:] = ["04d", "01d"]
+    summary = DaySummary.from_series(series, utc_offset=3 * 3600)
+    assert summary.icons == ["10d", "04d"]
+
+    rows = summary.to_list()
+    assert rows[1] == {"dt": 1504818000, "count": 2, "temp_min": 8,
+                       "temp_max": 9, "temp_mean": 8.5, "rain": 0,
+                       "snow": 2, "icons": "04d"}
+    json.dumps(rows)
+
+    assert len(DaySummary.from_series(ForecastSeries())) == 0
+
+
+def test_current_weather_missing_fields():
+    """Test if fields missing from current weather report are set to
+    NaN or empty country."""
+    weather_dict = {"coord": {"lon": 166.67, "lat": -77.85},
+                    "weather": [{"description": "clear sky",
+                                 "icon": "01d"}],
+                    "main": {"temp": -20.5, "pressure": 990,
+                             "humidity": 60},
+                    "wind": {"speed": 2.5},
+                    "clouds": {"all": 0},
+                    "dt": 1504656000,
+                    "sys": {"sunrise": 1504600000, "sunset": 1504650000},
+                    "name": "McMurdo Station"}
+    current = CurrentWeather.from_dict(weather_dict)
+    assert current.country == ""
+    assert current.name == "McMurdo Station"
+    assert current.lat == -77.85
+    assert current.wind_speed == 2.5
+    assert math.isnan(current.wind_deg)
+    assert math.isnan(current.temp_max)
+    with pytest.raises(AttributeError):
+        current.extra = 1
+
+
+def test_fetch_all_cancels_on_error(monkeypatch):
+    """Test if requests not sent yet are cancelled after the first
+    response other than 200."""
+    engine = FetchEngine(max_workers=1)
+    release = threading.Event()
+    bad_response = mock.Mock(status_code=400)
+
+    def get(url, stream, timeout):
+        if url == "url_0":
+            return bad_response
+        release.wait(5)
+        return mock.Mock(status_code=200)
+
+    mock_get = mock.Mock(side_effect=get)
+    monkeypatch.setattr(engine.session, "get", mock_get)
+    urls = {i: "url_{0}".format(i) for i in range(6)}
+    returned = engine.fetch_all(urls)
+    release.set()
+    engine.executor.shutdown(wait=True)
+    assert returned == (-1, bad_response)
+    # Only the failed request and the one already picked up by the
+    # worker could have been sent.
+    assert mock_get.call_count <= 2
+
+
+def test_fetch_all_closes_responses(monkeypatch):
+    """Test if every response is closed and requests are sent with a
+    timeout."""
+    engine = FetchEngine(max_workers=2, timeout=3)
+    responses = [mock.Mock(status_code=200, **{"json.return_value": {}}),
+                 mock.Mock(status_code=200)]
+    mock_get = mock.Mock(side_effect=responses)
+    monkeypatch.setattr(engine.session, "get", mock_get)
+    returned = engine.fetch_all({0: "url_0", 1: "url_1"},
+                                {1: lambda response: {"list": []}})
+    assert returned == (0, {0: {}, 1: {"list": []}})
+    for response in responses:
+        response.close.assert_called_once_with()
+    for call in mock_get.call_args_list:
+        assert call[1]["timeout"] == 3
+    engine.close()
+
+
+@pytest.mark.parametrize("error, message", [
+    (requests.exceptions.ReadTimeout, "Open Weather did not respond in "
+                                      "time."),
+    (requests.exceptions.TooManyRedirects, "Error: redirects"),
+    (requests.exceptions.ConnectionError, "Unable to establish internet "
+                                          "connection. Please connect to "
+                                          "the internet.")])
+def test_fetch_all_request_errors(monkeypatch, error, message):
+    """Test if failed requests are reported as error messages."""
+    engine = FetchEngine(max_workers=1)
+    monkeypatch.setattr(engine.session, "get",
+                        mock.Mock(side_effect=error("redirects")))
+    assert engine.fetch_all({0: "url_0"}) == (-1, message)
+    engine.close()
+
+
+def poll_until_done(pipeline):
+    """Polls pipeline until the newest request is finished."""
+    results = []
+    deadline = time.time() + 5
+    while pipeline.pending and time.time() < deadline:
+        result = pipeline.poll()
+        if result is not None:
+            results.append(result)
+        time.sleep(0.01)
+    return results
+
+
+def test_report_pipeline_newest_wins():
+    """Test if requests made while one is running supersede it and
+    only the result of the newest one is polled."""
+    release = threading.Event()
+    calls = []
+
+    def fetch(location):
+        calls.append(location)
+        if location == "London":
+            release.wait(5)
+        return location.upper()
+
+    pipeline = ReportPipeline(fetch)
+    pipeline.submit("London")
+    while not calls:
+        time.sleep(0.01)
+    pipeline.submit("Paris")
+    pipeline.submit("Torun")
+    assert pipeline.poll() is None
+    assert pipeline.pending
+    release.set()
+    assert poll_until_done(pipeline) == ["TORUN"]
+    # Waiting request was skipped.
+    assert calls == ["London", "Torun"]
+    assert not pipeline.pending
+    pipeline.close()
+
+
+def test_report_pipeline_error():
+    """Test if exception of a request is raised when polled."""
+    def fetch(location):
+        raise ValueError(location)
+
+    pipeline = ReportPipeline(fetch)
+    pipeline.submit("London")
+    with pytest.raises(ValueError):
+        poll_until_done(pipeline)
+    assert not pipeline.pending
+    pipeline.close()
+
+
+def test_finish_poll_report(monkeypatch, report):
+    """Test if report fetched on the worker thread is applied by the
+    thread polling for it."""
+    applied = []
+    monkeypatch.setattr(report.report_pipeline, "fetch",
+                        lambda location: {"error_status": -1,
+                                          "error_message": location})
+    monkeypatch.setattr(report, "apply_report",
+                        lambda result: applied.append(
+                            (result, threading.current_thread())))
+    report.finish_request_report("London")
+    deadline = time.time() + 5
+    while report.finish_poll_report() and time.time() < deadline:
+        time.sleep(0.01)
+    assert applied == [({"error_status": -1, "error_message": "London"},
+                        threading.current_thread())]
+
+
+def test_finish_poll_report_error(monkeypatch, app, report):
+    """Test if an exception of the worker is shown as an error and
+    polling stops."""
+    def fetch(location):
+        raise KeyError("main")
+
+    monkeypatch.setattr(report.report_pipeline, "fetch", fetch)
+    report.finish_request_report("London")
+    deadline = time.time() + 5
+    while report.finish_poll_report() and time.time() < deadline:
+        time.sleep(0.01)
+    assert not report.report_pipeline.pending
+    assert app.controller.app_data["error_status"] == -1
+    assert app.controller.app_data["var_status"].get() == "Error: 'main'"
+
+
+def test_finish_poll_report_superseded(monkeypatch, app, report):
+    """Test if only the applied report is counted and kept in the
+    history."""
+    release = threading.Event()
+
+    def fetch(location):
+        if location == "Gdynia":
+            release.wait(5)
+        result = {"error_status": 0, "location": location + ", PL",
+                  "timezone": {}, "time": "", "local_time": ""}
+        weather = make_report(name=location, country="PL")
+        for units in ["metric", "imperial"]:
+            result[units] = {"w_d_cur": weather["w_d_cur"],
+                             "hourly": ForecastSeries.from_list(
+                                 weather["w_d_short"]["list"])}
+        return result
+
+    monkeypatch.setattr(report.report_pipeline, "fetch", fetch)
+    monkeypatch.setattr(app.controller, "display_report", lambda: None)
+    report.finish_request_report("Gdynia")
+    report.finish_request_report("Sopot")
+    release.set()
+    deadline = time.time() + 5
+    while report.finish_poll_report() and time.time() < deadline:
+        time.sleep(0.01)
+    assert "Sopot, PL" in report.usage_counter.calls
+    assert "Gdynia, PL" not in report.usage_counter.calls
+    assert {sample[0] for sample in report.weather_history.pending} == \
+        {"Sopot, PL"}
+    assert app.controller.app_data["api_calls"] == \
+        report.location_ranking.locations
+
+
 # def test_open_weather_api_connection_error(report):
 #     """Test contacting Open Weather API with no internet connection."""
 #     location = "London"
@@ -195,6 +1083,17 @@ def test_open_weather_api_bad_response(monkeypatch, report):
 #                           " Please connect to the internet."
 
 
+def test_finish_save_render_profile(report, app_directories):
+    """Test if render profile is saved in the Debug folder."""
+    profile = {"units": "imperial", "phases_ms": {"header": 0.5},
+               "total_ms": 0.5, "items_created": 10}
+    report.finish_save_render_profile(profile)
+    path = os.path.join(app_directories["Debug"],
+                        "render_profile_imperial.json")
+    with open(path) as file:
+        assert json.load(file) == profile
+
+
 def test_geonames_api(monkeypatch, report):
     """Test contacting Open Weather API with a positive response 200."""
     lat = 50
@@ -254,6 +1153,24 @@ def test_finish_deg_conv(report, wind_dir_deg, expected):
     assert report.finish_deg_conv(wind_dir_deg) == expected
 
 
+@pytest.mark.parametrize("wind_dir_deg, expected",
+                         [(360, "N"), (371.25, "NNE"), (-11.26, "NNW"),
+                          (-11.25, "N"), (-720, "N"), (1e9, "W"),
+                          (math.nan, ""), (math.inf, "")])
+def test_finish_deg_conv_any_value(report, wind_dir_deg, expected):
+    """Test if degrees out of 0-360 range are normalised."""
+    assert report.finish_deg_conv(wind_dir_deg) == expected
+
+
+def test_finish_deg_conv_series(report):
+    """Test if converting a series gives the same results as converting
+    each value."""
+    degrees = [deg for deg, _ in test_deg_conv_parameters]
+    degrees += [360, -11.25, -720, 1e9, math.nan, -math.inf]
+    expected = [report.finish_deg_conv(deg) for deg in degrees]
+    assert report.finish_deg_conv_series(degrees) == expected
+
+
 # Parameters: unix time, dst offset bool, dst offset value, expected day of
 # the week and date
 test_finish_get_date_parameters = {(1504697560, True, 1, ("Wednesday",
@@ -306,5 +1223,19 @@ def test_finish_get_time(report, unix_time, dst_offset_bool,
     assert report.finish_get_time(unix_time, dst_offset_bool) == expected
 
 
+@pytest.mark.parametrize("dst_offset_bool, dst_offset_value",
+                         [(True, 1), (True, -1), (True, 5.5), (False, 10)])
+def test_finish_get_times(report, dst_offset_bool, dst_offset_value):
+    """Test if converting a series of unix times gives the same results
+    as converting them one by one."""
+    report.v_link["timezone"]["dstOffset"] = dst_offset_value
+    unix_times = [time for time, *_ in test_finish_get_time_parameters]
+    unix_times += list(range(1504569600, 1505001600, 10800))
+    expected = [report.finish_get_date(time, dst_offset_bool) +
+                (report.finish_get_time(time, dst_offset_bool),)
+                for time in unix_times]
+    assert report.finish_get_times(unix_times, dst_offset_bool) == expected
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -1,8 +1,13 @@
 import pytest
+import os
+import tracemalloc
+import tkinter as tk
 from unittest import mock
 from weather_backend import Report
 from controller import Controller
-from weather_gui import WeatherApp
+from weather_gui import WeatherApp, ImageCache, CanvasImg, CanvasText, \
+    CanvasItemPool, FontMetrics, app_icons
+from tests.synthetic_report import make_report, load_report
 
 
 # Set up classes necessary for testing.
@@ -26,3 +31,443 @@ def test_calculate_hr_x_offset(app, text_time, expected):
     """Test offset for widgets gets calculated from time in text form."""
 
     assert app.get_hr_x_offset(text_time) == expected
+
+
+def test_image_cache(app):
+    """Test if each image is decoded once and then shared."""
+    ImageCache.clear()
+    path = os.path.join(app_icons, "Weather", "01d.png")
+    image = ImageCache.get(app, path)
+    assert ImageCache.get(app.displays["metric"].main_canvas, path) is image
+    assert ImageCache.get(app, path, (10, 10)) is not image
+    assert ImageCache.stats() == {"hits": 1, "misses": 2, "size": 2}
+
+
+def test_image_cache_per_root(app):
+    """Test if images are created in the interpreter of each Tk root."""
+    ImageCache.clear()
+    path = os.path.join(app_icons, "Weather", "01d.png")
+    image = ImageCache.get(app, path)
+    other = tk.Tk()
+    other_image = ImageCache.get(other, path)
+    assert other_image is not image
+    canvas = tk.Canvas(other)
+    canvas.create_image(0, 0, image=other_image)
+    assert str(other_image) in other.image_names()
+    other.destroy()
+    assert str(image) in app.image_names()
+
+
+def test_canvas_img_uses_image_cache(app):
+    """Test if placing the same icon twice reads the file only once."""
+    ImageCache.clear()
+    path = os.path.join(app_icons, "Weather", "01d.png")
+    canvas = app.displays["metric"].main_canvas
+    first = CanvasImg(canvas, path, coordinates=(0, 0))
+    second = CanvasImg(canvas, path, coordinates=(10, 10))
+    assert first.img is second.img
+    assert ImageCache.stats()["misses"] == 1
+    assert ImageCache.stats()["hits"] == 1
+
+
+def test_display_report_soak(app):
+    """Test if 1000 consecutive redraws of a report do not accumulate
+    canvas items, canvas objects, images, Tcl commands or memory."""
+    display = app.displays["metric"]
+    controller = display.controller
+    load_report(controller, make_report(rain=True, snow=True))
+    controller.app_data["var_units"].set("metric")
+    canvas = display.main_canvas
+    ImageCache.clear()
+
+    # Warm up.
+    for _ in range(10):
+        display.display_report()
+    items = len(canvas.find_all())
+    objects = len(display.report_pool)
+    misses = ImageCache.stats()["misses"]
+    commands = len(canvas._tclCommands or [])
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    for _ in range(1000):
+        display.display_report()
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(canvas.find_all()) == items
+    assert len(display.report_pool) == objects
+    assert ImageCache.stats()["misses"] == misses
+    assert len(canvas._tclCommands or []) == commands
+    assert memory_after - memory_before < 256 * 1024
+
+
+def test_display_report_reuses_canvas_items(app):
+    """Test if redrawing keeps canvas item of each cell and updates
+    only what changed."""
+    display = app.displays["imperial"]
+    controller = display.controller
+    canvas = display.main_canvas
+    pool = display.report_pool
+    controller.app_data["var_units"].set("imperial")
+    load_report(controller, make_report(rain=True, snow=True))
+    display.display_report()
+    items = canvas.find_all()
+    title_id = pool.items["title"][0]
+    creates = pool.creates
+    updates = pool.updates
+
+    # The same report does not create or configure anything.
+    display.display_report()
+    assert canvas.find_all() == items
+    assert pool.creates == creates
+    assert pool.updates == updates
+
+    # Another location keeps the items and changes their text.
+    load_report(controller, make_report(seed=1, rain=False, country="",
+                                        name="McMurdo Station"))
+    display.display_report()
+    assert pool.items["title"][0] == title_id
+    assert canvas.itemcget(title_id, "text") == \
+        "Report for: McMurdo Station"
+    # Rain of the previous report is gone.
+    assert not any(key[0] == "hr_rain" for key in pool.items
+                   if isinstance(key, tuple))
+    assert len(canvas.find_all()) == len(pool.items) + 1
+
+
+def test_display_report_daily(app):
+    """Test if every day of the daily forecast gets a row below the
+    hourly forecast."""
+    display = app.displays["metric"]
+    controller = display.controller
+    canvas = display.main_canvas
+    pool = display.report_pool
+    load_report(controller, make_report(days=16))
+    controller.app_data["var_units"].set("metric")
+    ImageCache.clear()
+    display.display_report()
+    pool.show(canvas, (float("-inf"), float("inf")))
+    daily = controller.app_data["metric"]["daily"]
+    rows = [key[1] for key in pool.items
+            if isinstance(key, tuple) and key[0] == "daily_day"]
+    assert sorted(rows) == list(range(16))
+    assert canvas.itemcget(pool.items[("daily_temp", 0)][0], "text") == \
+        "{0:.1f} / {1:.1f}\N{DEGREE SIGN}C".format(daily.temp_max[0],
+                                                   daily.temp_min[0])
+    assert canvas.bbox("daily")[1] > canvas.bbox("hourly")[3]
+
+    # Icons of the daily forecast are decoded once.
+    misses = ImageCache.stats()["misses"]
+    assert misses > 0
+    display.display_report()
+    assert ImageCache.stats()["misses"] == misses
+
+
+def test_display_report_profile(app):
+    """Test if drawing a report records timings of its phases when
+    profiling is switched on."""
+    display = app.displays["metric"]
+    controller = display.controller
+    load_report(controller, make_report(rain=True, snow=True))
+    controller.app_data["var_units"].set("metric")
+    controller.app_data["render_profiles"] = {}
+    with mock.patch.object(controller.model,
+                           "finish_save_render_profile") as save:
+        display.display_report()
+        assert not save.called
+        assert controller.app_data["render_profiles"] == {}
+
+        controller.profile = 1
+        try:
+            display.display_report()
+        finally:
+            controller.profile = 0
+    profile = controller.app_data["render_profiles"]["metric"]
+    save.assert_called_once_with(profile)
+    assert list(profile["phases_ms"]) == ["header", "current",
+                                          "precipitation", "hourly",
+                                          "daily", "draw", "scrollregion"]
+    assert profile["total_ms"] >= max(profile["phases_ms"].values())
+    # The same report again reuses all items and images.
+    assert profile["items_created"] == 0
+    assert profile["images_decoded"] == 0
+    assert profile["images_reused"] > 0
+
+
+def test_canvas_item_pool(app):
+    """Test reusing, updating and deleting canvas items by key."""
+    canvas = app.displays["title"].main_canvas
+    pool = CanvasItemPool(("pool_test",))
+    pool.begin()
+    first = CanvasText(canvas, (10, 10), text="a", tags="pool_test",
+                       pool=pool, key="a")
+    CanvasText(canvas, (10, 30), text="b", tags="pool_test", pool=pool,
+               key="b")
+    with pytest.raises(ValueError):
+        CanvasText(canvas, (10, 50), text="a", tags="pool_test",
+                   pool=pool, key="a")
+    pool.end(canvas)
+
+    pool.begin()
+    second = CanvasText(canvas, (20, 10), text="c", tags="pool_test",
+                        pool=pool, key="a")
+    pool.end(canvas)
+    assert second.id_num == first.id_num
+    assert canvas.coords(second.id_num) == [20, 10]
+    assert canvas.itemcget(second.id_num, "text") == "c"
+    # Item "b" was not placed again.
+    assert canvas.find_withtag("pool_test") == (second.id_num,)
+    assert pool.creates == 2
+    assert pool.updates == 1
+
+    pool.release(canvas)
+    assert canvas.find_withtag("pool_test") == ()
+
+
+def test_canvas_item_pool_view(app):
+    """Test if only objects within view and margin get canvas items
+    and the rest is drawn when scrolled to."""
+    canvas = app.displays["title"].main_canvas
+    pool = CanvasItemPool(("pool_test",), margin=50)
+    pool.begin()
+    for index in range(10):
+        CanvasText(canvas, (10, index * 100), text=str(index),
+                   tags="pool_test", pool=pool, key=index)
+    pool.end(canvas, (0, 150))
+    assert sorted(pool.items) == [0, 1, 2]
+    assert len(canvas.find_withtag("pool_test")) == 3
+
+    pool.show(canvas, (400, 550))
+    assert sorted(pool.items) == [0, 1, 2, 4, 5, 6]
+    # Items drawn before are reused on redraw even out of view.
+    pool.begin()
+    for index in range(10):
+        CanvasText(canvas, (10, index * 100), text=str(index),
+                   tags="pool_test", pool=pool, key=index)
+    pool.end(canvas, (0, 150))
+    assert sorted(pool.items) == [0, 1, 2, 4, 5, 6]
+    assert pool.deferred == [3, 7, 8, 9]
+    pool.release(canvas)
+
+
+anchors = [tk.NW, tk.N, tk.NE, tk.W, tk.CENTER, tk.E, tk.SW, tk.S, tk.SE]
+
+
+@pytest.mark.parametrize("anchor", anchors)
+def test_canvas_text_bbox(app, anchor):
+    """Test if bounding box of text laid out from font metrics matches
+    the one of Tk."""
+    canvas = app.displays["title"].main_canvas
+    text_value = "Wed, 06/09 -21.5\N{DEGREE SIGN}C"
+    text = CanvasText(canvas, (101, 100), text=text_value,
+                      font=("Arial", -18), anchor=anchor)
+    assert text.bbox == canvas.bbox(text.id_num)
+    canvas.delete(text.id_num)
+
+
+@pytest.mark.parametrize("anchor", anchors)
+def test_canvas_text_bbox_multiline(app, anchor):
+    """Test if bounding box of text with several lines laid out from
+    font metrics matches the one of Tk."""
+    canvas = app.displays["title"].main_canvas
+    text = CanvasText(canvas, (101, 100),
+                      text="Received at: 12:00\nLocal time: 13:00",
+                      font=("Arial", -25), anchor=anchor)
+    assert text.bbox == canvas.bbox(text.id_num)
+    canvas.delete(text.id_num)
+
+
+def test_font_metrics_per_root(app):
+    """Test if fonts are measured separately for each Tk root and
+    whole texts are measured once."""
+    canvas = app.displays["title"].main_canvas
+    metrics = FontMetrics.get(canvas, ("Arial", -18))
+    assert FontMetrics.get(app, ("Arial", -18)) is metrics
+    with mock.patch.object(metrics.font, "measure",
+                           return_value=42) as measure:
+        metrics.widths.clear()
+        assert metrics.measure("AV 12") == 42
+        assert metrics.measure("AV 12") == 42
+        measure.assert_called_once_with("AV 12")
+    metrics.widths.clear()
+
+    other = tk.Tk()
+    other_metrics = FontMetrics.get(other, ("Arial", -18))
+    assert other_metrics is not metrics
+    assert other_metrics.measure("AV 12") == metrics.measure("AV 12")
+    other.destroy()
+
+
+@pytest.mark.parametrize("anchor", anchors)
+def test_canvas_img_bbox(app, anchor):
+    """Test if bounding box of image calculated from its size matches
+    the one of Tk."""
+    canvas = app.displays["title"].main_canvas
+    path = os.path.join(app_icons, "Weather", "01d.png")
+    img = CanvasImg(canvas, path, (101, 100), anchor=anchor)
+    assert img.bbox == canvas.bbox(img.id_num)
+    canvas.delete(img.id_num)
+
+
+def test_display_report_without_bbox(app):
+    """Test if laying out a report does not query canvas for bounding
+    boxes."""
+    display = app.displays["metric"]
+    load_report(display.controller, make_report(rain=True, snow=True))
+    display.controller.app_data["var_units"].set("metric")
+    canvas = display.main_canvas
+    with mock.patch.object(canvas, "bbox", wraps=canvas.bbox) as bbox:
+        display.display_report()
+    assert not bbox.called
+    # Draw items still waiting to be scrolled into view.
+    display.report_pool.show(canvas, (float("-inf"), float("inf")))
+    assert canvas.cget("scrollregion").split() == \
+        [str(value) for value in canvas.bbox("main", "hourly", "daily")]
+
+
+def test_display_report_renders_hidden_units_lazily(app):
+    """Test if only selected units are rendered at once and the other
+    display gets rendered when shown or in idle time."""
+    metric = app.displays["metric"]
+    imperial = app.displays["imperial"]
+    controller = metric.controller
+    load_report(controller, make_report(rain=True, snow=True))
+    controller.app_data["var_units"].set("metric")
+    with mock.patch.object(metric, "display_report") as metric_report, \
+            mock.patch.object(imperial, "display_report") as imperial_report, \
+            mock.patch.object(app, "after_idle") as after_idle:
+        app.display_report()
+        after_idle.assert_called_once_with(app.render_pending_displays)
+        assert metric_report.call_count == 1
+        assert imperial_report.call_count == 0
+        assert app.pending_displays == {"imperial"}
+
+        # Showing the other units renders them first and only once.
+        controller.app_data["var_units"].set("imperial")
+        app.show_display("imperial")
+        app.show_display("imperial")
+        assert imperial_report.call_count == 1
+        assert app.pending_displays == set()
+
+        # Idle time renders whatever is still pending.
+        app.display_report()
+        assert app.pending_displays == {"metric"}
+        app.render_pending_displays()
+        assert metric_report.call_count == 2
+        assert imperial_report.call_count == 2
+        assert app.pending_displays == set()
+    assert controller.app_data["var_units"].get() == "imperial"
+
+
+def test_render_pending_displays_keeps_focus(app):
+    """Test if rendering the hidden display in idle time leaves
+    keyboard focus on the selected one."""
+    metric = app.displays["metric"]
+    imperial = app.displays["imperial"]
+    controller = metric.controller
+    load_report(controller, make_report())
+    controller.app_data["var_units"].set("metric")
+    with mock.patch.object(app, "after_idle"), \
+            mock.patch.object(metric.yscrollbar, "focus_set") as metric_set, \
+            mock.patch.object(imperial.yscrollbar, "focus_set") \
+            as imperial_set, \
+            mock.patch.object(imperial.yscrollbar, "focus") as imperial_focus:
+        app.display_report()
+        app.render_pending_displays()
+    metric_set.assert_called_once_with()
+    imperial_set.assert_not_called()
+    imperial_focus.assert_not_called()
+    assert controller.app_data["var_units"].get() == "metric"
+
+
+def test_poll_report(app):
+    """Test if fetched reports are checked for until the newest
+    request is done."""
+    with mock.patch.object(app.controller, "poll_report",
+                           side_effect=[True, False]), \
+            mock.patch.object(app, "after",
+                              return_value="after#1") as after:
+        app.poll_id = None
+        app.schedule_poll()
+        app.schedule_poll()
+        after.assert_called_once_with(app.poll_interval, app.poll_report)
+        # Pending request keeps polling.
+        app.poll_report()
+        assert app.poll_id == "after#1"
+        assert after.call_count == 2
+        # Done.
+        app.poll_report()
+        assert app.poll_id is None
+        assert after.call_count == 2
+
+
+def test_flush_database(app):
+    """Test if calls of locations and weather history are flushed
+    periodically."""
+    with mock.patch.object(app.controller, "flush_database") as flush, \
+            mock.patch.object(app, "after") as after:
+        app.flush_database()
+        flush.assert_called_once_with()
+        after.assert_called_once_with(app.flush_interval,
+                                      app.flush_database)
+
+
+def test_loc_autocomplete(app):
+    """Test if typing into loc_combobox offers completed locations once
+    per idle time."""
+    display = app.displays["title"]
+    with mock.patch.object(display.controller, "complete_location",
+                           return_value=["London, GB", "London, CA"]) \
+            as complete, \
+            mock.patch.object(display, "after_idle",
+                              return_value="after#1") as after_idle:
+        display.complete_id = None
+        display.loc_key_pressed(mock.Mock(char="o"))
+        display.loc_key_pressed(mock.Mock(char="n"))
+        after_idle.assert_called_once_with(display.complete_location)
+        app.v_link["var_loc"].set("lon")
+        display.complete_location()
+        complete.assert_called_once_with("lon")
+        assert display.complete_id is None
+        assert list(display.loc_combobox["values"]) == ["London, GB",
+                                                        "London, CA"]
+        # Most searched locations when nothing is typed.
+        app.v_link["var_loc"].set("")
+        app.v_link["api_calls"] = ["Torun, PL"]
+        display.loc_postcommand()
+        assert list(display.loc_combobox["values"]) == ["Torun, PL"]
+
+
+def test_loc_autocomplete_inline(app):
+    """Test if the first location completing the typed text is shown in
+    loc_combobox with the completed part selected."""
+    display = app.displays["title"]
+    combobox = display.loc_combobox
+    with mock.patch.object(display.controller, "complete_location",
+                           return_value=["New London, US", "London, GB"]), \
+            mock.patch.object(display, "after_idle", return_value="after#1"):
+        app.v_link["var_loc"].set("lon")
+        combobox.icursor(tk.END)
+        display.complete_id = None
+        display.loc_key_pressed(mock.Mock(char="n"))
+        display.complete_location()
+        assert combobox.get() == "London, GB"
+        assert combobox.index(tk.INSERT) == 3
+        assert combobox.index(tk.SEL_FIRST) == 3
+        assert combobox.index(tk.SEL_LAST) == len("London, GB")
+        # BackSpace removing the completed part leaves the typed text.
+        combobox.delete(tk.SEL_FIRST, tk.SEL_LAST)
+        display.complete_id = None
+        display.loc_key_pressed(mock.Mock(char="\x08"))
+        display.complete_location()
+        assert combobox.get() == "lon"
+        assert not combobox.selection_present()
+        assert list(combobox["values"]) == ["New London, US", "London, GB"]
+        # Text typed in the middle is not completed.
+        combobox.icursor(1)
+        display.complete_id = None
+        display.loc_key_pressed(mock.Mock(char="o"))
+        display.complete_location()
+        assert combobox.get() == "lon"
+    app.v_link["var_loc"].set("")
@@ -43,19 +43,32 @@ class Controller(object):
                     :imperial (dict): Contains dictionaries with weather
                         data in imperial system.
                     :timezone (dict): Timezone offset for geolocation.
+                    :render_profiles (dict): Timings and counters of
+                        drawing the last report in each unit system.
                     The following keys are the same in both metric and
                         imperial dictionaries:
                     w_d_cur (dict): Dictionary containing current
                         weather report.
-                    w_d_short (dict): Dictionary containing short
-                        forecast (5 days / every 3 hours).
-                    w_d_long (dict): Dictionary containing long forecast
-                        (16 days max / daily).
+                    current (CurrentWeather): Current weather report
+                        as a compact record.
+                    hourly (ForecastSeries): Short forecast (5 days /
+                        every 3 hours) stored column by column.
+                    days (DaySummary): Per-day aggregates of the short
+                        forecast in local time of the location.
+                    daily (DailyForecast): Long forecast (16 days max /
+                        daily) stored column by column.
             :debug (int): If set to 1 switches debug functions in the
                 whole app on. Set to 0 to turn them off. Displays
                 report from saved files instead of contacting API.
             :draw_lines (int): Set to 1 to draw alignment lines on
                 main_canvas.
+            :single_fetch (int): Set to 1 to download reports in metric
+                units only and convert them to imperial locally. Set to
+                0 to download both unit systems from the API.
+            :use_geonames (int): Set to 1 to obtain time zones from
+                geonames.org. Set to 0 to resolve them offline.
+            :profile (int): Set to 1 to record timings of drawing each
+                report and save them in the Debug folder.
             :model (Report): Report class object which will handle all
                 the backend operations.
             :data_present (bool): Confirms presence of all data from
@@ -73,12 +86,16 @@ class Controller(object):
                          "api_calls": [],
                          "metric": {},
                          "imperial": {},
-                         "timezone": {}
+                         "timezone": {},
+                         "render_profiles": {}
                          }
         """:type : dict[str, any]"""
 
         self.debug = 0
         self.draw_lines = 0
+        self.single_fetch = 0
+        self.use_geonames = 0
+        self.profile = 0
         self.view = None
         self.model = None
         self.data_present = False
@@ -140,6 +157,23 @@ class Controller(object):
                                                            dst_offset)
         return name_of_day, date_str
 
+    def get_times(self, unix_times, dst_offset):
+        """Contact model to convert a series of unix times to days,
+        dates and times in one call.
+
+        Args:
+            dst_offset (bool): Set to True to offset times received from
+                open weather API by daylight savings time.
+            unix_times (iterable[int]): Times given in seconds from
+                beginning of the epoch as on unix machines.
+
+        Returns:
+            times (list[tuple[str, str, str]]): Name of the day, date
+                and time in Hour:Minute format for each of unix_times.
+        """
+        times = self.model.finish_get_times(unix_times, dst_offset)
+        return times
+
     def deg_conv(self, wind_dir_deg):
         """Contacts model to convert meteorological degrees to
         cardinal directions.
@@ -155,15 +189,104 @@ class Controller(object):
         wind_dir_cardinal = self.model.finish_deg_conv(wind_dir_deg)
         return wind_dir_cardinal
 
+    def deg_conv_series(self, wind_dir_degs):
+        """Contacts model to convert a series of meteorological degrees
+        to cardinal directions in one call.
+
+        Args:
+            wind_dir_degs (array_like): Wind directions in
+                meteorological degrees.
+
+        Returns:
+            wind_dirs_cardinal (list[str]): Wind directions in cardinal
+                direction.
+        """
+        wind_dirs_cardinal = self.model.finish_deg_conv_series(
+            wind_dir_degs)
+        return wind_dirs_cardinal
+
     def get_report(self):
         """Contact model to obtain data for the View to display
-        the report.
+        the report. Blocks until the report is displayed.
 
         Returns:
             None
         """
         self.model.finish_get_report(self.app_data["var_loc"].get())
 
+    def request_report(self):
+        """Contact model to obtain data for the View to display the
+        report without blocking. The newest request supersedes all
+        previous ones.
+
+        Returns:
+            None
+        """
+        self.model.finish_request_report(self.app_data["var_loc"].get())
+        self.view.schedule_poll()
+
+    def poll_report(self):
+        """Contact model to display the report of the newest request
+        if it is ready.
+
+        Returns:
+            pending (bool): True while the newest request is still
+                being fetched.
+        """
+        pending = self.model.finish_poll_report()
+        return pending
+
+    def flush_database(self):
+        """Contact model to queue a write of the calls of locations and
+        weather history gathered since the last flush to the database.
+
+        Returns:
+            None
+        """
+        self.model.finish_flush_database()
+
+    def complete_location(self, text):
+        """Contact model to find locations for autocompletion of text
+        typed by the user.
+
+        Args:
+            text (str): Text typed into loc_combobox.
+
+        Returns:
+            locations (list[str]): Suggested locations, most searched
+                first.
+        """
+        locations = self.model.finish_complete_location(text)
+        return locations
+
+    def get_history(self, location, start, end):
+        """Contact model to obtain weather history of a location in
+        current units.
+
+        Args:
+            location (str): Name of the location as in api_calls.
+            start (int): Unix time of the first sample.
+            end (int): Unix time of the last sample.
+
+        Returns:
+            series (ForecastSeries): Samples ordered by time.
+        """
+        series = self.model.finish_get_history(location, start, end)
+        return series
+
+    def save_render_profile(self, profile):
+        """Keeps timings and counters of drawing the last report and
+        contacts model to save them.
+
+        Args:
+            profile (dict): Profile of drawing the report.
+
+        Returns:
+            None
+        """
+        self.app_data["render_profiles"][profile["units"]] = profile
+        self.model.finish_save_render_profile(profile)
+
     def display_error(self, error):
         """Updates the View to display error.
         
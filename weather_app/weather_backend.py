@@ -5,6 +5,1950 @@ import json
 import calendar
 import appdirs
 import os
+import sys
+import math
+import copy
+import array
+import bisect
+import codecs
+import gzip
+import heapq
+import time
+import queue
+import re
+import threading
+import collections
+import unicodedata
+import concurrent.futures
+import numpy as np
+try:
+    import zoneinfo
+except ImportError:
+    # Python < 3.9. Time zones are then revalidated once a year.
+    zoneinfo = None
+
+# Data file folders.
+if getattr(sys, 'frozen', False):
+    # The application is frozen
+    app_root = os.path.dirname(os.path.abspath(sys.executable))
+else:
+    # The application is not frozen
+    app_root = os.path.dirname(os.path.abspath(__file__))
+
+app_timezones = os.path.join(app_root, "Data", "Timezones")
+# City list of Open Weather for autocompletion, downloaded by
+# Build_scripts/download_cities.py. Only searched locations are
+# completed without it.
+app_cities = os.path.join(app_root, "Data", "Cities", "city.list.json.gz")
+
+
+class FetchEngine(object):
+    """Sends groups of HTTP requests concurrently.
+
+    All requests go through one shared requests.Session so TCP
+    connections to the API hosts are pooled and reused between the
+    calls of a single search and between consecutive searches.
+
+    """
+
+    def __init__(self, max_workers=6, timeout=10):
+        """Initialise FetchEngine.
+
+        Args:
+            max_workers (int): Maximum amount of requests sent at the
+                same time. Also used as the size of the connection pool.
+            timeout (float): Seconds to wait for a connection or for
+                the next part of a response.
+
+        :Attributes:
+        :session (requests.Session): Shared session with a connection
+            pool big enough for all concurrent requests.
+        :executor (concurrent.futures.ThreadPoolExecutor): Worker
+            threads sending the requests.
+        :timeout (float): Seconds to wait for a connection or for the
+            next part of a response.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2,
+                                                pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers)
+
+    def _get(self, url, decoder):
+        """Send a single request and decode its body.
+
+        Args:
+            url (str): URL to fetch.
+            decoder (callable | None): Function decoding the body of a
+                successful response (requests.Response) into a
+                dictionary while it streams in. None to decode the
+                whole body with response.json().
+
+        Returns:
+            (tuple[requests.Response, dict | None]): Closed response and
+                its decoded body (None for failed responses, their body
+                stays readable).
+        """
+        response = self.session.get(url, stream=decoder is not None,
+                                    timeout=self.timeout)
+        # Closing returns the connection of a streamed response to the
+        # pool.
+        try:
+            if response.status_code != 200:
+                # Read the body for the caller before closing.
+                response.content
+                return response, None
+            if decoder is None:
+                return response, response.json()
+            return response, decoder(response)
+        finally:
+            response.close()
+
+    def fetch_all(self, urls, decoders=None):
+        """Send all requests at once and collect decoded responses.
+
+        On the first response with status code other than 200 or the
+        first exception the result is returned at once. Requests still
+        waiting for a free worker are cancelled, requests already sent
+        finish in the background (limited by timeout).
+
+        Args:
+            urls (dict[any, str]): URLs to fetch keyed by any hashable
+                identifier chosen by the caller.
+            decoders (dict[any, callable]): Optional streaming decoders
+                keyed like urls. Bodies of other responses are decoded
+                with response.json().
+
+        Returns:
+            Status (tuple[int, dict | str | requests.Response]), first
+                item is the error status (-1 means error / 0 means all
+                ok).
+                Second item is a dictionary of decoded responses keyed
+                like urls, the failed response (requests.Response) or an
+                error message (str) in case of an exception.
+        """
+        decoders = decoders or {}
+        futures = {self.executor.submit(self._get, url, decoders.get(key)):
+                   key for key, url in urls.items()}
+        responses = {}
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                response, data = future.result()
+                if response.status_code != 200:
+                    return -1, response
+                responses[futures[future]] = data
+        except requests.exceptions.ConnectionError:
+            return (-1,
+                    "Unable to establish internet connection."
+                    " Please connect to the internet.")
+        except requests.exceptions.Timeout:
+            return -1, "Open Weather did not respond in time."
+        except requests.exceptions.RequestException as error:
+            return -1, "Error: {0}".format(error)
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return 0, responses
+
+    def close(self):
+        """Stop worker threads and close pooled connections.
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+class ReportPipeline(object):
+    """Runs report requests one at a time on a single worker thread.
+
+    Results are put on a queue which is drained on the tkinter thread,
+    so the worker never touches tkinter. Every request gets a higher
+    generation number than the previous one and the newest request
+    supersedes all older ones: requests still waiting are skipped and
+    results of the one already running are dropped.
+
+    """
+
+    def __init__(self, fetch):
+        """Initialise ReportPipeline.
+
+        Args:
+            fetch (callable): Function run on the worker thread with
+                arguments of each request. Returns the result.
+
+        :Attributes:
+        :fetch (callable): Function run on the worker thread.
+        :executor (concurrent.futures.ThreadPoolExecutor): Single
+            worker thread.
+        :results (queue.Queue): Results as (generation, result,
+            exception) tuples.
+        :generation (int): Generation of the newest request.
+        :finished (int): Generation of the newest request whose result
+            was polled.
+        """
+        self.fetch = fetch
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.results = queue.Queue()
+        self.generation = 0
+        self.finished = 0
+
+    def submit(self, *args):
+        """Queues a request superseding all previous ones.
+
+        Args:
+            *args: Arguments for fetch.
+
+        Returns:
+            generation (int): Generation of the request.
+        """
+        self.generation += 1
+        self.executor.submit(self._run, self.generation, args)
+        return self.generation
+
+    def _run(self, generation, args):
+        """Runs a request on the worker thread unless superseded.
+
+        Args:
+            generation (int): Generation of the request.
+            args (tuple): Arguments for fetch.
+
+        Returns:
+            None
+        """
+        if generation != self.generation:
+            return
+        try:
+            self.results.put((generation, self.fetch(*args), None))
+        except Exception as error:
+            self.results.put((generation, None, error))
+
+    @property
+    def pending(self):
+        """True while the result of the newest request was not polled.
+        """
+        return self.finished != self.generation
+
+    def poll(self):
+        """Takes finished results off the queue without waiting.
+
+        Results of superseded requests are dropped.
+
+        Returns:
+            result (any): Result of the newest request or None if it
+                has not finished yet.
+
+        Raises:
+            Exception: Exception raised by fetch for the newest request.
+        """
+        result = None
+        while True:
+            try:
+                generation, value, error = self.results.get_nowait()
+            except queue.Empty:
+                return result
+            if generation != self.generation:
+                continue
+            self.finished = generation
+            if error is not None:
+                raise error
+            result = value
+
+    def close(self):
+        """Stops the worker thread once the running request finishes.
+
+        Returns:
+            None
+        """
+        self.generation += 1
+        self.executor.shutdown(wait=False)
+
+
+class ForecastStreamDecoder(object):
+    """Decodes forecast json documents incrementally as they arrive.
+
+    Items of the top level "list" array are decoded one at a time as
+    soon as they are complete and reduced to compact records holding
+    only the fields used by the application. The full document is never
+    held in memory. All other top level values are kept as they are.
+
+    """
+
+    chunk_size = 8192
+
+    def __init__(self, compact_item):
+        """Initialise ForecastStreamDecoder.
+
+        Args:
+            compact_item (callable): Function reducing a decoded list
+                item (dict) to a compact record (dict).
+
+        :Attributes:
+        :compact_item (callable): Function reducing list items.
+        :buffer (str): Text received but not decoded yet.
+        :pos (int): Position in buffer of the first character not
+            decoded yet.
+        :state (str): Current state of the parser.
+        :key (str): Last top level key decoded.
+        :result (dict): Decoded document.
+        """
+        self.compact_item = compact_item
+        self.buffer = ""
+        self.pos = 0
+        self.state = "start"
+        self.key = None
+        self.result = {}
+        self._json_decoder = json.JSONDecoder()
+
+    @classmethod
+    def decode(cls, response, compact_item):
+        """Decodes body of a streamed response.
+
+        Args:
+            response (requests.Response): Response opened with
+                stream=True.
+            compact_item (callable): Function reducing list items.
+
+        Returns:
+            result (dict): Decoded document with compact list items.
+        """
+        decoder = cls(compact_item)
+        text_decoder = codecs.getincrementaldecoder(
+            response.encoding or "utf-8")()
+        for chunk in response.iter_content(chunk_size=cls.chunk_size):
+            decoder.feed(text_decoder.decode(chunk))
+        decoder.feed(text_decoder.decode(b"", final=True))
+        return decoder.close()
+
+    @classmethod
+    def decode_hourly(cls, response):
+        """Decodes a 3-hourly forecast response into compact records.
+
+        Args:
+            response (requests.Response): Response opened with
+                stream=True.
+
+        Returns:
+            (dict): Decoded forecast.
+        """
+        return cls.decode(response, cls.hourly_item)
+
+    @classmethod
+    def decode_daily(cls, response):
+        """Decodes a daily forecast response into compact records.
+
+        Args:
+            response (requests.Response): Response opened with
+                stream=True.
+
+        Returns:
+            (dict): Decoded forecast.
+        """
+        return cls.decode(response, cls.daily_item)
+
+    @staticmethod
+    def hourly_item(item):
+        """Reduces a 3-hourly forecast item to the fields displayed.
+
+        Rain and snow are kept only when the amount for 3h is given.
+
+        Args:
+            item (dict): Forecast item as sent by Open Weather.
+
+        Returns:
+            record (dict): Compact item with the same structure.
+        """
+        main = item["main"]
+        record = {"dt": item["dt"],
+                  "main": {"temp": main["temp"],
+                           "pressure": main["pressure"],
+                           "humidity": main["humidity"]},
+                  "clouds": {"all": item["clouds"]["all"]},
+                  "wind": {key: value for key, value in item["wind"].items()
+                           if key in ("speed", "deg")},
+                  "weather": [{"icon": item["weather"][0]["icon"]}]}
+        for name in ["rain", "snow"]:
+            if "3h" in item.get(name, {}):
+                record[name] = {"3h": item[name]["3h"]}
+        return record
+
+    @staticmethod
+    def daily_item(item):
+        """Reduces a daily forecast item to the fields displayed.
+
+        Args:
+            item (dict): Forecast item as sent by Open Weather.
+
+        Returns:
+            record (dict): Compact item with the same structure.
+        """
+        record = {key: item[key] for key in
+                  ("dt", "temp", "pressure", "humidity", "speed", "deg",
+                   "clouds", "rain", "snow") if key in item}
+        weather = item["weather"][0]
+        record["weather"] = [{"icon": weather["icon"],
+                              "description": weather["description"]}]
+        return record
+
+    def _skip_whitespace(self):
+        """Moves pos past any whitespace.
+
+        Returns:
+            (str | None): Character at pos or None if buffer is used up.
+        """
+        while self.pos < len(self.buffer) and self.buffer[self.pos] in \
+                " \t\n\r":
+            self.pos += 1
+        if self.pos < len(self.buffer):
+            return self.buffer[self.pos]
+        return None
+
+    def _decode_value(self, final):
+        """Decodes a complete json value starting at pos.
+
+        Numbers at the end of the buffer may still be incomplete (e.g.
+        "0." cut from "0.25"), so before the end of the stream a value
+        is accepted only when followed by whitespace or a delimiter.
+
+        Args:
+            final (bool): True if no more text will arrive.
+
+        Returns:
+            (tuple[bool, any]): True and the value if it was decoded or
+                False and None if more text is needed.
+        """
+        try:
+            value, end = self._json_decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        if not final and (end == len(self.buffer)
+                          or self.buffer[end] not in " \t\n\r,:]}"):
+            return False, None
+        self.pos = end
+        return True, value
+
+    def feed(self, text, final=False):
+        """Decodes as much of the document as possible.
+
+        Args:
+            text (str): Next part of the document.
+            final (bool): True if no more text will arrive.
+
+        Returns:
+            None
+        """
+        self.buffer += text
+        while self.state != "done":
+            char = self._skip_whitespace()
+            if char is None:
+                break
+            if self.state == "start":
+                if char != "{":
+                    raise ValueError("Expected a json object.")
+                self.pos += 1
+                self.state = "key"
+            elif self.state == "key":
+                if char == "}":
+                    self.pos += 1
+                    self.state = "done"
+                    continue
+                decoded, self.key = self._decode_value(final)
+                if not decoded:
+                    break
+                self.state = "colon"
+            elif self.state == "colon":
+                if char != ":":
+                    raise ValueError("Expected ':' at {0}.".format(self.pos))
+                self.pos += 1
+                self.state = "value"
+            elif self.state == "value":
+                if self.key == "list" and char == "[":
+                    self.pos += 1
+                    self.result["list"] = []
+                    self.state = "item"
+                    continue
+                decoded, value = self._decode_value(final)
+                if not decoded:
+                    break
+                self.result[self.key] = value
+                self.state = "separator"
+            elif self.state == "separator":
+                if char not in ",}":
+                    raise ValueError("Expected ',' or '}}' at {0}.".format(
+                        self.pos))
+                self.pos += 1
+                self.state = "key" if char == "," else "done"
+            elif self.state == "item":
+                if char == "]":
+                    self.pos += 1
+                    self.state = "separator"
+                    continue
+                decoded, item = self._decode_value(final)
+                if not decoded:
+                    break
+                self.result["list"].append(self.compact_item(item))
+                self.state = "item_separator"
+            elif self.state == "item_separator":
+                if char not in ",]":
+                    raise ValueError("Expected ',' or ']' at {0}.".format(
+                        self.pos))
+                self.pos += 1
+                self.state = "item" if char == "," else "separator"
+        # Drop decoded text.
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+
+    def close(self):
+        """Finishes decoding.
+
+        Returns:
+            result (dict): Decoded document.
+        """
+        self.feed("", final=True)
+        if self.state != "done":
+            raise ValueError("Incomplete json document.")
+        return self.result
+
+
+class CurrentWeather(object):
+    """Current weather report.
+
+    Flat record built out of the "weather" report of Open Weather.
+    Numeric values missing from the report are set to NaN.
+
+    """
+
+    __slots__ = ("dt", "name", "country", "lat", "lon", "temp", "temp_min",
+                 "temp_max", "pressure", "humidity", "clouds", "wind_speed",
+                 "wind_deg", "description", "icon", "sunrise", "sunset")
+
+    def __init__(self, **fields):
+        """Initialise CurrentWeather.
+
+        Args:
+            **fields: Values for the attributes listed in __slots__.
+                Attributes not given are set to NaN.
+        """
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name, math.nan))
+
+    @classmethod
+    def from_dict(cls, weather_dict):
+        """Builds the record out of a current weather report.
+
+        Args:
+            weather_dict (dict): Current weather report from Open
+                Weather.
+
+        Returns:
+            (CurrentWeather): Current weather record.
+        """
+        main = weather_dict["main"]
+        wind = weather_dict.get("wind", {})
+        sys_dict = weather_dict.get("sys", {})
+        weather = weather_dict["weather"][0]
+        return cls(dt=weather_dict.get("dt", math.nan),
+                   name=weather_dict["name"],
+                   # Locations outside of any country (e.g. Antarctic)
+                   # have no country code.
+                   country=sys_dict.get("country", ""),
+                   lat=weather_dict["coord"]["lat"],
+                   lon=weather_dict["coord"]["lon"],
+                   temp=main["temp"],
+                   temp_min=main.get("temp_min", math.nan),
+                   temp_max=main.get("temp_max", math.nan),
+                   pressure=main["pressure"],
+                   humidity=main["humidity"],
+                   clouds=weather_dict.get("clouds", {}).get("all", math.nan),
+                   wind_speed=wind.get("speed", math.nan),
+                   wind_deg=wind.get("deg", math.nan),
+                   description=weather["description"],
+                   icon=weather["icon"],
+                   sunrise=sys_dict.get("sunrise", math.nan),
+                   sunset=sys_dict.get("sunset", math.nan))
+
+
+class ForecastSeries(object):
+    """3-hourly forecast stored column by column.
+
+    Every numeric field is kept in its own array, one value per
+    forecast item, so the whole series takes a few kilobytes. Values
+    missing in an item (e.g. rain or snow) are NaN.
+
+    """
+
+    __slots__ = ("dt", "temp", "pressure", "humidity", "clouds",
+                 "wind_speed", "wind_deg", "rain", "snow", "icons")
+
+    # Numeric columns and the (dictionary, key) path to their value in
+    # a forecast item.
+    columns = {"temp": ("main", "temp"),
+               "pressure": ("main", "pressure"),
+               "humidity": ("main", "humidity"),
+               "clouds": ("clouds", "all"),
+               "wind_speed": ("wind", "speed"),
+               "wind_deg": ("wind", "deg"),
+               "rain": ("rain", "3h"),
+               "snow": ("snow", "3h")}
+
+    def __init__(self):
+        """Initialise an empty ForecastSeries.
+
+        :Attributes:
+        :dt (array.array): Unix time of each item.
+        :temp, pressure, humidity, clouds, wind_speed, wind_deg, rain,
+            snow (array.array): Numeric columns.
+        :icons (list[str]): Weather icon name of each item.
+        """
+        self.dt = array.array("q")
+        for name in self.columns:
+            setattr(self, name, array.array("d"))
+        self.icons = []
+
+    def __len__(self):
+        return len(self.dt)
+
+    @classmethod
+    def from_list(cls, items):
+        """Builds the series out of the "list" of a forecast report.
+
+        Args:
+            items (list[dict]): Forecast items from Open Weather.
+
+        Returns:
+            series (ForecastSeries): Forecast series.
+        """
+        series = cls()
+        columns = [(getattr(series, name), path)
+                   for name, path in cls.columns.items()]
+        for item in items:
+            series.dt.append(item["dt"])
+            for column, (sub_key, key) in columns:
+                column.append(item.get(sub_key, {}).get(key, math.nan))
+            series.icons.append(item["weather"][0]["icon"])
+        return series
+
+
+class DailyForecast(object):
+    """Daily forecast stored column by column.
+
+    Built out of the "forecast/daily" report of Open Weather the same
+    way ForecastSeries is built out of the 3-hourly one. Values missing
+    in an item (e.g. rain or snow) are NaN.
+
+    """
+
+    __slots__ = ("dt", "temp_min", "temp_max", "temp_day", "pressure",
+                 "humidity", "clouds", "wind_speed", "wind_deg", "rain",
+                 "snow", "icons", "descriptions")
+
+    # Numeric columns and the path of keys to their value in a daily
+    # forecast item.
+    columns = {"temp_min": ("temp", "min"),
+               "temp_max": ("temp", "max"),
+               "temp_day": ("temp", "day"),
+               "pressure": ("pressure",),
+               "humidity": ("humidity",),
+               "clouds": ("clouds",),
+               "wind_speed": ("speed",),
+               "wind_deg": ("deg",),
+               "rain": ("rain",),
+               "snow": ("snow",)}
+
+    def __init__(self):
+        """Initialise an empty DailyForecast.
+
+        :Attributes:
+        :dt (array.array): Unix time of each day.
+        :temp_min, temp_max, temp_day, pressure, humidity, clouds,
+            wind_speed, wind_deg, rain, snow (array.array): Numeric
+            columns.
+        :icons (list[str]): Weather icon name of each day.
+        :descriptions (list[str]): Weather description of each day.
+        """
+        self.dt = array.array("q")
+        for name in self.columns:
+            setattr(self, name, array.array("d"))
+        self.icons = []
+        self.descriptions = []
+
+    def __len__(self):
+        return len(self.dt)
+
+    @classmethod
+    def from_list(cls, items):
+        """Builds the forecast out of the "list" of a daily report.
+
+        Args:
+            items (list[dict]): Daily forecast items from Open Weather.
+
+        Returns:
+            forecast (DailyForecast): Daily forecast.
+        """
+        forecast = cls()
+        columns = [(getattr(forecast, name), path)
+                   for name, path in cls.columns.items()]
+        for item in items:
+            forecast.dt.append(item["dt"])
+            for column, path in columns:
+                value = item
+                for key in path:
+                    value = value.get(key, math.nan) \
+                        if isinstance(value, dict) else math.nan
+                column.append(value)
+            weather = item["weather"][0]
+            forecast.icons.append(weather["icon"])
+            forecast.descriptions.append(weather.get("description", ""))
+        return forecast
+
+
+class DaySummary(object):
+    """Per-day aggregates of a 3-hourly forecast.
+
+    Forecast items are grouped into calendar days in the local time of
+    the location and every column holds one value per day. All the
+    aggregates are computed with NumPy on the arrays of ForecastSeries
+    without looping over forecast items in Python.
+
+    """
+
+    __slots__ = ("dt", "count", "temp_min", "temp_max", "temp_mean",
+                 "rain", "snow", "icons")
+
+    def __init__(self):
+        """Initialise an empty DaySummary.
+
+        :Attributes:
+        :dt (numpy.ndarray): Unix time of the first forecast item of
+            each day.
+        :count (numpy.ndarray): Amount of forecast items in each day.
+        :temp_min, temp_max, temp_mean (numpy.ndarray): Temperatures.
+        :rain, snow (numpy.ndarray): Total precipitation of each day in
+            mm. Zero if none forecast.
+        :icons (list[str]): Most frequent weather icon of each day.
+        """
+        self.dt = np.empty(0, dtype=np.int64)
+        self.count = np.empty(0, dtype=np.int64)
+        for name in ["temp_min", "temp_max", "temp_mean", "rain", "snow"]:
+            setattr(self, name, np.empty(0))
+        self.icons = []
+
+    def __len__(self):
+        return len(self.dt)
+
+    @classmethod
+    def from_series(cls, series, utc_offset=0):
+        """Builds the day summary of a forecast.
+
+        Args:
+            series (ForecastSeries): 3-hourly forecast ordered by time.
+            utc_offset (int): Offset of the local time in seconds used
+                to split the forecast into calendar days.
+
+        Returns:
+            summary (DaySummary): Per-day aggregates.
+        """
+        summary = cls()
+        if not len(series):
+            return summary
+        # The arrays of the series are wrapped without copying them.
+        dt = np.frombuffer(series.dt, dtype=np.int64)
+        temp = np.frombuffer(series.temp)
+        rain = np.nan_to_num(np.frombuffer(series.rain))
+        snow = np.nan_to_num(np.frombuffer(series.snow))
+
+        # Items are ordered by time so every day starts where the day
+        # number changes.
+        days = (dt + utc_offset) // 86400
+        starts = np.flatnonzero(np.concatenate(([True],
+                                                days[1:] != days[:-1])))
+        summary.dt = dt[starts]
+        summary.count = np.diff(np.append(starts, len(dt)))
+        summary.temp_min = np.minimum.reduceat(temp, starts)
+        summary.temp_max = np.maximum.reduceat(temp, starts)
+        summary.temp_mean = np.add.reduceat(temp, starts) / summary.count
+        summary.rain = np.add.reduceat(rain, starts)
+        summary.snow = np.add.reduceat(snow, starts)
+
+        # Count icons in each day and note where each of them is seen
+        # first. Ties go to the icon seen first during the day.
+        names, codes = np.unique(series.icons, return_inverse=True)
+        cells = (np.repeat(np.arange(len(starts)), summary.count),
+                 codes.ravel())
+        counts = np.zeros((len(starts), len(names)), dtype=np.int64)
+        np.add.at(counts, cells, 1)
+        first = np.full(counts.shape, len(dt), dtype=np.int64)
+        np.minimum.at(first, cells, np.arange(len(dt)))
+        scores = counts * len(dt) - first
+        summary.icons = names[scores.argmax(axis=1)].tolist()
+        return summary
+
+    def to_list(self):
+        """Converts the summary into a list of rows.
+
+        Returns:
+            rows (list[dict]): One dictionary per day with plain Python
+                values, suitable for saving as json.
+        """
+        columns = {name: getattr(self, name).tolist()
+                   for name in self.__slots__ if name != "icons"}
+        columns["icons"] = self.icons
+        return [{name: column[index] for name, column in columns.items()}
+                for index in range(len(self))]
+
+
+class UnitConverter(object):
+    """Builds imperial weather reports out of metric ones.
+
+    Open Weather reports differ between unit systems only in
+    temperatures (degC / degF) and wind speeds (m/s / mile/hr). All
+    other values (pressure, humidity, rain, snow) are given in the same
+    units in both.
+
+    """
+
+    # Temperature keys in the "main" dictionary of current weather and
+    # 3-hourly forecast items.
+    main_temp_keys = ["temp", "temp_min", "temp_max", "feels_like"]
+    # Keys of the "temp" / "feels_like" dictionaries in daily forecast
+    # items.
+    daily_temp_keys = ["day", "min", "max", "night", "eve", "morn"]
+    wind_keys = ["speed", "gust"]
+    mph_per_mps = 3600 / 1609.344
+
+    @staticmethod
+    def c_to_f(temp):
+        """Converts temperature from degC to degF.
+
+        Args:
+            temp (float): Temperature in degC.
+
+        Returns:
+            (float): Temperature in degF.
+        """
+        return round(temp * 1.8 + 32, 2)
+
+    @classmethod
+    def mps_to_mph(cls, speed):
+        """Converts speed from m/s to mile/hr.
+
+        Args:
+            speed (float): Speed in m/s.
+
+        Returns:
+            (float): Speed in mile/hr.
+        """
+        return round(speed * cls.mph_per_mps, 2)
+
+    @classmethod
+    def to_imperial(cls, weather_dict, key):
+        """Converts a metric weather report to imperial units.
+
+        Args:
+            weather_dict (dict): Report from Open Weather in metric units.
+            key (str): Type of report: "w_d_cur", "w_d_short" or
+                "w_d_long".
+
+        Returns:
+            imperial_dict (dict): Copy of weather_dict in imperial units.
+        """
+        imperial_dict = copy.deepcopy(weather_dict)
+        if key == "w_d_cur":
+            cls._convert_item(imperial_dict)
+        else:
+            for item in imperial_dict.get("list", []):
+                cls._convert_item(item)
+        return imperial_dict
+
+    @classmethod
+    def _convert_item(cls, item):
+        """Converts in place temperatures and wind speeds of a single
+        report item (current weather or a forecast list item).
+
+        Args:
+            item (dict): Report item in metric units.
+
+        Returns:
+            None
+        """
+        main = item.get("main", {})
+        for temp_key in cls.main_temp_keys:
+            if temp_key in main:
+                main[temp_key] = cls.c_to_f(main[temp_key])
+        # Daily forecast keeps temperatures in sub dictionaries.
+        for sub_key in ["temp", "feels_like"]:
+            sub_dict = item.get(sub_key)
+            if isinstance(sub_dict, dict):
+                for temp_key in cls.daily_temp_keys:
+                    if temp_key in sub_dict:
+                        sub_dict[temp_key] = cls.c_to_f(sub_dict[temp_key])
+        # Current and 3-hourly reports keep wind in a "wind"
+        # dictionary, daily forecast keeps it in the item itself.
+        wind = item.get("wind", item)
+        for wind_key in cls.wind_keys:
+            if wind_key in wind:
+                wind[wind_key] = cls.mps_to_mph(wind[wind_key])
+
+
+class ResponseCache(object):
+    """Stores Open Weather responses for reuse while they are still fresh.
+
+    Entries are keyed by (endpoint, normalized location, units) and
+    expire after a time to live set separately for each endpoint. When
+    the amount of entries exceeds max_entries the least recently used
+    ones are evicted. The cache is kept in a json file so it survives
+    application restarts.
+
+    """
+
+    # Time to live in seconds for each endpoint. Open Weather refreshes
+    # current weather every 10 minutes and forecasts a few times a day.
+    ttls = {"weather": 600,
+            "forecast": 1800,
+            "forecast/daily": 3600}
+
+    def __init__(self, path, max_entries=120):
+        """Initialise ResponseCache and load entries saved on disk.
+
+        Args:
+            path (str): Path to the json file with cached responses.
+            max_entries (int): Maximum amount of responses kept.
+
+        :Attributes:
+        :path (str): Path to the json file with cached responses.
+        :max_entries (int): Maximum amount of responses kept.
+        :entries (collections.OrderedDict): Cached entries ordered from
+            the least to the most recently used. Each entry is a
+            [time stored, response] list.
+        :lock (threading.Lock): Guards entries against concurrent use.
+        :dirty (bool): True when entries were stored or removed since
+            they were last saved.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def make_key(endpoint, location, units):
+        """Builds a key for an entry.
+
+        Location is lower cased and all separators are reduced to single
+        spaces so that e.g. "London,GB" and "london gb" share one entry.
+
+        Args:
+            endpoint (str): API endpoint e.g. "weather" or "forecast".
+            location (str): Location the response is for.
+            units (str): Units of the response ("metric", "imperial" or
+                "" when not applicable).
+
+        Returns:
+            key (str): Key of the entry.
+        """
+        location = " ".join(location.lower().replace(",", " ").split())
+        return "{0}|{1}|{2}".format(endpoint, location, units)
+
+    def get(self, endpoint, location, units):
+        """Returns a cached response if it is still fresh.
+
+        Args:
+            endpoint (str): API endpoint e.g. "weather" or "forecast".
+            location (str): Location the response is for.
+            units (str): Units of the response.
+
+        Returns:
+            response (dict | None): Cached response or None if missing
+                or expired.
+        """
+        key = self.make_key(endpoint, location, units)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.ttls.get(endpoint, 0):
+                del self.entries[key]
+                self.dirty = True
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, endpoint, location, units, response):
+        """Stores a response and evicts the least recently used entries
+        over the limit.
+
+        Args:
+            endpoint (str): API endpoint e.g. "weather" or "forecast".
+            location (str): Location the response is for.
+            units (str): Units of the response.
+            response (dict): Response to store.
+
+        Returns:
+            None
+        """
+        key = self.make_key(endpoint, location, units)
+        with self.lock:
+            self.entries[key] = [time.time(), response]
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+
+    def load(self):
+        """Loads entries saved on disk. Expired entries are skipped.
+
+        Returns:
+            None
+        """
+        try:
+            with open(self.path, "r") as file:
+                entries = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return
+        now = time.time()
+        with self.lock:
+            for key, entry in entries:
+                endpoint = key.split("|")[0]
+                if now - entry[0] <= self.ttls.get(endpoint, 0):
+                    self.entries[key] = entry
+
+    def save(self):
+        """Saves all entries on disk if they changed since the last
+        save. File is replaced atomically so that a crash while saving
+        cannot corrupt the cache.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+            entries = list(self.entries.items())
+            self.dirty = False
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(entries, file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            self.dirty = True
+            raise
+
+
+class Database(object):
+    """Long-lived connections to an SQLite database.
+
+    Every thread gets its own connection opened on first use and kept
+    open until close is called, as sqlite3 connections must not be
+    used by several threads at once. Connections use write-ahead
+    logging, so readers and the writer do not block each other, and
+    synchronous=NORMAL, so a commit does not wait for the disk. Each
+    connection keeps compiled statements in its statement cache, keyed
+    by the SQL text, and reuses them on every call.
+
+    """
+
+    def __init__(self, path, cached_statements=64):
+        """Initialise Database.
+
+        Args:
+            path (str): Path to the database file.
+            cached_statements (int): Amount of compiled statements kept
+                by each connection.
+
+        :Attributes:
+        :path (str): Path to the database file.
+        :cached_statements (int): Amount of compiled statements kept by
+            each connection.
+        :local (threading.local): Connection of the current thread.
+        :connections (list[sqlite3.Connection]): Connections of all
+            threads.
+        :lock (threading.Lock): Guards connections.
+        """
+        self.path = path
+        self.cached_statements = cached_statements
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def connection(self):
+        """Returns connection of the current thread.
+
+        Returns:
+            conn (sqlite3.Connection): Open connection.
+        """
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            # Connections are closed by close which may run on another
+            # thread.
+            conn = sqlite3.connect(self.path,
+                                   cached_statements=self.cached_statements,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def execute(self, sql, parameters=()):
+        """Executes a statement on connection of the current thread.
+
+        Args:
+            sql (str): SQL statement.
+            parameters (tuple): Parameters of the statement.
+
+        Returns:
+            cursor (sqlite3.Cursor): Cursor with the results.
+        """
+        return self.connection().execute(sql, parameters)
+
+    def transaction(self):
+        """Context manager running statements in one transaction which
+        is committed at exit or rolled back on an exception.
+
+        Returns:
+            conn (sqlite3.Connection): Connection of the current thread.
+        """
+        return self.connection()
+
+    def migrate(self, migrations):
+        """Brings the schema up to date. Version of the schema is kept
+        in user_version of the database and every migration newer than
+        it runs in its own transaction.
+
+        Args:
+            migrations (list[list[str]]): SQL statements of each schema
+                version, oldest first.
+
+        Returns:
+            version (int): Version of the schema after migrating.
+        """
+        version = self.execute("PRAGMA user_version").fetchone()[0]
+        for number, statements in enumerate(migrations, 1):
+            if number <= version:
+                continue
+            with self.transaction() as conn:
+                # sqlite3 does not open a transaction before DDL
+                # statements on its own, they would be committed one by
+                # one.
+                conn.execute("BEGIN")
+                for statement in statements:
+                    conn.execute(statement)
+                # PRAGMA does not accept parameters.
+                conn.execute("PRAGMA user_version={0:d}".format(number))
+            version = number
+        return version
+
+    def close(self):
+        """Closes connections of all threads.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections = []
+        self.local = threading.local()
+
+
+class LocationRanking(object):
+    """Most searched locations kept in memory in the order of
+    loc_combobox.
+
+    Holds only the first size locations ordered by amount of calls
+    (most first) and by name for equal amounts, the same order as
+    Report.view. Amounts of calls only ever grow, so a location
+    outside of the ranking can only take the place of the last one and
+    the ranking stays exact without looking at the other locations.
+
+    """
+
+    def __init__(self, size=10):
+        """Initialise an empty LocationRanking.
+
+        Args:
+            size (int): Amount of locations kept.
+
+        :Attributes:
+        :size (int): Amount of locations kept.
+        :entries (list[tuple[int, str]]): Negated amount of calls and
+            name of each kept location in the ranking order.
+        :locations (list[str]): Names of kept locations in the ranking
+            order.
+        """
+        self.size = size
+        self.entries = []
+        self.locations = []
+
+    def load(self, rows):
+        """Replaces the ranking with rows read from the database.
+
+        Args:
+            rows (iterable[tuple[str, int]]): Name and amount of calls
+                of locations.
+
+        Returns:
+            None
+        """
+        self.entries = sorted((-calls, location)
+                              for location, calls in rows)[:self.size]
+        self.locations = [location for _, location in self.entries]
+
+    def update(self, location, calls):
+        """Moves location to its place for a grown amount of calls.
+
+        Args:
+            location (str): Name of the location.
+            calls (int): New amount of calls of the location.
+
+        Returns:
+            None
+        """
+        entry = (-calls, location)
+        entries = [kept for kept in self.entries if kept[1] != location]
+        if len(entries) == len(self.entries) and \
+                len(entries) == self.size and entry > entries[-1]:
+            return
+        bisect.insort(entries, entry)
+        self.entries = entries[:self.size]
+        # A new list, so lists handed out before are left unchanged.
+        self.locations = [kept[1] for kept in self.entries]
+
+
+class LocationIndex(object):
+    """Prefix index of location names for autocompletion.
+
+    Names are normalised (case, accents and punctuation are ignored)
+    and indexed from the start of every word, so "york" finds
+    "New York, US" as well. Each index is a sorted array of keys
+    searched with bisect. Searched locations are ranked by amount of
+    calls and offered first, followed by names of the city list in
+    alphabetical order. The city list is large and never changes, so
+    it is built once into its own arrays, which are replaced as a
+    whole.
+
+    """
+
+    # Letters which are not split into a base letter and an accent by
+    # unicode normalisation.
+    letters = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ħ": "h",
+                             "ı": "i", "æ": "ae", "œ": "oe", "þ": "th"})
+
+    def __init__(self):
+        """Initialise an empty LocationIndex.
+
+        :Attributes:
+        :calls (dict[str, int]): Amount of calls of searched locations.
+        :keys (list[str]): Sorted keys of searched locations.
+        :names (list[str]): Location of each of keys.
+        :cities (tuple[list[str], list[str]]): Sorted keys of the city
+            list and the name of each.
+        :lock (threading.Lock): Guards searched locations against
+            concurrent use.
+        :ready (bool): True once searched locations are loaded.
+        """
+        self.calls = {}
+        self.keys = []
+        self.names = []
+        self.cities = ([], [])
+        self.lock = threading.Lock()
+        self.ready = False
+
+    @classmethod
+    def normalize(cls, text):
+        """Returns text in the form used by keys of the index.
+
+        Args:
+            text (str): Location name or text typed by the user.
+
+        Returns:
+            key (str): Lower case text without accents and with words
+                separated by single spaces.
+        """
+        text = unicodedata.normalize("NFKD", text.casefold())
+        text = "".join(char for char in text
+                       if not unicodedata.combining(char))
+        return " ".join(re.split(r"[\W_]+", text.translate(cls.letters)
+                                 )).strip()
+
+    @classmethod
+    def make_keys(cls, name):
+        """Returns keys of a name starting at each of its words.
+
+        Args:
+            name (str): Location name.
+
+        Returns:
+            keys (list[str]): Keys of the name.
+        """
+        key = cls.normalize(name)
+        return [key[i:] for i in range(len(key))
+                if i == 0 or key[i - 1] == " "]
+
+    @staticmethod
+    def _range(keys, prefix):
+        """Returns slice bounds of keys starting with prefix."""
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + "\U0010ffff", start)
+        return start, end
+
+    def load_history(self, rows):
+        """Loads searched locations from rows of the database.
+        Locations updated while loading keep their newer amount of
+        calls.
+
+        Args:
+            rows (iterable[tuple[str, int]]): Name and amount of calls
+                of locations.
+
+        Returns:
+            None
+        """
+        calls = dict(rows)
+        entries = sorted((key, name) for name in calls
+                         for key in self.make_keys(name))
+        keys = [entry[0] for entry in entries]
+        names = [entry[1] for entry in entries]
+        with self.lock:
+            for location, location_calls in self.calls.items():
+                if location not in calls:
+                    for key in self.make_keys(location):
+                        i = bisect.bisect_left(keys, key)
+                        keys.insert(i, key)
+                        names.insert(i, location)
+                calls[location] = location_calls
+            self.calls = calls
+            self.keys = keys
+            self.names = names
+            self.ready = True
+
+    def load_cities(self, path):
+        """Builds the city index out of a city list of Open Weather
+        (city.list.json, optionally gzipped).
+
+        Args:
+            path (str): Path to the city list.
+
+        Returns:
+            None
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as file:
+            cities = json.load(file)
+        names = set()
+        for city in cities:
+            if city.get("country"):
+                names.add("{0}, {1}".format(city["name"], city["country"]))
+            else:
+                names.add(city["name"])
+        del cities
+        entries = sorted((key, name) for name in names
+                         for key in self.make_keys(name))
+        self.cities = ([entry[0] for entry in entries],
+                       [entry[1] for entry in entries])
+
+    def update(self, location, calls):
+        """Adds a searched location or changes its amount of calls.
+
+        Args:
+            location (str): Name of the location.
+            calls (int): Amount of calls of the location.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if location not in self.calls:
+                for key in self.make_keys(location):
+                    i = bisect.bisect_left(self.keys, key)
+                    self.keys.insert(i, key)
+                    self.names.insert(i, location)
+            self.calls[location] = calls
+
+    def complete(self, text, limit=10):
+        """Returns locations starting with text at a word.
+
+        Args:
+            text (str): Text typed by the user.
+            limit (int): Maximum amount of locations.
+
+        Returns:
+            locations (list[str]): Searched locations ordered by amount
+                of calls, then names of the city list.
+        """
+        prefix = self.normalize(text)
+        if not prefix:
+            return []
+        with self.lock:
+            start, end = self._range(self.keys, prefix)
+            found = set(self.names[start:end])
+            locations = heapq.nsmallest(
+                limit, found, key=lambda name: (-self.calls[name], name))
+        keys, names = self.cities
+        start, end = self._range(keys, prefix)
+        for i in range(start, end):
+            if len(locations) == limit:
+                break
+            name = names[i]
+            if name not in found:
+                found.add(name)
+                locations.append(name)
+        return locations
+
+
+class UsageCounter(object):
+    """Write-behind counter of calls of locations.
+
+    Calls are counted in memory and location_ranking is updated right
+    away, while increments are written to the locations table later by
+    flush, all of them in one transaction. The stored amount of calls of
+    a location is read once, when the location is counted for the
+    first time. A failed or interrupted flush leaves the table as it
+    was and its increments are kept for the next one, so at most the
+    increments counted since the last flush are lost when the
+    application crashes.
+
+    """
+
+    def __init__(self, database, ranking):
+        """Initialise UsageCounter.
+
+        Args:
+            database (Database): Connections to locations.db.
+            ranking (LocationRanking): Ranking updated with every call.
+
+        :Attributes:
+        :database (Database): Connections to locations.db.
+        :ranking (LocationRanking): Ranking updated with every call.
+        :calls (dict[str, int]): Amount of calls of counted locations,
+            including increments not written yet.
+        :pending (collections.Counter): Increments not written yet.
+        :lock (threading.Lock): Guards calls and pending against
+            concurrent use.
+        """
+        self.database = database
+        self.ranking = ranking
+        self.calls = {}
+        self.pending = collections.Counter()
+        self.lock = threading.Lock()
+
+    def count(self, location):
+        """Counts another call of location.
+
+        Args:
+            location (str): Name of the location.
+
+        Returns:
+            calls (int): Amount of calls of the location.
+        """
+        with self.lock:
+            calls = self.calls.get(location)
+            if calls is None:
+                row = self.database.execute(
+                    "SELECT Num_of_calls FROM locations WHERE Location=?",
+                    (location, )).fetchone()
+                calls = 0 if row is None else row[0]
+            calls += 1
+            self.calls[location] = calls
+            self.pending[location] += 1
+            self.ranking.update(location, calls)
+        return calls
+
+    def flush(self):
+        """Writes pending increments in one transaction.
+
+        Returns:
+            written (int): Amount of locations written.
+        """
+        with self.lock:
+            pending = self.pending
+            self.pending = collections.Counter()
+        if not pending:
+            return 0
+        try:
+            with self.database.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO locations (Location, Num_of_calls) "
+                    "VALUES (?, ?) ON CONFLICT (Location) DO UPDATE "
+                    "SET Num_of_calls = Num_of_calls + excluded.Num_of_calls",
+                    pending.items())
+        except sqlite3.Error:
+            with self.lock:
+                self.pending.update(pending)
+            raise
+        return len(pending)
+
+
+class WeatherHistory(object):
+    """Time series of weather reports kept in locations.db.
+
+    Current weather and every item of the 3-hourly forecast of fetched
+    reports are appended as samples keyed by location, time and units.
+    Numeric values of a sample are packed into a single blob of
+    doubles in the order of ForecastSeries.columns, so NaN survives
+    and a range of samples is unpacked with one join. Samples are
+    buffered in memory and written by flush in one transaction. An
+    observed sample replaces a forecast for the same time, a forecast
+    replaces only an older forecast.
+
+    """
+
+    columns = tuple(ForecastSeries.columns)
+
+    def __init__(self, database):
+        """Initialise WeatherHistory.
+
+        Args:
+            database (Database): Connections to locations.db.
+
+        :Attributes:
+        :database (Database): Connections to locations.db.
+        :pending (list[tuple]): Samples not written yet.
+        :location_ids (dict[str, int]): Id in the locations table of
+            each written location.
+        :lock (threading.Lock): Guards pending against concurrent use.
+        """
+        self.database = database
+        self.pending = []
+        self.location_ids = {}
+        self.lock = threading.Lock()
+
+    def append(self, location, units, series, forecast=True):
+        """Buffers every item of a series as a sample.
+
+        Args:
+            location (str): Name of the location.
+            units (str): Unit system of the values (metric / imperial).
+            series (ForecastSeries): Samples of the location.
+            forecast (bool): Set to False for observed weather.
+
+        Returns:
+            None
+        """
+        columns = [getattr(series, name) for name in self.columns]
+        samples = [(location, series.dt[i], units, int(forecast),
+                    array.array("d", [column[i] for column in columns])
+                    .tobytes(), series.icons[i])
+                   for i in range(len(series))]
+        with self.lock:
+            self.pending.extend(samples)
+
+    def _location_id(self, conn, location):
+        """Returns id of location, adding it to the locations table if
+        missing.
+
+        Args:
+            conn (sqlite3.Connection): Connection in a transaction.
+            location (str): Name of the location.
+
+        Returns:
+            location_id (int): Id in the locations table.
+        """
+        location_id = self.location_ids.get(location)
+        if location_id is None:
+            conn.execute("INSERT INTO locations (Location) VALUES (?) "
+                         "ON CONFLICT (Location) DO NOTHING", (location, ))
+            location_id = conn.execute(
+                "SELECT Id FROM locations WHERE Location=?",
+                (location, )).fetchone()[0]
+            self.location_ids[location] = location_id
+        return location_id
+
+    def flush(self):
+        """Writes buffered samples in one transaction.
+
+        Returns:
+            written (int): Amount of samples written.
+        """
+        with self.lock:
+            pending = self.pending
+            self.pending = []
+        if not pending:
+            return 0
+        try:
+            with self.database.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO history (Location_id, Dt, Units, Forecast, "
+                    "Data, Icon) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (Location_id, Dt, Units) DO UPDATE "
+                    "SET Forecast = excluded.Forecast, Data = excluded.Data, "
+                    "Icon = excluded.Icon "
+                    "WHERE excluded.Forecast <= history.Forecast",
+                    [(self._location_id(conn, sample[0]), ) + sample[1:]
+                     for sample in pending])
+        except sqlite3.Error:
+            # Ids of a rolled back transaction may not exist.
+            self.location_ids = {}
+            with self.lock:
+                self.pending[:0] = pending
+            raise
+        return len(pending)
+
+    def range(self, location, units, start, end):
+        """Reads samples of a location between two times. Buffered
+        samples are written first.
+
+        Args:
+            location (str): Name of the location.
+            units (str): Unit system of the values (metric / imperial).
+            start (int): Unix time of the first sample.
+            end (int): Unix time of the last sample.
+
+        Returns:
+            series (ForecastSeries): Samples ordered by time.
+        """
+        self.flush()
+        rows = self.database.execute(
+            "SELECT Dt, Data, Icon FROM history "
+            "WHERE Location_id = (SELECT Id FROM locations WHERE Location=?) "
+            "AND Dt BETWEEN ? AND ? AND Units=? ORDER BY Dt",
+            (location, start, end, units)).fetchall()
+        series = ForecastSeries()
+        series.dt.extend(row[0] for row in rows)
+        values = array.array("d")
+        values.frombytes(b"".join(row[1] for row in rows))
+        step = len(self.columns)
+        for i, name in enumerate(self.columns):
+            setattr(series, name, values[i::step])
+        series.icons = [row[2] for row in rows]
+        return series
+
+
+class TimezoneStore(object):
+    """Keeps time zones obtained from geonames.org in locations.db.
+
+    Time zone of a place practically never changes, so it is stored
+    permanently under its coordinates rounded to 0.01 degree (about
+    1 km). An entry is revalidated only once the next daylight saving
+    time transition of its zone has passed, when geonames.org offsets
+    could have changed.
+
+    """
+
+    # Revalidation period for zones without daylight saving time or
+    # when the zone cannot be found in the time zone database.
+    max_age = 365 * 86400
+
+    def __init__(self, database):
+        """Initialise TimezoneStore.
+
+        Args:
+            database (Database): Connections to locations.db with the
+                timezones table created by Report.migrations.
+
+        :Attributes:
+        :database (Database): Connections to locations.db.
+        """
+        self.database = database
+
+    @staticmethod
+    def make_key(lat, lon):
+        """Rounds coordinates to hundredths of a degree.
+
+        Args:
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+
+        Returns:
+            key (tuple[int, int]): Rounded latitude and longitude
+                multiplied by 100.
+        """
+        return int(round(lat * 100)), int(round(lon * 100))
+
+    @classmethod
+    def next_revalidation(cls, timezone_id, now):
+        """Finds time of the first daylight saving time transition after
+        now in zone timezone_id.
+
+        Args:
+            timezone_id (str): IANA time zone name e.g. "Europe/London".
+            now (float): Current unix time.
+
+        Returns:
+            revalidate_at (int): Unix time when the entry should be
+                revalidated.
+        """
+        if zoneinfo is None:
+            return int(now + cls.max_age)
+        try:
+            zone = zoneinfo.ZoneInfo(timezone_id)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError, TypeError):
+            return int(now + cls.max_age)
+        start = datetime.datetime.fromtimestamp(now, tz=zone)
+        offset = start.utcoffset()
+        # Daily steps are precise enough to revalidate on the day after
+        # the transition.
+        for day in range(1, 367):
+            date = datetime.datetime.fromtimestamp(now + day * 86400,
+                                                   tz=zone)
+            if date.utcoffset() != offset:
+                return int(now + day * 86400)
+        return int(now + cls.max_age)
+
+    def get(self, lat, lon):
+        """Returns a stored time zone unless it needs revalidation.
+
+        Args:
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+
+        Returns:
+            time_zone (dict | None): Time zone as received from
+                geonames.org or None if missing or due for revalidation.
+        """
+        row = self.database.execute(
+            "SELECT Timezone, Revalidate_at FROM timezones "
+            "WHERE Lat=? AND Lon=?", self.make_key(lat, lon)).fetchone()
+        if row is None or time.time() >= row[1]:
+            return None
+        return json.loads(row[0])
+
+    def put(self, lat, lon, time_zone):
+        """Stores a time zone received from geonames.org.
+
+        Args:
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+            time_zone (dict): Time zone as received from geonames.org.
+
+        Returns:
+            None
+        """
+        revalidate_at = self.next_revalidation(time_zone.get("timezoneId"),
+                                               time.time())
+        with self.database.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO timezones "
+                         "(Lat, Lon, Timezone, Revalidate_at) "
+                         "VALUES (?, ?, ?, ?)",
+                         self.make_key(lat, lon)
+                         + (json.dumps(time_zone), revalidate_at))
+
+
+class TimezoneResolver(object):
+    """Resolves time zones of geolocations offline.
+
+    Uses zone.tab bundled from the IANA time zone database which gives
+    a representative point and a country code for every zone. A location
+    gets the zone of the nearest point within its country. Points are
+    kept in a grid of cell_size x cell_size degree cells so only the
+    neighbourhood of a location is searched. Offsets are then computed
+    locally with zoneinfo.
+
+    """
+
+    cell_size = 10
+
+    def __init__(self, path):
+        """Initialise TimezoneResolver. The zone file is loaded on the
+        first call to resolve.
+
+        Args:
+            path (str): Path to zone.tab.
+
+        :Attributes:
+        :path (str): Path to zone.tab.
+        :zones (list[tuple[float, float, str, str]]): Latitude,
+            longitude, country code and IANA name of each zone.
+        :grid (dict[tuple[int, int], list[int]]): Indexes of zones in
+            each grid cell.
+        :countries (dict[str, list[int]]): Indexes of zones in each
+            country.
+        """
+        self.path = path
+        self.zones = None
+        self.grid = {}
+        self.countries = {}
+
+    @staticmethod
+    def _parse_coord(text, degree_digits):
+        """Converts ISO 6709 coordinate (+-DDMM[SS] or +-DDDMM[SS]) to
+        decimal degrees.
+
+        Args:
+            text (str): Coordinate with a sign.
+            degree_digits (int): Amount of digits for degrees.
+
+        Returns:
+            (float): Coordinate in decimal degrees.
+        """
+        sign = -1 if text[0] == "-" else 1
+        digits = text[1:]
+        value = int(digits[:degree_digits])
+        value += int(digits[degree_digits:degree_digits + 2]) / 60
+        if len(digits) > degree_digits + 2:
+            value += int(digits[degree_digits + 2:]) / 3600
+        return sign * value
+
+    def _cell(self, lat, lon):
+        """Returns grid cell of a location.
+
+        Args:
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+
+        Returns:
+            (tuple[int, int]): Row and column of the cell.
+        """
+        return (int((lat + 90) // self.cell_size),
+                int((lon + 180) // self.cell_size) % (360 // self.cell_size))
+
+    def load(self):
+        """Reads zone.tab and builds the grid and country indexes.
+
+        Returns:
+            None
+        """
+        self.zones = []
+        with open(self.path, "r") as file:
+            for line in file:
+                if line.startswith("#"):
+                    continue
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 3:
+                    continue
+                coords = fields[1]
+                # Longitude starts at the second sign in the string.
+                split = max(coords.rfind("+"), coords.rfind("-"))
+                lat = self._parse_coord(coords[:split], 2)
+                lon = self._parse_coord(coords[split:], 3)
+                index = len(self.zones)
+                self.zones.append((lat, lon, fields[0], fields[2]))
+                self.grid.setdefault(self._cell(lat, lon), []).append(index)
+                self.countries.setdefault(fields[0], []).append(index)
+
+    def _nearby(self, lat, lon):
+        """Collects zones from the grid cells nearest to a location.
+
+        Cells are searched in growing square rings around the cell of
+        the location. One more ring is added after the first zone is
+        found as a closer one may lie just across a cell border.
+
+        Args:
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+
+        Returns:
+            indexes (list[int]): Indexes of zones near the location.
+        """
+        row, col = self._cell(lat, lon)
+        columns = 360 // self.cell_size
+        indexes = []
+        last_ring = 180 // self.cell_size
+        ring = 0
+        while ring <= last_ring:
+            for d_row in range(-ring, ring + 1):
+                for d_col in range(-ring, ring + 1):
+                    if max(abs(d_row), abs(d_col)) != ring:
+                        continue
+                    cell = (row + d_row, (col + d_col) % columns)
+                    indexes.extend(self.grid.get(cell, []))
+            if indexes and last_ring > ring + 1:
+                last_ring = ring + 1
+            ring += 1
+        return indexes
+
+    def _distance(self, index, lat, lon):
+        """Returns squared equirectangular distance between a zone point
+        and a location.
+
+        Args:
+            index (int): Index of the zone.
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+
+        Returns:
+            (float): Squared distance in degrees.
+        """
+        z_lat, z_lon = self.zones[index][:2]
+        d_lon = (z_lon - lon + 180) % 360 - 180
+        d_lon *= math.cos(math.radians((z_lat + lat) / 2))
+        return (z_lat - lat) ** 2 + d_lon ** 2
+
+    def resolve(self, lat, lon, country=None, utc_offset=None):
+        """Finds time zone of a location and computes its offsets.
+
+        Args:
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+            country (str): Optional ISO 3166 country code of the
+                location. Narrows the search to zones of that country.
+            utc_offset (int): Optional current offset from UTC in
+                seconds (given by Open Weather as "timezone"). Zones
+                with a different offset are skipped when possible.
+
+        Returns:
+            time_zone (dict | None): Time zone with the same keys as
+                given by geonames.org or None if it cannot be resolved
+                offline.
+        """
+        if zoneinfo is None:
+            return None
+        if self.zones is None:
+            self.load()
+        indexes = self.countries.get(country) or self._nearby(lat, lon)
+        if not indexes:
+            return None
+        indexes = sorted(indexes, key=lambda i: self._distance(i, lat, lon))
+        index = indexes[0]
+        if utc_offset is not None and len(indexes) > 1:
+            # Take the nearest zone with the offset reported by Open
+            # Weather.
+            for candidate in indexes:
+                if self._utc_offset(self.zones[candidate][3]) == utc_offset:
+                    index = candidate
+                    break
+        return self._offsets(self.zones[index], lat, lon)
+
+    @staticmethod
+    def _utc_offset(timezone_id):
+        """Returns current offset from UTC in seconds of a zone.
+
+        Args:
+            timezone_id (str): IANA time zone name.
+
+        Returns:
+            (int): Offset in seconds.
+        """
+        zone = zoneinfo.ZoneInfo(timezone_id)
+        return int(datetime.datetime.now(tz=zone).utcoffset().total_seconds())
+
+    @staticmethod
+    def _offsets(zone_row, lat, lon):
+        """Computes offsets of a zone the same way geonames.org does:
+        rawOffset without daylight saving time, gmtOffset on 1st January
+        and dstOffset on 1st July. All in hours.
+
+        Args:
+            zone_row (tuple[float, float, str, str]): Zone from zones.
+            lat (float): Latitude for the location.
+            lon (float): Longitude for the location.
+
+        Returns:
+            time_zone (dict): Time zone of the location.
+        """
+        zone = zoneinfo.ZoneInfo(zone_row[3])
+        now = datetime.datetime.now(tz=zone)
+        dst = now.dst() or datetime.timedelta(0)
+        jan = datetime.datetime(now.year, 1, 1, tzinfo=zone)
+        jul = datetime.datetime(now.year, 7, 1, tzinfo=zone)
+        hour = 3600
+        return {"timezoneId": zone_row[3],
+                "countryCode": zone_row[2],
+                "lat": lat,
+                "lng": lon,
+                "rawOffset": (now.utcoffset() - dst).total_seconds() / hour,
+                "gmtOffset": jan.utcoffset().total_seconds() / hour,
+                "dstOffset": jul.utcoffset().total_seconds() / hour}
 
 
 class Report(object):
@@ -18,6 +1962,46 @@ class Report(object):
 
     """
 
+    # Cardinal directions every 22.5 degrees starting from North.
+    wind_directions = ("N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+                       "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW")
+    wind_directions_array = np.array(wind_directions + ("",))
+
+    # Upserts (INSERT ... ON CONFLICT DO UPDATE) need SQLite 3.24.
+    min_sqlite_version = (3, 24, 0)
+
+    # Statements of each version of the locations.db schema, oldest
+    # first. Databases created by older versions of the application
+    # are at version 0 and upgraded in place.
+    migrations = [
+        ["CREATE TABLE IF NOT EXISTS locations("
+         "Id INTEGER NOT NULL PRIMARY KEY , "
+         "Location TEXT NOT NULL UNIQUE, "
+         "Num_of_calls INTEGER NOT NULL DEFAULT 0, "
+         "Units TEXT)",
+         # Covers the query of view, which then reads only the first
+         # entries of the index.
+         "CREATE INDEX IF NOT EXISTS locations_num_of_calls "
+         "ON locations (Num_of_calls DESC, Location)"],
+        # Samples are stored in the order of the primary key, which
+        # then serves as a covering index of ranges of a location.
+        ["CREATE TABLE IF NOT EXISTS history("
+         "Location_id INTEGER NOT NULL REFERENCES locations (Id), "
+         "Dt INTEGER NOT NULL, "
+         "Units TEXT NOT NULL, "
+         "Forecast INTEGER NOT NULL, "
+         "Data BLOB NOT NULL, "
+         "Icon TEXT NOT NULL, "
+         "PRIMARY KEY (Location_id, Dt, Units)) WITHOUT ROWID"],
+        # Used to be created by TimezoneStore itself, so it may exist.
+        ["CREATE TABLE IF NOT EXISTS timezones("
+         "Lat INTEGER NOT NULL, "
+         "Lon INTEGER NOT NULL, "
+         "Timezone TEXT NOT NULL, "
+         "Revalidate_at INTEGER NOT NULL, "
+         "PRIMARY KEY (Lat, Lon))"],
+    ]
+
     def __init__(self, controller):
         """Initialize Report class.
 
@@ -28,13 +2012,37 @@ class Report(object):
         
         :Attributes:
         :v_link (dict): Link to access variables in controller.
+        :database (Database): Connections to locations.db shared by
+            all threads.
         :conn (sqlite3.Connection): Database object
         :cur (sqlite3.Cursor): Database cursor.
         :data_dirs (dict[str, str]): Data directories for the
             application.
-        
+        :fetch_engine (FetchEngine): Sends API requests concurrently.
+        :response_cache (ResponseCache): Recently received API responses.
+        :timezone_store (TimezoneStore): Time zones of previously
+            searched locations.
+        :timezone_resolver (TimezoneResolver): Offline time zone lookup.
+        :report_pipeline (ReportPipeline): Runs fetch_report on a worker
+            thread for report requests of the GUI.
+        :location_ranking (LocationRanking): Most searched locations
+            for loc_combobox.
+        :usage_counter (UsageCounter): Counts calls of locations and
+            writes them to locations.db in batches.
+        :weather_history (WeatherHistory): Samples of fetched reports
+            written to locations.db in batches.
+        :location_index (LocationIndex): Searched locations and the
+            city list for autocompletion in loc_combobox.
+        :database_writer (concurrent.futures.ThreadPoolExecutor):
+            Single thread writing calls and weather history to
+            locations.db, so the tkinter thread never waits for it.
+        :write_future (concurrent.futures.Future): Last write submitted
+            to database_writer.
+
         """
         self.controller = controller
+        self.fetch_engine = FetchEngine()
+        self.report_pipeline = ReportPipeline(self.fetch_report)
         self.v_link = self.controller.app_data
         """:type : dict[str, any]"""
 
@@ -44,21 +2052,27 @@ class Report(object):
         user_dirs = appdirs.AppDirs("Weather_App", "")
         local_app_dir = user_dirs.user_data_dir
         self.data_dirs = {"Database": "",
-                          "Debug": ""}
+                          "Debug": "",
+                          "Cache": ""}
         for sub_dir in self.data_dirs:
             path = os.path.join(local_app_dir, sub_dir)
             self.data_dirs[sub_dir] = path
             os.makedirs(path, exist_ok=True)
 
+        self.response_cache = ResponseCache(
+            os.path.join(self.data_dirs["Cache"], "responses.json"))
+
         # Establish database connection.
-        self.conn = sqlite3.connect(os.path.join(self.data_dirs["Database"],
-                                                 "locations.db"))
+        self.database = Database(os.path.join(self.data_dirs["Database"],
+                                              "locations.db"))
+        self.conn = self.database.connection()
         self.cur = self.conn.cursor()
-        self.cur.execute("CREATE TABLE IF NOT EXISTS locations("
-                         "Id INTEGER NOT NULL PRIMARY KEY , "
-                         "Location TEXT NOT NULL UNIQUE, "
-                         "Num_of_calls INTEGER NOT NULL DEFAULT 0, "
-                         "Units TEXT)")
+        if sqlite3.sqlite_version_info < self.min_sqlite_version:
+            raise RuntimeError(
+                "SQLite {0} or newer is required, found {1}.".format(
+                    ".".join(map(str, self.min_sqlite_version)),
+                    sqlite3.sqlite_version))
+        self.database.migrate(self.migrations)
         # Read the last used units from the database and set in
         # controller.
         try:
@@ -71,23 +2085,93 @@ class Report(object):
         except IndexError:
             self.v_link["var_units"].set("metric")
         self.conn.commit()
+        self.timezone_store = TimezoneStore(self.database)
+        self.timezone_resolver = TimezoneResolver(
+            os.path.join(app_timezones, "zone.tab"))
         # Initial list of locations from previous use of the app for
         # loc_combobox ordered by amount of previous calls.
+        self.location_ranking = LocationRanking()
+        self.location_ranking.load(self.view())
+        self.usage_counter = UsageCounter(self.database,
+                                          self.location_ranking)
+        self.weather_history = WeatherHistory(self.database)
+        self.database_writer = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1)
+        self.write_future = None
+        # Indexing all searched locations and the city list takes a
+        # while, locations are completed from location_ranking until
+        # the searched ones are indexed.
+        self.location_index = LocationIndex()
+        threading.Thread(target=self.load_location_index,
+                         daemon=True).start()
         self.combo_drop_menu()
 
     def finish_get_report(self, location):
         """Obtain data in json format from Open Weather / Geonames and 
         store it in appropriate dictionaries / variables.
 
+        Blocks until the report is fetched. The GUI uses 
+        finish_request_report instead.
+
         Args:
             location (str): String containing location typed into  
             loc_entry by the user.
 
         Returns:
-            Status (tuple), first item is the error status 
-                (-1 means error / 0 means all ok).
-                Second item is an error message in case of an exception or
-                weather_dicts - list of dictionaries with all weather reports.
+            None
+        """
+        self.apply_report(self.fetch_report(location))
+
+    def finish_request_report(self, location):
+        """Request a report to be fetched on the worker thread. It
+        supersedes all requests made before.
+
+        Args:
+            location (str): String containing location typed into  
+            loc_entry by the user.
+
+        Returns:
+            None
+        """
+        self.report_pipeline.submit(location)
+
+    def finish_poll_report(self):
+        """Apply the report of the newest request if it was fetched.
+        Must be called on the tkinter thread.
+
+        Returns:
+            pending (bool): True while the newest request is still
+                being fetched.
+        """
+        try:
+            result = self.report_pipeline.poll()
+        # Unexpected errors of the worker (e.g. a malformed response)
+        # are shown like any other error instead of stopping polling.
+        except Exception as error:
+            result = {"error_status": -1,
+                      "error_message": "Error: {0}".format(error)}
+        if result is not None:
+            self.apply_report(result)
+        return self.report_pipeline.pending
+
+    def fetch_report(self, location):
+        """Obtain data in json format from Open Weather / Geonames and 
+        build all report models.
+
+        Does not touch the Controller data or tkinter so it is safe to
+        run on a worker thread.
+
+        Args:
+            location (str): String containing location typed into  
+            loc_entry by the user.
+
+        Returns:
+            result (dict): Error status ("error_status", -1 means error
+                / 0 means all ok) and an error message
+                ("error_message") or Controller data of the report
+                ("metric", "imperial", "timezone", "time" and
+                "local_time") and the name of the location found
+                ("location").
         """
         # We must remove any gibberish (apart from comma) from location
         # string before making a call to the API. Also Open Weather stopped
@@ -95,67 +2179,128 @@ class Report(object):
         # and we must add commas now if user uses spaces as a separator.
         location = self._sanitize_input(location)
 
-        # Get dictionaries.
-        data = self.open_weather_api(location)
+        # Get dictionaries. Fresh responses are served from the cache.
+        data = self.open_weather_api(location, self.response_cache)
 
-        # We expect a tuple returning from finish_get_report. Item 0
+        # We expect a tuple returning from open_weather_api. Item 0
         # contains error status.
-        self.v_link["error_status"] = data[0]
-
-        # Error handling.
-        if self.v_link["error_status"] == -1:
-            self.controller.display_error(data[1])
+        if data[0] == -1:
+            return {"error_status": -1, "error_message": data[1]}
+
+        # Copy dictionaries from data into metric and imperial
+        # dictionary.
+        result = {"error_status": 0,
+                  "metric": data[1][0]["metric"],
+                  "imperial": data[1][1]["imperial"]}
+        # Build report models used by the View. Forecasts are kept
+        # only in their compact form.
+        for units in ["metric", "imperial"]:
+            unit_link = result[units]
+            unit_link["current"] = CurrentWeather.from_dict(
+                unit_link["w_d_cur"])
+            unit_link["hourly"] = ForecastSeries.from_list(
+                unit_link.pop("w_d_short")["list"])
+            unit_link["daily"] = DailyForecast.from_list(
+                unit_link.pop("w_d_long").get("list", []))
+
+        # Obtain timezone for geolocation.
+        cw_link = result["metric"]["w_d_cur"]
+        """:type : dict"""
+        """Link to access current weather data."""
+        lat = cw_link["coord"]["lat"]
+        lon = cw_link["coord"]["lon"]
+
+        # Written only when a response was stored or removed.
+        self.response_cache.save()
+
+        # Get time zone data. Resolve it offline unless geonames.org
+        # is requested. Contact geonames.org only if the location
+        # has not been searched before.
+        time_zone = None
+        if self.controller.debug == 0 \
+                and self.controller.use_geonames == 0:
+            time_zone = self.timezone_resolver.resolve(
+                lat, lon, cw_link.get("sys", {}).get("country"),
+                cw_link.get("timezone"))
+        if self.controller.debug == 0 and time_zone is None:
+            time_zone = self.timezone_store.get(lat, lon)
+        if time_zone is not None:
+            data = (0, time_zone)
         else:
-            # Copy dictionaries from data into metric and imperial
-            # dictionary.
-            self.v_link["metric"] = data[1][0]["metric"]
-            self.v_link["imperial"] = data[1][1]["imperial"]
-
-            # Obtain timezone for geolocation.
-            cw_link = self.controller.app_data["metric"]["w_d_cur"]
-            """:type : dict"""
-            """Link to access current weather data in controller."""
-            lat = cw_link["coord"]["lat"]
-            lon = cw_link["coord"]["lon"]
-
-            # Get time zone data.
             data = self.geonames_api(lat, lon)
-            # We expect a tuple returning from finish_get_report.
-            # Item 0 contains error status.
-            self.v_link["error_status"] = data[0]
-            # Error handling.
-            if self.v_link["error_status"] == -1:
-                self.controller.display_error(data[1])
-            else:
-                self.v_link["timezone"] = data[1]
+            if data[0] == 0 and self.controller.debug == 0:
+                self.timezone_store.put(lat, lon, data[1])
+        # We expect a tuple returning from geonames_api. Item 0 contains
+        # error status.
+        if data[0] == -1:
+            return {"error_status": -1, "error_message": data[1]}
+
+        result["timezone"] = data[1]
+        # Summarise the forecast by days of the local time.
+        utc_offset = round(data[1]["dstOffset"] * 3600)
+        for units in ["metric", "imperial"]:
+            unit_link = result[units]
+            unit_link["days"] = DaySummary.from_series(
+                unit_link["hourly"], utc_offset)
+
+        # Name of the location stored by apply_report. Check if
+        # location called is a country. (Antarctic is not).
+        try:
+            country = ", " + cw_link["sys"]["country"]
+        except KeyError:
+            country = ""
+        result["location"] = "{0}{1}".format(cw_link["name"], country)
+
+        # Current date & time.
+        date = datetime.datetime.now()
+        result["time"] = date.strftime("%H:%M  %d/%m/%Y")
+        local_date = date + datetime.timedelta(
+            hours=result["timezone"]["rawOffset"])
+        result["local_time"] = local_date.strftime("%H:%M  %d/%m/%Y")
+        return result
+
+    def apply_report(self, result):
+        """Store a fetched report in the Controller and display it or
+        the error message. Must be called on the tkinter thread.
+
+        Args:
+            result (dict): Result of fetch_report.
 
-            self.controller.data_present = True
+        Returns:
+            None
+        """
+        self.v_link["error_status"] = result["error_status"]
 
-            # Store location name of a successful call to the API
-            # in api_calls.
-            # Check if location called is a country. (Antarctic
-            # is not).
-            try:
-                country = ", " + cw_link["sys"]["country"]
-            except KeyError:
-                country = ""
-            location = "{0}{1}".format(cw_link["name"], country)
-            self.insert(location)
-            # Build a current list of locations for loc_combobox
-            # ordered by amount of previous calls.
-            self.combo_drop_menu()
-
-            # Current date & time.
-            date = datetime.datetime.now()
-            self.v_link["time"] = date.strftime("%H:%M  %d/%m/%Y")
-            local_date = date + datetime.timedelta(
-                hours=self.v_link["timezone"]["rawOffset"])
-            self.v_link["local_time"] = local_date.strftime(
-                "%H:%M  %d/%m/%Y")
-            if self.v_link["error_status"] == 0:
-                self.v_link["var_status"].set("")
-                self.controller.display_report()
-                # Now we are ready do display the report.
+        # Error handling.
+        if self.v_link["error_status"] == -1:
+            self.controller.display_error(result["error_message"])
+            return
+
+        # Store location name of a successful call to the API. Only
+        # applied reports are counted, results of superseded requests
+        # never get here.
+        location = result["location"]
+        self.insert(location)
+        if self.controller.debug == 0:
+            for units in ["metric", "imperial"]:
+                unit_link = result[units]
+                self.weather_history.append(
+                    location, units,
+                    ForecastSeries.from_list([unit_link["w_d_cur"]]),
+                    forecast=False)
+                self.weather_history.append(location, units,
+                                            unit_link["hourly"])
+        # Build a current list of locations for loc_combobox
+        # ordered by amount of previous calls.
+        self.v_link["api_calls"] = self.location_ranking.locations
+
+        for key in ["metric", "imperial", "timezone", "time",
+                    "local_time"]:
+            self.v_link[key] = result[key]
+        self.controller.data_present = True
+        self.v_link["var_status"].set("")
+        # Now we are ready do display the report.
+        self.controller.display_report()
 
     @staticmethod
     def _sanitize_input(input_str):
@@ -227,12 +2372,14 @@ class Report(object):
 
         return status
 
-    def open_weather_api(self, location):
+    def open_weather_api(self, location, cache=None):
         """Contact open weather API to obtain data in json format.
 
         Args:
             location (str): String containing location typed into  
             loc_entry by the user.
+            cache (ResponseCache): Optional cache to serve fresh
+                responses from and to store new ones in.
 
         Returns:
             Status (tuple[int, str | dict]), first item is the error status 
@@ -266,40 +2413,70 @@ class Report(object):
         # List of report types accepted by the API.
         report_types = ["weather", "forecast", "forecast/daily"]
         keys = ["w_d_cur", "w_d_short", "w_d_long"]
+        # Switch single_fetch to 1 in controller to download metric
+        # reports only and build imperial ones locally.
+        if self.controller.single_fetch == 1:
+            fetched_units = ["metric"]
+        else:
+            fetched_units = unit_types
         # Switch debug to 1 in controller to load a set of data for a
         # city without contacting the API via internet.
+        if self.controller.debug == 0:
+            # Send all requests for reports missing in the cache at
+            # once. Responses are keyed by (unit_type, key) pairs.
+            cached = {}
+            urls = {}
+            decoders = {}
+            for unit_type in fetched_units:
+                for report_type, key in zip(report_types, keys):
+                    if cache is not None:
+                        weather_dict = cache.get(report_type, location,
+                                                 unit_type)
+                        if weather_dict is not None:
+                            cached[(unit_type, key)] = weather_dict
+                            continue
+                    urls[(unit_type, key)] = (
+                        base_url.format(report_type, location,
+                                        units_prefix + unit_type) + api_key)
+                    # Forecasts are decoded while they stream in.
+                    if key == "w_d_short":
+                        decoders[(unit_type, key)] = \
+                            ForecastStreamDecoder.decode_hourly
+                    elif key == "w_d_long":
+                        decoders[(unit_type, key)] = \
+                            ForecastStreamDecoder.decode_daily
+            status = self.fetch_engine.fetch_all(urls, decoders)
+            if status[0] == -1:
+                if isinstance(status[1], str):
+                    return status
+                weather_dict = status[1].json()
+                status = (-1,
+                          "Error: {0}, {1}".format(weather_dict["cod"],
+                                                   weather_dict["message"]))
+                return status
+            responses = status[1]
 
         for unit_dict, unit_type in zip(unit_dicts, unit_types):
-            for report_type, key in zip(report_types, keys):
-                if self.controller.debug == 0:
-                    try:
-                        response = requests.get(base_url.
-                                                format(report_type, location,
-                                                       units_prefix
-                                                       + unit_type)
-                                                + api_key)
-                    except requests.exceptions.ConnectionError:
-                        status = (-1,
-                                  "Unable to establish internet connection."
-                                  " Please connect to the internet.")
-                        return status
-                    weather_dict = response.json()
-                    if response.status_code != 200:
-                        status = (-1,
-                                  "Error: {0}, {1}".format(weather_dict["cod"],
-                                                           weather_dict[
-                                                               "message"]))
-                        return status
-                    else:
-                        # Save data files for debug purposes.
-                        unit_dict[unit_type][key] = weather_dict
-                        path = os.path.join(self.data_dirs["Debug"],
-                                            unit_type + "_" + key + ".json")
-                        self.save_file(weather_dict, path)
+            for key in keys:
+                path = os.path.join(self.data_dirs["Debug"],
+                                    unit_type + "_" + key + ".json")
+                if unit_type not in fetched_units:
+                    # Convert report fetched in metric units.
+                    unit_dict[unit_type][key] = UnitConverter.to_imperial(
+                        unit_dicts[0]["metric"][key], key)
+                elif self.controller.debug == 0:
+                    if (unit_type, key) in cached:
+                        unit_dict[unit_type][key] = cached[(unit_type, key)]
+                        continue
+                    weather_dict = responses[(unit_type, key)]
+                    unit_dict[unit_type][key] = weather_dict
+                    # Save data files for debug purposes.
+                    self.save_file(weather_dict, path)
+                    if cache is not None:
+                        cache.put(report_types[keys.index(key)], location,
+                                  unit_type, weather_dict)
                 else:
                     # Load files from debug folder.
-                    path = os.path.join(self.data_dirs["Debug"],
-                                        unit_type + "_" + key + ".json")
                     status = self.load_file(path)
                     if status[0] == -1:
                         return status
@@ -342,6 +2519,20 @@ class Report(object):
         with open(path, "w") as file:
             json.dump(data, file)
 
+    def finish_save_render_profile(self, profile):
+        """Saves timings and counters of drawing a report in the Debug
+        folder. Each unit system has its own file.
+
+        Args:
+            profile (dict): Profile of drawing the report.
+
+        Returns:
+            None
+        """
+        path = os.path.join(self.data_dirs["Debug"],
+                            "render_profile_" + profile["units"] + ".json")
+        self.save_file(profile, path)
+
     def finish_get_time(self, unix_time, dst_offset):
         """Converts time from unix format to a human readable one.
 
@@ -385,39 +2576,83 @@ class Report(object):
         name_of_day = calendar.day_name[date.weekday()]
         return name_of_day, date_str
 
-    @staticmethod
-    def finish_deg_conv(wind_dir_deg):
+    def finish_get_times(self, unix_times, dst_offset):
+        """Converts a series of unix times to days, dates and times.
+
+        Day names and date strings are worked out once per calendar
+        day and reused for all the other times falling on that day.
+
+        Args:
+            dst_offset: (bool) Set to True to offset times received from
+                open weather API by daylight savings time.
+            unix_times (iterable[int]): Times given in seconds from
+                beginning of the epoch as on unix machines.
+
+        Returns:
+            times (list[tuple[str, str, str]]): Name of the day, date
+                and time in Hour:Minute format for each of unix_times.
+        """
+        if dst_offset:
+            dst_offset = round(self.v_link["timezone"]["dstOffset"] * 3600)
+        else:
+            dst_offset = 0
+
+        days = {}
+        times = []
+        for unix_time in unix_times:
+            day, seconds = divmod(int(unix_time) + dst_offset, 86400)
+            try:
+                name_of_day, date_str = days[day]
+            except KeyError:
+                date = datetime.datetime.utcfromtimestamp(day * 86400)
+                name_of_day = calendar.day_name[date.weekday()]
+                date_str = date.strftime("%d/%m/%Y")
+                days[day] = name_of_day, date_str
+            times.append((name_of_day, date_str,
+                          "{0:02d}:{1:02d}".format(seconds // 3600,
+                                                   seconds % 3600 // 60)))
+        return times
+
+    @classmethod
+    def finish_deg_conv(cls, wind_dir_deg):
         """Converts meteorological degrees to cardinal directions.
 
         Args:
             wind_dir_deg (float): Wind direction in meteorological 
-                degrees.
+                degrees. Any value is normalised to 0-360 degrees.
 
         Returns:
             wind_dir_cardinal (str): Wind direction in cardinal 
-                direction.
-        """
-        directions = {(348.75, 360): "N",
-                      (0, 11.25): "N",
-                      (11.25, 33.75): "NNE",
-                      (33.75, 56.25): "NE",
-                      (56.25, 78.75): "ENE",
-                      (78.75, 101.25): "E",
-                      (101.25, 123.75): "ESE",
-                      (123.75, 146.25): "SE",
-                      (146.25, 168.75): "SSE",
-                      (168.75, 191.25): "S",
-                      (191.25, 213.75): "SSW",
-                      (213.75, 236.25): "SW",
-                      (236.25, 258.75): "WSW",
-                      (258.75, 281.25): "W",
-                      (281.25, 303.75): "WNW",
-                      (303.75, 326.25): "NW",
-                      (326.25, 348.75): "NNW"}
-
-        for interval, wind_dir_cardinal in directions.items():
-            if interval[0] <= wind_dir_deg < interval[1]:
-                return wind_dir_cardinal
+                direction. Empty string if wind_dir_deg is not a
+                number.
+        """
+        if math.isnan(wind_dir_deg) or math.isinf(wind_dir_deg):
+            return ""
+        # Each direction covers 22.5 degrees centered on its heading,
+        # shift by half of it to get the index of the direction.
+        index = int(((wind_dir_deg % 360) + 11.25) // 22.5) % 16
+        return cls.wind_directions[index]
+
+    @classmethod
+    def finish_deg_conv_series(cls, wind_dir_degs):
+        """Converts a series of meteorological degrees to cardinal
+        directions.
+
+        Args:
+            wind_dir_degs (array_like): Wind directions in
+                meteorological degrees.
+
+        Returns:
+            wind_dirs_cardinal (list[str]): Wind directions in cardinal
+                direction. Empty string for values which are not a
+                number.
+        """
+        degrees = np.asarray(wind_dir_degs, dtype=np.float64)
+        valid = np.isfinite(degrees)
+        # Invalid values point to the empty string at the end.
+        indices = np.full(degrees.shape, 16, dtype=np.intp)
+        indices[valid] = ((degrees[valid] % 360 + 11.25) // 22.5) % 16
+        return cls.wind_directions_array[indices].tolist()
 
     def combo_drop_menu(self):
         """Build a list of locations for loc_combobox ordered by 
@@ -426,49 +2661,108 @@ class Report(object):
         Returns:
             None
         """
-        rows = self.view()
-        self.v_link["api_calls"] = []
-        for row in rows:
-            self.v_link["api_calls"].append(row[0])
+        self.v_link["api_calls"] = self.location_ranking.locations
 
     def insert(self, location):
-        """Insert a row into locations.db.
+        """Count another call of a location and update location_ranking
+        and location_index. The row in locations.db is inserted or
+        updated by the next write_database.
         
         Args:
-            location (str): 
+            location (str): Name of the location.
 
         Returns:
             None
         """
-        local_conn = sqlite3.connect(os.path.join(self.data_dirs["Database"],
-                                                  "locations.db"))
-        local_cur = local_conn.cursor()
+        calls = self.usage_counter.count(location)
+        self.location_index.update(location, calls)
 
-        try:
-            local_cur.execute("INSERT INTO locations (Location) VALUES (?)",
-                              (location, ))
-        except sqlite3.IntegrityError:
-            pass
-        local_cur.execute("UPDATE locations SET Num_of_calls"
-                          " = Num_of_calls + 1 WHERE Location=?",
-                          (location, ))
-        local_conn.commit()
-        local_conn.close()
-
-    def view(self):
+    def finish_flush_database(self):
+        """Queue a write of calls of locations and weather history
+        gathered since the last flush on database_writer. Skipped while
+        the previous write is still running, it writes everything
+        pending when done.
+
+        Returns:
+            None
         """
-        
+        if self.write_future is None or self.write_future.done():
+            self.write_future = self.database_writer.submit(
+                self.write_database)
+
+    def write_database(self):
+        """Write calls of locations and weather history gathered since
+        the last write to locations.db. Increments and samples of a
+        failed write are kept for the next one.
+
+        Returns:
+            None
+        """
+        self.usage_counter.flush()
+        self.weather_history.flush()
+
+    def load_location_index(self):
+        """Index all searched locations and the city list if present.
+        Runs on a background thread.
+
+        Returns:
+            None
+        """
+        self.location_index.load_history(self.view(limit=-1))
+        if os.path.exists(app_cities):
+            self.location_index.load_cities(app_cities)
+
+    def finish_complete_location(self, text):
+        """Find locations for autocompletion of text typed by the user.
+
+        Args:
+            text (str): Text typed into loc_combobox.
+
+        Returns:
+            locations (list[str]): Suggested locations, most searched
+                first.
+        """
+        if self.location_index.ready:
+            return self.location_index.complete(text)
+        # Most searched locations completing text while the index is
+        # being built.
+        prefix = LocationIndex.normalize(text)
+        if not prefix:
+            return []
+        locations = [location for location in self.location_ranking.locations
+                     if any(key.startswith(prefix)
+                            for key in LocationIndex.make_keys(location))]
+        return locations
+
+    def finish_get_history(self, location, start, end):
+        """Read weather history of a location in current units.
+
+        Args:
+            location (str): Name of the location as in api_calls.
+            start (int): Unix time of the first sample.
+            end (int): Unix time of the last sample.
+
         Returns:
-            rows (list[tuple])
+            series (ForecastSeries): Samples ordered by time.
         """
-        local_conn = sqlite3.connect(os.path.join(self.data_dirs["Database"],
-                                                  "locations.db"))
-        local_cur = local_conn.cursor()
+        series = self.weather_history.range(
+            location, self.v_link["var_units"].get(), start, end)
+        return series
+
+    def view(self, limit=10):
+        """Reads locations ordered by amount of calls.
+        
+        Args:
+            limit (int): Maximum amount of locations, -1 for all.
 
-        local_cur.execute(
-            "SELECT Location FROM locations ORDER BY Num_of_calls DESC LIMIT 10")
-        rows = local_cur.fetchall()
-        local_conn.close()
+        Returns:
+            rows (list[tuple[str, int]]): Name and amount of calls of
+                each location.
+        """
+        rows = self.database.execute(
+            "SELECT Location, Num_of_calls FROM locations "
+            "ORDER BY Num_of_calls DESC, Location LIMIT ?", (limit, )
+        ).fetchall()
         return rows
 
     def __del__(self):
@@ -479,14 +2773,14 @@ class Report(object):
             None
         """
         current_units = self.v_link["var_units"].get()
-        local_conn = sqlite3.connect(os.path.join(self.data_dirs["Database"],
-                                                  "locations.db"))
-        local_cur = local_conn.cursor()
-        local_cur.execute("UPDATE locations SET Units=? WHERE Id=1",
-                          (current_units, ))
-        local_conn.commit()
-        local_conn.close()
-        self.conn.close()
+        self.report_pipeline.close()
+        self.database_writer.shutdown(wait=True)
+        self.write_database()
+        with self.database.transaction() as conn:
+            conn.execute("UPDATE locations SET Units=? WHERE Id=1",
+                         (current_units, ))
+        self.database.close()
+        self.fetch_engine.close()
 
         # More database  methods which can be used in the future should
         # the need arise.
@@ -4,9 +4,12 @@
 
 import platform
 import os
+import math
 import sys
-import threading
+import time
+import weakref
 import tkinter as tk
+import tkinter.font as tkfont
 import tkinter.ttk as tkk
 from PIL import Image, ImageTk
 from weather_backend import Report
@@ -27,10 +30,8 @@ app_icons = os.path.join(app_root, "Data", "Icons")
 app_buttons = os.path.join(app_root, "Data", "Buttons")
 
 
-# TODO: See if autocompletion is possible in the entry field.
 # TODO: Add mousewheel movement for MAC. (needs testing)
 # TODO: Add temperature graphs in bokeh / matplotlib.
-# TODO: Add 16 day daily report.
 # TODO: stick all styling / color definitions into style module.
 # TODO: 4k scaling is needed for widgets and fonts.
 
@@ -70,6 +71,15 @@ class WeatherApp(tk.Tk):
         :title (str): Main window title displayed when using
             application.
         :displays (dict) dictionary storing all displays.
+        :pending_displays (set): Keys of displays which still show
+            a previous report and get rendered in idle time or when
+            shown for the first time.
+        :poll_interval (int): Time in ms between checks for fetched
+            reports.
+        :poll_id (str): Id of the scheduled check for fetched reports.
+            None if not polling.
+        :flush_interval (int): Time in ms between writes of calls of
+            locations and weather history to the database.
         """
         super().__init__(className="weather_app")
 
@@ -100,6 +110,11 @@ class WeatherApp(tk.Tk):
         for key in keys:
             self.displays[key] = DisplayShort(self, controller)
             self.displays[key].grid(row=0, column=0, sticky=tk.NSEW)
+        self.pending_displays = set()
+        self.poll_interval = 50
+        self.poll_id = None
+        self.flush_interval = 5000
+        self.after(self.flush_interval, self.flush_database)
         self.update_buttons()
         self.update_geometry()
 
@@ -172,9 +187,42 @@ class WeatherApp(tk.Tk):
                         background="DimGrey")
                     self.displays[key].imperial_button.leave_button()
 
+    def schedule_poll(self):
+        """Start checking for fetched reports unless already checking.
+
+        Returns:
+            None
+        """
+        if self.poll_id is None:
+            self.poll_id = self.after(self.poll_interval, self.poll_report)
+
+    def poll_report(self):
+        """Display the newest fetched report if ready and keep checking
+        while its request is pending. Reports are fetched on a worker
+        thread but always displayed on the tkinter thread.
+
+        Returns:
+            None
+        """
+        self.poll_id = None
+        if self.controller.poll_report():
+            self.schedule_poll()
+
+    def flush_database(self):
+        """Queue a write of calls of locations and weather history
+        gathered since the last flush to the database and schedule the
+        next flush. The write runs off the tkinter thread.
+
+        Returns:
+            None
+        """
+        self.controller.flush_database()
+        self.after(self.flush_interval, self.flush_database)
+
     def show_display(self, display):
         """Bring currently selected display to the front of the 
-        application.
+        application. Display waiting for the current report gets
+        rendered first.
         
         Args:
             display (str): currently selected display type. 
@@ -182,14 +230,42 @@ class WeatherApp(tk.Tk):
         Returns:
             None
         """
+        if display in self.pending_displays:
+            self.render_display(display)
         lo, hi = self.v_link["scrollbar_offset"]
         self.displays[display].main_canvas.yview_moveto(lo)
         self.displays[display].yscrollbar.focus_set()
         self.displays[display].tkraise()
 
+    def render_display(self, display):
+        """Render current report in units of the given display.
+
+        Args:
+            display (str): Display type (metric / imperial).
+
+        Returns:
+            None
+        """
+        self.pending_displays.discard(display)
+        selected_units = self.v_link["var_units"].get()
+        self.v_link["var_units"].set(display)
+        self.displays[display].display_report()
+        self.v_link["var_units"].set(selected_units)
+
+    def render_pending_displays(self):
+        """Render displays not shown yet so switching units later on
+        does not wait for the report to be drawn.
+
+        Returns:
+            None
+        """
+        for key in sorted(self.pending_displays):
+            self.render_display(key)
+
     def display_report(self):
-        """Generate all available reports and bring selected one to the
-        front of the application.
+        """Generate report in currently selected units and bring it to
+        the front of the application. Reports in other units are
+        rendered in idle time.
         
         Returns:
             None
@@ -197,12 +273,10 @@ class WeatherApp(tk.Tk):
         selected_units = self.v_link["var_units"].get()
         self.show_display("title")
         self.v_link["scrollbar_offset"] = (0, 0)
-        for key in self.displays:
-            self.v_link["var_units"].set(key)
-            if key != "title":
-                self.displays[key].display_report()
-        self.v_link["var_units"].set(selected_units)
+        self.pending_displays = set(key for key in self.displays
+                                    if key != "title")
         self.show_display(selected_units)
+        self.after_idle(self.render_pending_displays)
 
 
 class DisplayShort(tk.Frame):
@@ -253,6 +327,15 @@ class DisplayShort(tk.Frame):
             :hr_start_color (bool): declares if we should use 
                 start_color for displaying the values of weather report
                 or not.
+            :report_pool (CanvasItemPool): Canvas objects of the 
+                displayed report.
+            :report_keys_bound (bool): True once keys scrolling the
+                report are bound.
+            :complete_id (str): Id of the scheduled autocompletion of
+                loc_combobox. None if not scheduled.
+            :complete_inline (bool): True if the last key pressed in
+                loc_combobox typed text, which is then completed in
+                place.
             :hr_weather_icons list[CanvasImg]: list of weather icons
                 for the hourly report.
             :hr_temp_icons list[CanvasImg]: list of temperature icons 
@@ -318,24 +401,34 @@ class DisplayShort(tk.Frame):
         self.sunset_img = None
         """:type : CanvasImg"""
 
+        # Canvas objects of the currently displayed report. Released
+        # before drawing the next one. Only objects close to the visible
+        # part of main_canvas get canvas items, the rest when scrolled
+        # to.
+        self.report_pool = CanvasItemPool(("main", "hourly", "daily"),
+                                          margin=300)
+        self.report_keys_bound = False
+        self.complete_id = None
+        self.complete_inline = False
+
         # Lists which will hold hourly report canvas objects.
-        self.hr_weather_icons = []
+        self.hr_weather_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_temp_icons = []
+        self.hr_temp_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_pressure_icons = []
+        self.hr_pressure_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_rain_icons = []
+        self.hr_rain_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_snow_icons = []
+        self.hr_snow_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_cloud_icons = []
+        self.hr_cloud_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_humidity_icons = []
+        self.hr_humidity_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_wind_icons = []
+        self.hr_wind_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
-        self.hr_wind_dir_icons = []
+        self.hr_wind_dir_icons = self.report_pool.new_list()
         """:type : list[CanvasImg]"""
 
         # GUI style definitions.
@@ -433,7 +526,7 @@ class DisplayShort(tk.Frame):
         self.loc_combobox.grid(row=0, column=1, padx=(0, 0), pady=(4, 5),
                                sticky=tk.NSEW)
         self.loc_combobox.bind("<Return>", lambda e: self.begin_get_report())
-        self.loc_combobox.bind("<Key>", lambda e: self.clear_error_message())
+        self.loc_combobox.bind("<Key>", self.loc_key_pressed)
 
         # Search button.
         self.search_img = tk.PhotoImage(
@@ -484,7 +577,7 @@ class DisplayShort(tk.Frame):
                              sticky=tk.NS)
         self.yscrollbar.config(command=self.main_canvas.yview)
 
-        self.main_canvas.config(yscrollcommand=self.yscrollbar.set)
+        self.main_canvas.config(yscrollcommand=self.scroll_report)
         image = Image.open(os.path.join(app_images, "main_background.jpg"))
         image_conv = ImageTk.PhotoImage(image)
         self.canvas_bg_img = image_conv
@@ -511,8 +604,7 @@ class DisplayShort(tk.Frame):
             self.controller.update_buttons()
 
             if all([self.controller.data_present,
-                    self.v_link["error_status"] == 0,
-                    threading.active_count() < 2]):
+                    self.v_link["error_status"] == 0]):
                 self.v_link["scrollbar_offset"] = self.yscrollbar.get()
                 self.controller.show_display("metric")
 
@@ -528,8 +620,7 @@ class DisplayShort(tk.Frame):
             self.controller.update_buttons()
 
             if all([self.controller.data_present,
-                    self.v_link["error_status"] == 0,
-                    threading.active_count() < 2]):
+                    self.v_link["error_status"] == 0]):
                 self.v_link["scrollbar_offset"] = self.yscrollbar.get()
                 self.controller.show_display("imperial")
 
@@ -576,6 +667,23 @@ class DisplayShort(tk.Frame):
         name_of_day, date_str = self.controller.get_date(unix_time, dst_offset)
         return name_of_day, date_str
 
+    def begin_get_times(self, unix_times, dst_offset=True):
+        """Contact controller to convert a series of unix times to
+        days, dates and times in one call.
+
+        Args:
+            dst_offset (bool): Set to True to offset times received from
+                open weather API by daylight savings time.
+            unix_times (iterable[int]): Times given in seconds from
+                beginning of the epoch as on unix machines.
+
+        Returns:
+            times (list[tuple[str, str, str]]): Name of the day, date
+                and time in Hour:Minute format for each of unix_times.
+        """
+        times = self.controller.get_times(unix_times, dst_offset)
+        return times
+
     @staticmethod
     def get_hr_x_offset(text_time):
         """
@@ -617,6 +725,21 @@ class DisplayShort(tk.Frame):
         wind_dir_cardinal = self.controller.deg_conv(wind_dir_deg)
         return wind_dir_cardinal
 
+    def begin_deg_conv_series(self, wind_dir_degs):
+        """Contacts controller to convert a series of meteorological
+        degrees to cardinal directions in one call.
+
+        Args:
+            wind_dir_degs (array_like): Wind directions in
+                meteorological degrees.
+
+        Returns:
+            wind_dirs_cardinal (list[str]): Wind directions in cardinal
+                direction.
+        """
+        wind_dirs_cardinal = self.controller.deg_conv_series(wind_dir_degs)
+        return wind_dirs_cardinal
+
     def begin_get_report(self):
         """Begin getting data for the weather report to display it on 
         the main_canvas.
@@ -625,17 +748,16 @@ class DisplayShort(tk.Frame):
         Returns:
             None
         """
-        # Do nothing if no location is entered or an active sub thread
-        # is running.
-        if (self.v_link["var_loc"].get() == "") \
-                or (threading.active_count() > 1):
+        # Do nothing if no location is entered.
+        if self.v_link["var_loc"].get() == "":
             return
         # Clear any error status message.
         self.v_link["error_message"] = ""
         self.v_link["var_status"].set("Gathering data, please wait...")
-        # Request a report using a Mediating Controller in a new thread.
-        report_thread = threading.Thread(target=self.controller.get_report)
-        report_thread.start()
+        # Request a report using a Mediating Controller. It is fetched
+        # on a worker thread and a search made while another one is
+        # running supersedes it.
+        self.controller.request_report()
 
     def mouse_wheel(self, event):
         """Allows movement of main_canvas using the mouse wheel.
@@ -664,13 +786,108 @@ class DisplayShort(tk.Frame):
         """
         self.main_canvas.yview_scroll(1, "units")
 
+    def get_view(self):
+        """Get the visible part of main_canvas.
+
+        Returns:
+            view (tuple[float, float]): Top and bottom y coordinates of
+                the visible part of main_canvas.
+        """
+        return (self.main_canvas.canvasy(0),
+                self.main_canvas.canvasy(self.main_canvas.winfo_height()))
+
+    def scroll_report(self, first, last):
+        """Update scrollbar and draw report items scrolled into view.
+
+        Called by main_canvas every time its view changes.
+
+        Args:
+            first (str): Fraction of main_canvas above the view.
+            last (str): Fraction of main_canvas up to the view bottom.
+
+        Returns:
+            None
+        """
+        self.yscrollbar.set(first, last)
+        self.report_pool.show(self.main_canvas, self.get_view())
+
     def loc_postcommand(self):
         """Updates the list of items to display in the loc_combobox.
 
         Returns:
             None
         """
-        self.loc_combobox["values"] = self.v_link["api_calls"]
+        self.loc_combobox["values"] = self.get_suggestions()
+
+    def loc_key_pressed(self, event):
+        """Clears error messages and schedules autocompletion of the
+        text in loc_combobox. The text changes only after the key is
+        handled, so autocompletion runs in idle time.
+
+        Args:
+            event (tk.Event): Key press event.
+
+        Returns:
+            None
+        """
+        self.clear_error_message()
+        # Keys deleting text or moving the cursor must not complete it
+        # again, e.g. BackSpace removing the completed part.
+        self.complete_inline = event.char != "" and event.char.isprintable()
+        if self.complete_id is None:
+            self.complete_id = self.after_idle(self.complete_location)
+
+    def complete_location(self):
+        """Offers locations starting with the text typed into
+        loc_combobox. The first of them is shown in loc_combobox with
+        the completed part selected, so typing on replaces it.
+
+        Returns:
+            None
+        """
+        self.complete_id = None
+        suggestions = self.get_suggestions()
+        self.loc_combobox["values"] = suggestions
+        if self.complete_inline:
+            self.complete_inline = False
+            self.show_completion(suggestions)
+
+    def show_completion(self, suggestions):
+        """Completes the text typed at the end of loc_combobox with the
+        first suggestion starting with it and selects the added text.
+
+        Args:
+            suggestions (list[str]): Suggested locations, best first.
+
+        Returns:
+            None
+        """
+        combobox = self.loc_combobox
+        text = combobox.get()
+        if not text.strip() or combobox.selection_present() or \
+                combobox.index(tk.INSERT) != len(text):
+            return
+        for location in suggestions:
+            if len(location) > len(text) and \
+                    location.lower().startswith(text.lower()):
+                self.v_link["var_loc"].set(location)
+                combobox.icursor(len(text))
+                combobox.selection_range(len(text), tk.END)
+                break
+
+    def get_suggestions(self):
+        """Builds the list of items for loc_combobox. Locations
+        completing the typed text or the most searched locations if
+        nothing matches.
+
+        Returns:
+            suggestions (list[str]): Items for loc_combobox.
+        """
+        text = self.v_link["var_loc"].get()
+        suggestions = []
+        if text.strip():
+            suggestions = self.controller.complete_location(text)
+        return suggestions or self.v_link["api_calls"]
 
     def loc_key_focus(self):
         """Set keyboard focus back to loc_combobox. Select any text
@@ -704,16 +921,13 @@ class DisplayShort(tk.Frame):
                 self.last_color = start_color
                 return start_color
 
-    def display_report(self):
-
-        """Display results of the API call in the main_canvas.
+    def bind_report_keys(self):
+        """Bind keys and mouse wheel scrolling the main_canvas once a
+        report is displayed.
 
         Returns:
             None
         """
-        # Initial setup.
-        # Delete a previous report if existing on canvas.
-        self.main_canvas.delete("main", "hourly")
         # Give scrollbar keyboard focus to enable scrolling of the
         # main_canvas on laptops without mouse wheel.
         self.loc_combobox.bind("<Escape>",
@@ -738,6 +952,110 @@ class DisplayShort(tk.Frame):
                               lambda e: self.loc_key_focus())
         self.yscrollbar.bind("<Return>",
                              lambda e: self.loc_key_focus())
+        self.report_keys_bound = True
+
+    def get_daily_rows(self, daily, sign, speed_unit):
+        """Prepare texts and icons of every row of the daily forecast.
+
+        Args:
+            daily (DailyForecast): Daily forecast.
+            sign (str): Temperature unit sign (C / F).
+            speed_unit (str): Wind speed unit.
+
+        Returns:
+            rows (list[tuple]): Day, weather icon path, temperatures,
+                description, wind and precipitation of each day.
+        """
+        days = self.begin_get_times(daily.dt)
+        wind_dirs = self.begin_deg_conv_series(daily.wind_deg)
+        rows = []
+        for index in range(len(daily)):
+            name_of_day, date_str, _ = days[index]
+            precipitation = []
+            for name, amount in [("rain", daily.rain[index]),
+                                 ("snow", daily.snow[index])]:
+                if not math.isnan(amount):
+                    precipitation.append(
+                        "{0} {1:.1f} mm".format(name, amount))
+            rows.append((
+                "{0:.3}, {1:.5}".format(name_of_day, date_str),
+                os.path.join(app_icons, "Weather",
+                             daily.icons[index] + ".png"),
+                "{0:.1f} / {1:.1f}\N{DEGREE SIGN}{2}".format(
+                    daily.temp_max[index], daily.temp_min[index], sign),
+                daily.descriptions[index].capitalize(),
+                "{0:.1f} {1} {2}".format(daily.wind_speed[index],
+                                         speed_unit, wind_dirs[index]),
+                "\n".join(precipitation)))
+        return rows
+
+    def display_daily(self, rows, top):
+        """Display the daily forecast on main_canvas as a table with one
+        row per day.
+
+        Args:
+            rows (list[tuple]): Rows prepared by get_daily_rows.
+            top (int): Y coordinate of the top of the section.
+
+        Returns:
+            None
+        """
+        pool = self.report_pool
+        title_cnf = {"tags": "daily", "fill": self.paper, "anchor": tk.NW}
+        row_cnf = {"tags": "daily", "fill": self.paper, "anchor": tk.W}
+        img_cnf = {"tags": "daily", "anchor": tk.W}
+        h2 = ("Arial", -25)
+        h3 = ("Arial", -20)
+        h4 = ("Arial", -18)
+        # X coordinates of the columns and height of a row.
+        day_x, icon_x, temp_x, desc_x, wind_x, precip_x = \
+            12, 130, 190, 340, 600, 780
+        row_height = 55
+
+        CanvasText(self.main_canvas, (day_x, top),
+                   text="Daily forecast", font=h2, **title_cnf,
+                   pool=pool, key="daily_title")
+        for index, (day_text, icon_path, temp_text, desc_text, wind_text,
+                    precip_text) in enumerate(rows):
+            y = top + 40 + index * row_height + row_height // 2
+            CanvasText(self.main_canvas, (day_x, y), text=day_text,
+                       font=h3, **row_cnf, pool=pool,
+                       key=("daily_day", index))
+            CanvasImg(self.main_canvas, icon_path, (icon_x, y), **img_cnf,
+                      pool=pool, key=("daily_icon", index))
+            CanvasText(self.main_canvas, (temp_x, y), text=temp_text,
+                       font=h3, **row_cnf, pool=pool,
+                       key=("daily_temp", index))
+            CanvasText(self.main_canvas, (desc_x, y), text=desc_text,
+                       font=h4, **row_cnf, pool=pool,
+                       key=("daily_desc", index))
+            CanvasText(self.main_canvas, (wind_x, y), text=wind_text,
+                       font=h4, **row_cnf, pool=pool,
+                       key=("daily_wind", index))
+            if precip_text:
+                CanvasText(self.main_canvas, (precip_x, y),
+                           text=precip_text, font=h4, **row_cnf, pool=pool,
+                           key=("daily_precip", index))
+
+    def display_report(self):
+
+        """Display results of the API call in the main_canvas.
+
+        Returns:
+            None
+        """
+        # Initial setup.
+        # Canvas items of a previous report are reused for the same
+        # cells of this one and the rest deleted when finished.
+        pool = self.report_pool
+        pool.begin()
+        # Phases of drawing are timed if profiling is switched on.
+        profile = RenderProfile(pool, enabled=self.controller.profile == 1)
+        # Bind keys and mouse wheel for scrolling the report. Done only
+        # once as every bind of a Python function registers a new Tcl
+        # command which is kept as long as the widget exists.
+        if not self.report_keys_bound:
+            self.bind_report_keys()
 
         # Units system to display report in.
         units = self.v_link["var_units"].get()
@@ -787,163 +1105,178 @@ class DisplayShort(tk.Frame):
                 self.main_canvas.create_line(0, i * 10, 1000, i * 10,
                                              fill="blue")
 
-        cw_link = self.controller.app_data[units]["w_d_cur"]
-        """Link to access current weather data in controller."""
+        current = self.controller.app_data[units]["current"]
+        """Current weather report (CurrentWeather)."""
 
         # Title.
         # Check if location called is in a country. (Antarctic is not).
-        try:
-            country = ", " + cw_link["sys"]["country"]
-        except KeyError:
+        if current.country:
+            country = ", " + current.country
+        else:
             country = ""
-        title_text = "Report for: {0}{1}".format(cw_link["name"], country)
+        title_text = "Report for: {0}{1}".format(current.name, country)
         title = CanvasText(self.main_canvas, (x1, y1), text=title_text,
-                           font=h1, **main_cnf)
+                           font=h1, **main_cnf,
+                           pool=pool, key="title")
 
         # Date.
         date_text = "Received at: {0}\nLocal time: {1}".format(
             self.v_link["time"], self.v_link["local_time"])
         date = CanvasText(self.main_canvas, rel_obj=title, rel_pos="BL",
-                          offset=(2, -1), text=date_text, font=h2, **main_cnf)
+                          offset=(2, -1), text=date_text, font=h2, **main_cnf,
+                          pool=pool, key="date")
 
         # Geo-coords.
-        coords_text = "Lon: {0}, Lat: {1}".format(cw_link["coord"]["lon"],
-                                                  cw_link["coord"]["lat"])
+        coords_text = "Lon: {0}, Lat: {1}".format(current.lon, current.lat)
         coords = CanvasText(self.main_canvas, rel_obj=date, rel_pos="BL",
                             offset=(1, 2), text=coords_text, font=h2,
-                            **main_cnf)
+                            **main_cnf,
+                            pool=pool, key="coords")
+        profile.mark("header")
 
         # Draw a current weather icon.
         icon_path = os.path.join(app_icons, "Weather",
-                                 cw_link["weather"][0]["icon"] + ".png")
+                                 current.icon + ".png")
         # Images have to be added as attributes or otherwise they get
         # garbage collected and will not display at all.
         self.cur_icon = CanvasImg(self.main_canvas, icon_path, rel_obj=coords,
-                                  rel_pos="BL", offset=(2, 42), **img_nw_cnf)
+                                  rel_pos="BL", offset=(2, 42), **img_nw_cnf,
+                                  pool=pool, key="cur_icon")
 
         # Current temperature.
         if self.v_link["var_units"].get() == "metric":
             sign = "C"
         else:
             sign = "F"
-        cur_temp_text = "{0:.1f}\N{DEGREE SIGN}{1}".format(
-            cw_link["main"]["temp"],
-            sign)
+        cur_temp_text = "{0:.1f}\N{DEGREE SIGN}{1}".format(current.temp,
+                                                           sign)
 
         cur_temp = CanvasText(self.main_canvas, rel_obj=self.cur_icon,
                               rel_pos="CR", offset=(5, -2),
-                              text=cur_temp_text, font=h0, **cent_cnf)
+                              text=cur_temp_text, font=h0, **cent_cnf,
+                              pool=pool, key="cur_temp")
 
         # Max temperature.
         max_temp_text = "max: {0:.1f}\N{DEGREE SIGN}{1}".format(
-            cw_link["main"]['temp_max'],
+            current.temp_max,
             sign)
         max_temp = CanvasText(self.main_canvas, rel_obj=cur_temp, rel_pos="TR",
                               offset=(15, 5),
-                              text=max_temp_text, font=h3, **main_cnf)
+                              text=max_temp_text, font=h3, **main_cnf,
+                              pool=pool, key="max_temp")
 
         # Min temperature.
         min_temp_text = "min: {0:.1f}\N{DEGREE SIGN}{1}".format(
-            cw_link["main"]['temp_min'],
+            current.temp_min,
             sign)
         min_temp = CanvasText(self.main_canvas, rel_obj=cur_temp, rel_pos="BR",
                               offset=(15, -27),
-                              text=min_temp_text, font=h3, **main_cnf)
+                              text=min_temp_text, font=h3, **main_cnf,
+                              pool=pool, key="min_temp")
 
         # Weather description.
-        w_desc_text = "{0}".format(
-            cw_link["weather"][0]["description"].capitalize())
+        w_desc_text = "{0}".format(current.description.capitalize())
         w_desc = CanvasText(self.main_canvas, rel_obj=cur_temp, rel_pos="BL",
                             offset=(3, -2),
-                            text=w_desc_text, font=h2, **main_cnf)
+                            text=w_desc_text, font=h2, **main_cnf,
+                            pool=pool, key="w_desc")
 
         # Pressure.
-        max_temp_bounds = self.main_canvas.bbox(max_temp.id_num)
+        max_temp_bounds = max_temp.bbox
         icon_path = os.path.join(icon_prefix, "atmospheric_pressure.png")
         self.pressure_img = CanvasImg(self.main_canvas, icon_path,
                                       coordinates=(450, max_temp_bounds[1]),
-                                      offset=(0, 0), **img_nw_cnf)
-        pressure_text = "{0:.1f} hPa".format(cw_link["main"]["pressure"])
+                                      offset=(0, 0), **img_nw_cnf,
+                                      pool=pool, key="pressure_img")
+        pressure_text = "{0:.1f} hPa".format(current.pressure)
         pressure = CanvasText(self.main_canvas, rel_obj=self.pressure_img,
                               rel_pos="CR", offset=(5, 0),
-                              text=pressure_text, font=h2, **cent_cnf)
+                              text=pressure_text, font=h2, **cent_cnf,
+                              pool=pool, key="pressure")
 
         # Cloud coverage.
         icon_path = os.path.join(icon_prefix, "cloud.png")
         self.clouds_img = CanvasImg(self.main_canvas, icon_path,
                                     rel_obj=w_desc,
-                                    rel_pos="BL", offset=(0, 3), **img_nw_cnf)
+                                    rel_pos="BL", offset=(0, 3), **img_nw_cnf,
+                                    pool=pool, key="clouds_img")
         clouds_cnf = {"tags": "main", "fill": self.paper, "anchor": tk.W}
-        clouds_text = "{0}%".format(
-            cw_link["clouds"]["all"])
+        clouds_text = "{0:.0f}%".format(current.clouds)
         clouds = CanvasText(self.main_canvas, rel_obj=self.clouds_img,
                             rel_pos="CR", offset=(5, 0),
-                            text=clouds_text, font=h2, **clouds_cnf)
+                            text=clouds_text, font=h2, **clouds_cnf,
+                            pool=pool, key="clouds")
 
         # Humidity.
         icon_path = os.path.join(icon_prefix, "humidity.png")
         self.humidity_img = CanvasImg(self.main_canvas, icon_path,
                                       rel_obj=self.pressure_img,
                                       rel_pos="BL", offset=(0, 4),
-                                      **img_nw_cnf)
-        humidity_text = "{0}%".format(cw_link["main"]["humidity"])
+                                      **img_nw_cnf,
+                                      pool=pool, key="humidity_img")
+        humidity_text = "{0:.0f}%".format(current.humidity)
         humidity = CanvasText(self.main_canvas, rel_obj=self.humidity_img,
                               rel_pos="CR", offset=(5, 0),
-                              text=humidity_text, font=h2, **cent_cnf)
+                              text=humidity_text, font=h2, **cent_cnf,
+                              pool=pool, key="humidity")
 
         # Wind speed.
         icon_path = os.path.join(icon_prefix, "windsock_filled.png")
         self.wind_img = CanvasImg(self.main_canvas, icon_path,
                                   rel_obj=self.humidity_img,
-                                  rel_pos="BL", offset=(0, 4), **img_nw_cnf)
+                                  rel_pos="BL", offset=(0, 4), **img_nw_cnf,
+                                  pool=pool, key="wind_img")
         if self.v_link["var_units"].get() == "metric":
             speed_unit = "m/s"
         else:
             speed_unit = "mile/hr"
-        wind_text = "{0:.1f} {1}".format(cw_link["wind"]["speed"], speed_unit)
+        wind_text = "{0:.1f} {1}".format(current.wind_speed, speed_unit)
         wind = CanvasText(self.main_canvas, rel_obj=self.wind_img,
                           rel_pos="CR", offset=(5, 0),
-                          text=wind_text, font=h2, **cent_cnf)
+                          text=wind_text, font=h2, **cent_cnf,
+                          pool=pool, key="wind")
 
         # Wind direction.
         icon_path = os.path.join(icon_prefix, "wind_rose.png")
         self.wind_dir_img = CanvasImg(self.main_canvas, icon_path,
                                       rel_obj=self.wind_img,
                                       rel_pos="BL", offset=(0, 4),
-                                      **img_nw_cnf)
+                                      **img_nw_cnf,
+                                      pool=pool, key="wind_dir_img")
         # Noticed that sometimes Open Weather responds with no wind
-        # direction in the current weather report.
-        try:
-            wind_dir_text = "{0}".format(
-                self.begin_deg_conv(cw_link["wind"]["deg"]))
-        except KeyError:
-            wind_dir_text = ""
+        # direction in the current weather report. It is NaN then and
+        # converts to an empty string.
+        wind_dir_text = "{0}".format(self.begin_deg_conv(current.wind_deg))
 
         wind_dir = CanvasText(self.main_canvas, rel_obj=self.wind_dir_img,
                               rel_pos="CR", offset=(5, 0),
-                              text=wind_dir_text, font=h2, **cent_cnf)
+                              text=wind_dir_text, font=h2, **cent_cnf,
+                              pool=pool, key="wind_dir")
 
         # Sunrise.
         icon_path = os.path.join(icon_prefix, "sunrise.png")
         self.sunrise_img = CanvasImg(self.main_canvas, icon_path,
                                      coordinates=(670, max_temp_bounds[1]),
-                                     offset=(0, 0), **img_nw_cnf)
-        sunrise_text = "{0}".format(
-            self.begin_get_time(cw_link["sys"]["sunrise"]))
+                                     offset=(0, 0), **img_nw_cnf,
+                                     pool=pool, key="sunrise_img")
+        sunrise_text = "{0}".format(self.begin_get_time(current.sunrise))
         sunrise = CanvasText(self.main_canvas, rel_obj=self.sunrise_img,
                              rel_pos="CR", offset=(5, 0),
-                             text=sunrise_text, font=h2, **cent_cnf)
+                             text=sunrise_text, font=h2, **cent_cnf,
+                             pool=pool, key="sunrise")
 
         # Sunset.
         icon_path = os.path.join(icon_prefix, "sunset.png")
         self.sunset_img = CanvasImg(self.main_canvas, icon_path,
                                     rel_obj=self.sunrise_img, rel_pos="BL",
-                                    offset=(0, 4), **img_nw_cnf)
-        sunset_text = "{0}".format(
-            self.begin_get_time(cw_link["sys"]["sunset"]))
+                                    offset=(0, 4), **img_nw_cnf,
+                                    pool=pool, key="sunset_img")
+        sunset_text = "{0}".format(self.begin_get_time(current.sunset))
         sunset = CanvasText(self.main_canvas, rel_obj=self.sunset_img,
                             rel_pos="CR", offset=(5, 0),
-                            text=sunset_text, font=h2, **cent_cnf)
+                            text=sunset_text, font=h2, **cent_cnf,
+                            pool=pool, key="sunset")
+        profile.mark("current")
 
         # DISPLAY HOURLY INFO.
 
@@ -954,27 +1287,23 @@ class DisplayShort(tk.Frame):
                                    "Parameters",
                                    "Icons-" + icon_size + "-" + icon_color)
 
-        # Here we iterate through w_d_short dictionary to confirm on
-        # which days we have rain and/or snow to display their
-        # corresponding icons properly without overlapping.
+        hourly = self.v_link[units]["hourly"]
+        """Hourly forecast stored in columns (ForecastSeries)."""
+
+        # Here we iterate through the day summary to confirm on which
+        # days we have rain and/or snow to display their corresponding
+        # icons properly without overlapping.
+        days = self.v_link[units]["days"]
+        """Per-day aggregates of the hourly forecast (DaySummary)."""
         rain_dates = {}
         snow_dates = {}
-        previous_date = ""
-        for item in self.v_link[units]["w_d_short"]["list"]:
-
-            for name in ["rain", "snow"]:
-                try:
-                    if item[name]["3h"]:
-                        date = self.begin_get_date(item["dt"])
-                        current_date = "{0:.3}, {1:.5}".format(
-                            date[0], date[1])
-                        if current_date != previous_date:
-                            if name == "rain":
-                                rain_dates[current_date] = "rain"
-                            else:
-                                snow_dates[current_date] = "snow"
-                except KeyError:
-                    pass
+        for index, date in enumerate(self.begin_get_times(days.dt)):
+            current_date = "{0:.3}, {1:.5}".format(date[0], date[1])
+            if days.rain[index] > 0:
+                rain_dates[current_date] = "rain"
+            if days.snow[index] > 0:
+                snow_dates[current_date] = "snow"
+        profile.mark("precipitation")
 
         day = None
         previous_day_text = ""
@@ -989,18 +1318,22 @@ class DisplayShort(tk.Frame):
         hr_snow_present = False
         hr_snow = None
 
-        for item in self.v_link[units]["w_d_short"]["list"]:
+        # Days, dates, hours and wind directions of the whole forecast
+        # at once.
+        hr_times = self.begin_get_times(hourly.dt)
+        hr_wind_dirs = self.begin_deg_conv_series(hourly.wind_deg)
+
+        for index in range(len(hourly)):
 
-            day_text = "{0:.3}, {1:.5}".format(
-                self.begin_get_date(item["dt"])[0],
-                self.begin_get_date(item["dt"])[1])
+            name_of_day, date_str, hour_text = hr_times[index]
+            day_text = "{0:.3}, {1:.5}".format(name_of_day, date_str)
 
             if previous_day_text == day_text:
                 pass
             else:
                 # Calculate y offset for the next day.
                 if date_index > 0 and hr_x_offset == 7:
-                    y1_day = self.main_canvas.bbox(day.id_num)[1]
+                    y1_day = day.bbox[1]
                     day_y_offset += 25 + max_y - y1_day
 
                 # Display date and day of the week.
@@ -1008,14 +1341,16 @@ class DisplayShort(tk.Frame):
                                  rel_pos="BL",
                                  offset=(0, 86 + day_y_offset),
                                  text=day_text, justify=tk.LEFT, font=h3,
-                                 **hr_nw_cnf)
+                                 **hr_nw_cnf,
+                                 pool=pool, key=("day", date_index))
 
                 # Draw temperature icon.
                 icon_path = os.path.join(icon_prefix, "temperature.png")
                 self.hr_temp_icons.append(
                     CanvasImg(self.main_canvas, icon_path,
                               rel_obj=day, rel_pos="BL", offset=(0, 0),
-                              **hr_img_nw_cnf))
+                              **hr_img_nw_cnf,
+                              pool=pool, key=("hr_temp_icons", date_index)))
 
                 # Draw pressure icon.
                 icon_path = os.path.join(icon_prefix,
@@ -1023,35 +1358,43 @@ class DisplayShort(tk.Frame):
                 self.hr_pressure_icons.append(
                     CanvasImg(self.main_canvas, icon_path,
                               rel_obj=self.hr_temp_icons[-1], rel_pos="BL",
-                              offset=(0, 0), **hr_img_nw_cnf))
+                              offset=(0, 0), **hr_img_nw_cnf,
+                              pool=pool,
+                              key=("hr_pressure_icons", date_index)))
 
                 # Draw cloud coverage icon.
                 icon_path = os.path.join(icon_prefix, "cloud.png")
                 self.hr_cloud_icons.append(
                     CanvasImg(self.main_canvas, icon_path,
                               rel_obj=self.hr_pressure_icons[-1], rel_pos="BL",
-                              offset=(0, 0), **hr_img_nw_cnf))
+                              offset=(0, 0), **hr_img_nw_cnf,
+                              pool=pool, key=("hr_cloud_icons", date_index)))
 
                 # Draw humidity icon.
                 icon_path = os.path.join(icon_prefix, "humidity.png")
                 self.hr_humidity_icons.append(
                     CanvasImg(self.main_canvas, icon_path,
                               rel_obj=self.hr_cloud_icons[-1], rel_pos="BL",
-                              offset=(0, 0), **hr_img_nw_cnf))
+                              offset=(0, 0), **hr_img_nw_cnf,
+                              pool=pool,
+                              key=("hr_humidity_icons", date_index)))
 
                 # Draw wind icon.
                 icon_path = os.path.join(icon_prefix, "windsock_filled.png")
                 self.hr_wind_icons.append(
                     CanvasImg(self.main_canvas, icon_path,
                               rel_obj=self.hr_humidity_icons[-1], rel_pos="BL",
-                              offset=(0, 0), **hr_img_nw_cnf))
+                              offset=(0, 0), **hr_img_nw_cnf,
+                              pool=pool, key=("hr_wind_icons", date_index)))
 
                 # Draw wind direction icon.
                 icon_path = os.path.join(icon_prefix, "wind_rose.png")
                 self.hr_wind_dir_icons.append(
                     CanvasImg(self.main_canvas, icon_path,
                               rel_obj=self.hr_wind_icons[-1], rel_pos="BL",
-                              offset=(0, 0), **hr_img_nw_cnf))
+                              offset=(0, 0), **hr_img_nw_cnf,
+                              pool=pool,
+                              key=("hr_wind_dir_icons", date_index)))
 
                 # Draw rain icon if phenomena present during the day.
                 if day_text in rain_dates:
@@ -1060,7 +1403,9 @@ class DisplayShort(tk.Frame):
                         CanvasImg(self.main_canvas, icon_path,
                                   rel_obj=self.hr_wind_dir_icons[-1],
                                   rel_pos="BL", offset=(0, 0),
-                                  **hr_img_nw_cnf))
+                                  **hr_img_nw_cnf,
+                                  pool=pool,
+                                  key=("hr_rain_icons", date_index)))
 
                 # Draw snow icon if phenomena present during the day.
                 if day_text in rain_dates:
@@ -1074,7 +1419,9 @@ class DisplayShort(tk.Frame):
                         CanvasImg(self.main_canvas, icon_path,
                                   rel_obj=rel_obj_icon,
                                   rel_pos="BL", offset=(0, 0),
-                                  **hr_img_nw_cnf))
+                                  **hr_img_nw_cnf,
+                                  pool=pool,
+                                  key=("hr_snow_icons", date_index)))
 
                 previous_day_text = day_text
                 date_index += 1
@@ -1083,88 +1430,94 @@ class DisplayShort(tk.Frame):
                 day_snow_present = False
 
             # Hour.
-            hour_text = self.begin_get_time(item["dt"])
             hr_x_offset = self.get_hr_x_offset(hour_text)
             hour = CanvasText(self.main_canvas, rel_obj=day, rel_pos="CL",
                               offset=(130 + hr_x_offset * 115, 0),
                               text=hour_text, justify=tk.CENTER, font=h3,
-                              **hr_w_cnf)
+                              **hr_w_cnf,
+                              pool=pool, key=("hour", index))
 
             # Hourly Weather icon.
             icon_path = os.path.join(app_icons, "Weather",
-                                     item["weather"][0]["icon"] + ".png")
+                                     hourly.icons[index] + ".png")
             self.hr_weather_icons.append(
                 CanvasImg(self.main_canvas, icon_path, rel_obj=hour,
-                          rel_pos="BC", offset=(0, -5), **hr_img_n_cnf))
+                          rel_pos="BC", offset=(0, -5), **hr_img_n_cnf,
+                          pool=pool, key=("hr_weather_icons", index)))
 
             # Hourly temperature.
             hr_temp_text = "{0:.1f}\N{DEGREE SIGN}{sign}".format(
-                item["main"]["temp"], sign=sign)
+                hourly.temp[index], sign=sign)
 
             hr_temp = CanvasText(self.main_canvas,
                                  rel_obj=hour,
                                  rel_pos="BR",
                                  offset=(-1, 40), fill=self.get_color(),
-                                 text=hr_temp_text, font=h3, **hr_ne_cnf)
+                                 text=hr_temp_text, font=h3, **hr_ne_cnf,
+                                 pool=pool, key=("hr_temp", index))
             # Update hr_temp_icon y coordinate to center of hr_temp.
             self.hr_temp_icons[-1].move_rel_to_obj_y(hr_temp)
 
             # Hourly pressure.
-            hr_pressure_text = "{0:.1f} hPa".format(item["main"]["pressure"])
+            hr_pressure_text = "{0:.1f} hPa".format(hourly.pressure[index])
             hr_pressure = CanvasText(self.main_canvas, rel_obj=hr_temp,
                                      rel_pos="BR",
                                      offset=(-2, 5), fill=self.get_color(),
                                      text=hr_pressure_text, font=h4,
-                                     **hr_ne_cnf)
+                                     **hr_ne_cnf,
+                                     pool=pool, key=("hr_pressure", index))
             # Update hr_pressure_icon y coordinate to center of
             # hr_pressure.
             self.hr_pressure_icons[-1].move_rel_to_obj_y(hr_pressure)
 
             # Hourly cloud coverage.
-            hr_cloud_text = "{0}%".format(item["clouds"]["all"])
+            hr_cloud_text = "{0:.0f}%".format(hourly.clouds[index])
             hr_cloud = CanvasText(self.main_canvas, rel_obj=hr_pressure,
                                   rel_pos="BR",
                                   offset=(0, 5), fill=self.get_color(),
-                                  text=hr_cloud_text, font=h4, **hr_ne_cnf)
+                                  text=hr_cloud_text, font=h4, **hr_ne_cnf,
+                                  pool=pool, key=("hr_cloud", index))
             # Update hr_cloud_icon y coordinate to center of hr_cloud.
             self.hr_cloud_icons[-1].move_rel_to_obj_y(hr_cloud)
 
             # Hourly humidity.
-            hr_humidity_text = "{0}%".format(item["main"]["humidity"])
+            hr_humidity_text = "{0:.0f}%".format(hourly.humidity[index])
             hr_humidity = CanvasText(self.main_canvas, rel_obj=hr_cloud,
                                      rel_pos="BR",
                                      offset=(-1, 5), fill=self.get_color(),
                                      text=hr_humidity_text, font=h4,
-                                     **hr_ne_cnf)
+                                     **hr_ne_cnf,
+                                     pool=pool, key=("hr_humidity", index))
             # Update hr_humidity_icon y coordinate to center of
             # hr_humidity.
             self.hr_humidity_icons[-1].move_rel_to_obj_y(hr_humidity)
 
             # Hourly wind speed.
-            hr_wind_text = "{0:.1f} {1}".format(item["wind"]["speed"],
+            hr_wind_text = "{0:.1f} {1}".format(hourly.wind_speed[index],
                                                 speed_unit)
             hr_wind = CanvasText(self.main_canvas, rel_obj=hr_humidity,
                                  rel_pos="BR",
                                  offset=(-1, 5), fill=self.get_color(),
-                                 text=hr_wind_text, font=h4, **hr_ne_cnf)
+                                 text=hr_wind_text, font=h4, **hr_ne_cnf,
+                                 pool=pool, key=("hr_wind", index))
             # Update hr_wind_icon y coordinate to center of hr_wind.
             self.hr_wind_icons[-1].move_rel_to_obj_y(hr_wind)
 
             # Hourly wind direction.
-            hr_wind_dir_text = "{0}".format(
-                self.begin_deg_conv(item["wind"]["deg"]))
+            hr_wind_dir_text = "{0}".format(hr_wind_dirs[index])
             hr_wind_dir = CanvasText(self.main_canvas, rel_obj=hr_wind,
                                      rel_pos="BR",
                                      offset=(-1, 5), fill=self.get_color(),
                                      text=hr_wind_dir_text, font=h4,
-                                     **hr_ne_cnf)
+                                     **hr_ne_cnf,
+                                     pool=pool, key=("hr_wind_dir", index))
             # Update hr_wind_dir_icon y coordinate to center of
             # hr_wind_dir.
             self.hr_wind_dir_icons[-1].move_rel_to_obj_y(hr_wind_dir)
 
             # Hourly Rain.
-            try:
-                rain_amount = item["rain"]["3h"]
+            rain_amount = hourly.rain[index]
+            if not math.isnan(rain_amount):
                 prefix = ""
                 if rain_amount < 0.1:
                     prefix = u"\u2248 "
@@ -1175,7 +1528,8 @@ class DisplayShort(tk.Frame):
                                      rel_pos="BR",
                                      offset=(-1, 10), fill=self.get_color(),
                                      text=rain_text, font=h4,
-                                     **hr_ne_cnf)
+                                     **hr_ne_cnf,
+                                     pool=pool, key=("hr_rain", index))
                 # Update hr_rain_icon y coordinate to center of
                 # hr_rain.
                 if not day_rain_present:
@@ -1185,12 +1539,9 @@ class DisplayShort(tk.Frame):
                 day_rain_present = True
                 hr_rain_present = True
 
-            except KeyError:
-                pass
-
             # Hourly Snow.
-            try:
-                snow_amount = item["snow"]["3h"]
+            snow_amount = hourly.snow[index]
+            if not math.isnan(snow_amount):
                 prefix = ""
                 if snow_amount < 0.1:
                     prefix = u"\u2248 "
@@ -1209,7 +1560,8 @@ class DisplayShort(tk.Frame):
                                      rel_pos="BR",
                                      offset=offset, fill=self.get_color(),
                                      text=snow_text, font=h4,
-                                     **hr_ne_cnf)
+                                     **hr_ne_cnf,
+                                     pool=pool, key=("hr_snow", index))
                 # Update hr_snow_icon y coordinate to center of
                 # hr_snow.
                 if not day_snow_present:
@@ -1219,27 +1571,39 @@ class DisplayShort(tk.Frame):
                 day_snow_present = True
                 hr_snow_present = True
 
-            except KeyError:
-                pass
-
             # Get the maximum y coordinate present on the canvas.
             if hr_snow_present:
-                cur_y = self.main_canvas.bbox(hr_snow.id_num)[3]
+                cur_y = hr_snow.bbox[3]
             elif hr_rain_present:
-                cur_y = self.main_canvas.bbox(hr_rain.id_num)[3]
+                cur_y = hr_rain.bbox[3]
             else:
-                cur_y = self.main_canvas.bbox(hr_wind_dir.id_num)[3]
+                cur_y = hr_wind_dir.bbox[3]
             if cur_y > max_y:
                 max_y = cur_y
 
             hr_snow_present = False
             hr_rain_present = False
             self.hr_start_color = True
-
+        profile.mark("hourly")
+
+        # DISPLAY DAILY FORECAST below the hourly one.
+        daily = self.v_link[units].get("daily")
+        if daily is not None and len(daily):
+            self.display_daily(self.get_daily_rows(daily, sign, speed_unit),
+                               pool.bbox()[3] + 40)
+        profile.mark("daily")
+
+        # Draw the visible part of the report at once. The rest is drawn
+        # when scrolled into view.
+        pool.end(self.main_canvas, self.get_view())
+        profile.mark("draw")
         # self.update()
-        self.main_canvas.config(
-            scrollregion=self.main_canvas.bbox("main", "hourly"))
-        self.yscrollbar.focus()
+        self.main_canvas.config(scrollregion=pool.bbox())
+        # Keyboard focus is given by WeatherApp.show_display, hidden
+        # displays are rendered after the selected one is shown.
+        profile.mark("scrollregion")
+        if profile.enabled:
+            self.controller.save_render_profile(profile.to_dict(units))
 
 
 class HoverButton(tk.Button):
@@ -1323,6 +1687,462 @@ class HoverButton(tk.Button):
             self.v_link["var_status"].set("")
 
 
+class ImageCache(object):
+    """Cache of images displayed on canvases.
+
+    Every image file is opened and converted to a PhotoImage only once
+    per Tk root, images exist only in the interpreter of the root they
+    were created for. The same PhotoImage is then shared by all
+    canvases and reports (e.g. metric and imperial displays). Cached
+    images are kept referenced here so they never get garbage
+    collected while in use, images of a destroyed root are dropped
+    with it.
+
+    :Attributes:
+    :images (weakref.WeakKeyDictionary): Images of each Tk root keyed
+        by (path, size).
+    :hits (int): Amount of images served from the cache.
+    :misses (int): Amount of images decoded from disk.
+
+    """
+
+    images = weakref.WeakKeyDictionary()
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get(cls, root, path, size=None):
+        """Returns image for path, decoding it on first use.
+
+        Args:
+            root (tk.Misc): Any widget of the application.
+            path (str): Path to the image file.
+            size (tuple[int, int]): Width and height to resize the image
+                to. None keeps the size of the file.
+
+        Returns:
+            image (PIL.ImageTk.PhotoImage): Image ready to display.
+        """
+        root = root._root()
+        images = cls.images.setdefault(root, {})
+        key = (path, size)
+        try:
+            image = images[key]
+        except KeyError:
+            cls.misses += 1
+            img = Image.open(path)
+            if size is not None:
+                img = img.resize(size, Image.LANCZOS)
+            image = images[key] = ImageTk.PhotoImage(img, master=root)
+        else:
+            cls.hits += 1
+        return image
+
+    @classmethod
+    def stats(cls):
+        """Returns cache statistics.
+
+        Returns:
+            stats (dict[str, int]): Amount of hits, misses and cached
+                images.
+        """
+        return {"hits": cls.hits, "misses": cls.misses,
+                "size": sum(len(images) for images in cls.images.values())}
+
+    @classmethod
+    def clear(cls):
+        """Removes all cached images and resets statistics.
+
+        Returns:
+            None
+        """
+        cls.images.clear()
+        cls.hits = 0
+        cls.misses = 0
+
+
+class CanvasItemPool(object):
+    """Canvas items belonging to a single report.
+
+    Every canvas object of a report is placed under a key naming its 
+    logical cell (e.g. ("hr_temp", 5) for temperature of the sixth 
+    forecast item). Objects are only laid out while the report is
+    built; the canvas is updated in one batch when it is finished. The 
+    item already on the canvas for each key is reused and only moved or 
+    reconfigured with options which changed. Items whose keys were not
+    placed again are deleted.
+    With a view given only objects within it (and margin around it) 
+    get canvas items at the end of a redraw. The rest waits until the
+    view is moved over them with show.
+    Also owns lists of canvas objects created while drawing a report 
+    which are emptied before every redraw.
+
+    """
+
+    def __init__(self, tags, margin=0):
+        """Initialise class.
+
+        Args:
+            tags (tuple[str]): Tags of all canvas items of the report.
+            margin (int): Distance in pixels above and below the view 
+                within which objects are drawn ahead of scrolling.
+
+        :Attributes:
+        :tags (tuple[str]): Tags of all canvas items of the report.
+        :lists (list[list[CanvasObject]]): Lists of canvas objects of
+            the report.
+        :items (dict[object, list]): Canvas item of each key stored as
+            [id_num, kind, position, options].
+        :placed (dict[object, tuple]): Objects placed during the 
+            current redraw stored as (object, kind, options) in order of
+            placing.
+        :deferred (list): Keys of placed objects outside of the view
+            which have no canvas items yet.
+        :margin (int): Distance in pixels above and below the view 
+            within which objects are drawn ahead of scrolling.
+        :releases (int): Amount of times the pool was released.
+        :creates (int): Amount of canvas items created.
+        :updates (int): Amount of itemconfigure calls.
+        """
+        self.tags = tags
+        self.lists = []
+        self.items = {}
+        self.placed = {}
+        self.deferred = []
+        self.margin = margin
+        self.releases = 0
+        self.creates = 0
+        self.updates = 0
+
+    def new_list(self):
+        """Creates an empty list of canvas objects owned by the pool.
+
+        Returns:
+            objects (list[CanvasObject]): List emptied on every redraw.
+        """
+        objects = []
+        self.lists.append(objects)
+        return objects
+
+    def __len__(self):
+        return sum(len(objects) for objects in self.lists)
+
+    def begin(self):
+        """Starts a redraw of the report.
+
+        Empties all lists in place so references held to them stay 
+        valid. Canvas items are kept for reuse.
+
+        Returns:
+            None
+        """
+        for objects in self.lists:
+            objects.clear()
+        self.placed = {}
+        self.deferred = []
+
+    def place(self, key, canvas_object, kind, options):
+        """Registers a laid out object to be drawn for key.
+
+        Args:
+            key (object): Hashable name of the logical cell.
+            canvas_object (CanvasObject): Object with its final
+                position.
+            kind (str): Type of canvas item: "text" or "image".
+            options (dict): Options for create_text / create_image.
+
+        Returns:
+            None
+        """
+        if key in self.placed:
+            raise ValueError("Canvas item {0!r} placed twice.".format(key))
+        self.placed[key] = (canvas_object, kind, options)
+
+    def bbox(self):
+        """Bounding box of all objects placed during the current redraw.
+
+        Returns:
+            bbox (tuple[int, int, int, int]): x1, y1, x2, y2 of the 
+                area covered. None if nothing was placed.
+        """
+        if not self.placed:
+            return None
+        boxes = [canvas_object.bbox
+                 for canvas_object, _, _ in self.placed.values()]
+        return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+    def end(self, canvas, view=None):
+        """Finishes a redraw by drawing objects placed during it.
+
+        Items drawn before for the same keys are reused. Items not 
+        placed again are deleted. New items are only created for objects
+        within view.
+
+        Args:
+            canvas (tk.Canvas): Canvas the report is drawn on.
+            view (tuple[float, float]): Top and bottom y coordinates of
+                the visible part of canvas. None draws all objects.
+
+        Returns:
+            None
+        """
+        stale = [key for key in self.items if key not in self.placed]
+        if stale:
+            canvas.delete(*[self.items.pop(key)[0] for key in stale])
+
+        for key in self.placed:
+            if key in self.items or self.in_view(key, view):
+                self.draw(canvas, key)
+            else:
+                self.deferred.append(key)
+
+    def show(self, canvas, view):
+        """Draws objects of the current report which came into view.
+
+        Args:
+            canvas (tk.Canvas): Canvas the report is drawn on.
+            view (tuple[float, float]): Top and bottom y coordinates of
+                the visible part of canvas.
+
+        Returns:
+            None
+        """
+        if not self.deferred:
+            return
+        deferred = []
+        for key in self.deferred:
+            if self.in_view(key, view):
+                self.draw(canvas, key)
+            else:
+                deferred.append(key)
+        self.deferred = deferred
+
+    def in_view(self, key, view):
+        """Checks if placed object is within view extended by margin.
+
+        Args:
+            key (object): Hashable name of the logical cell.
+            view (tuple[float, float]): Top and bottom y coordinates of
+                the visible part of canvas. None for the whole canvas.
+
+        Returns:
+            (bool): True if the object should be drawn.
+        """
+        if view is None:
+            return True
+        bbox = self.placed[key][0].bbox
+        return (bbox[3] >= view[0] - self.margin
+                and bbox[1] <= view[1] + self.margin)
+
+    def draw(self, canvas, key):
+        """Draws placed object reusing canvas item drawn before for key.
+
+        Args:
+            canvas (tk.Canvas): Canvas the report is drawn on.
+            key (object): Hashable name of the logical cell.
+
+        Returns:
+            None
+        """
+        canvas_object, kind, options = self.placed[key]
+        position = (canvas_object.pos_x, canvas_object.pos_y)
+        item = self.items.get(key)
+        if item is not None:
+            id_num, item_kind, item_position, item_options = item
+            if item_kind == kind and item_options.keys() == options.keys():
+                if item_position != position:
+                    canvas.coords(id_num, *position)
+                    item[2] = position
+                changed = {name: value
+                           for name, value in options.items()
+                           if item_options[name] != value}
+                if changed:
+                    canvas.itemconfigure(id_num, **changed)
+                    item[3] = options
+                    self.updates += 1
+                canvas_object.id_num = id_num
+                return
+            # Options can not be removed from an item, draw it again.
+            canvas.delete(id_num)
+
+        if kind == "text":
+            id_num = canvas.create_text(*position, **options)
+        else:
+            id_num = canvas.create_image(*position, **options)
+        self.items[key] = [id_num, kind, position, options]
+        canvas_object.id_num = id_num
+        self.creates += 1
+
+    def release(self, canvas):
+        """Deletes all canvas items of the report and empties all lists.
+
+        Args:
+            canvas (tk.Canvas): Canvas the report is drawn on.
+
+        Returns:
+            None
+        """
+        canvas.delete(*self.tags)
+        self.items.clear()
+        self.begin()
+        self.releases += 1
+
+
+class FontMetrics(object):
+    """Measures of a font taken from Tk once and reused.
+
+    Width of each text is measured by Tk as a whole, so kerning and
+    characters drawn from fallback fonts are accounted for, and reused
+    whenever the same text is laid out again. Fonts are measured
+    separately for each Tk root, metrics of a destroyed root are
+    dropped with it.
+
+    :Attributes:
+    :fonts (weakref.WeakKeyDictionary): Measured fonts of each Tk root
+        keyed by font description.
+    :max_widths (int): Amount of widths kept by each font. All of them
+        are forgotten when exceeded.
+
+    """
+
+    fonts = weakref.WeakKeyDictionary()
+    max_widths = 4096
+
+    def __init__(self, font):
+        """Initialise class.
+
+        Args:
+            font (tkinter.font.Font): Font to measure.
+
+        :Attributes:
+        :font (tkinter.font.Font): Measured font.
+        :linespace (int): Height of a line of text.
+        :widths (dict[str, int]): Width of each text measured.
+        """
+        self.font = font
+        self.linespace = font.metrics("linespace")
+        self.widths = {}
+
+    @classmethod
+    def get(cls, root, font=None):
+        """Returns metrics of a font measuring it on first use.
+
+        Args:
+            root (tk.Misc): Any widget of the application.
+            font (tuple | str): Font description as given to canvas
+                items. None for the default canvas text font.
+
+        Returns:
+            metrics (FontMetrics): Metrics of the font.
+        """
+        if font is None:
+            font = "TkDefaultFont"
+        fonts = cls.fonts.setdefault(root._root(), {})
+        try:
+            return fonts[font]
+        except KeyError:
+            metrics = fonts[font] = cls(tkfont.Font(root=root, font=font))
+            return metrics
+
+    def measure(self, text):
+        """Returns width of a text in pixels.
+
+        Args:
+            text (str): Single line of text.
+
+        Returns:
+            width (int): Width of the text.
+        """
+        try:
+            return self.widths[text]
+        except KeyError:
+            if len(self.widths) >= self.max_widths:
+                self.widths.clear()
+            width = self.widths[text] = self.font.measure(text)
+            return width
+
+
+class RenderProfile(object):
+    """Timings and counters of drawing a single report.
+
+    Drawing is split into consecutive phases, each ended by a call to
+    mark. Canvas items and decoded images are counted as differences of
+    the counters of CanvasItemPool and ImageCache. A disabled profile
+    records nothing.
+
+    """
+
+    def __init__(self, pool, enabled=True):
+        """Initialise class and start timing the first phase.
+
+        Args:
+            pool (CanvasItemPool): Pool of the report being drawn.
+            enabled (bool): Set to False to skip recording.
+
+        :Attributes:
+        :pool (CanvasItemPool): Pool of the report being drawn.
+        :enabled (bool): True if the profile is recorded.
+        :phases (list[tuple[str, float]]): Name and duration in seconds
+            of every finished phase.
+        :start (float): Time when drawing started.
+        :last (float): Time when the last phase finished.
+        :counters (dict[str, int]): Values of the pool and image cache
+            counters when drawing started.
+        """
+        self.pool = pool
+        self.enabled = enabled
+        self.phases = []
+        if enabled:
+            self.counters = self.get_counters()
+            self.start = self.last = time.perf_counter()
+
+    def get_counters(self):
+        """Reads the counters of the pool and of the image cache.
+
+        Returns:
+            counters (dict[str, int]): Current counter values.
+        """
+        return {"items_created": self.pool.creates,
+                "items_updated": self.pool.updates,
+                "images_decoded": ImageCache.misses,
+                "images_reused": ImageCache.hits}
+
+    def mark(self, phase):
+        """Finishes a phase of drawing.
+
+        Args:
+            phase (str): Name of the phase.
+
+        Returns:
+            None
+        """
+        if self.enabled:
+            now = time.perf_counter()
+            self.phases.append((phase, now - self.last))
+            self.last = now
+
+    def to_dict(self, units):
+        """Summarises the profile.
+
+        Args:
+            units (str): Unit system of the report.
+
+        Returns:
+            profile (dict): Durations of phases and the total in
+                milliseconds and counter differences, suitable for 
+                saving as json.
+        """
+        profile = {"units": units,
+                   "phases_ms": {phase: round(seconds * 1000, 3)
+                                 for phase, seconds in self.phases},
+                   "total_ms": round((self.last - self.start) * 1000, 3),
+                   "items_deferred": len(self.pool.deferred)}
+        for name, value in self.get_counters().items():
+            profile[name] = value - self.counters[name]
+        return profile
+
+
 class CanvasObject(object):
     """Base class to create objects on canvas.
 
@@ -1339,7 +2159,7 @@ class CanvasObject(object):
     """
 
     def __init__(self, canvas, coordinates=None, rel_obj=None,
-                 rel_pos=None, offset=None):
+                 rel_pos=None, offset=None, pool=None, key=None):
         """Initialise class - calculate x-y coordinates for our object.
 
         Allows positioning in relation to the rel_obj (CanvasText or 
@@ -1368,6 +2188,10 @@ class CanvasObject(object):
                 BR - bottom-right
             offset (tuple): Offset given as a pair of values to move the
                 newly created object away from the relative object.
+            pool (CanvasItemPool): Pool reusing canvas items between
+                redraws. None creates a new canvas item.
+            key (object): Name of the logical cell of the object in 
+                pool.
 
         :Attributes:
         :id_num (int): Unique id number of the CanvasObject given by 
@@ -1375,9 +2199,16 @@ class CanvasObject(object):
         :canvas (tk.Canvas): tkinter Canvas object.
         :pos_x (int): X coordinate for our object.
         :pos_y (int): Y coordinate for our object.
+        :pool (CanvasItemPool): Pool owning the canvas item.
+        :key (object): Name of the logical cell of the object in pool.
+        :bbox (tuple[int, int, int, int]): Bounding box of the object
+            as canvas.bbox would return it. Set by the subclass.
         """
         self.id_num = 0
         self.canvas = canvas
+        self.pool = pool
+        self.key = key
+        self.bbox = None
         pos_x = 0
         pos_y = 0
 
@@ -1393,7 +2224,7 @@ class CanvasObject(object):
         elif rel_obj is not None and rel_pos is not None:
             # Get Top-Left and Bottom-Right bounding points of the
             # relative object.
-            r_x1, r_y1, r_x2, r_y2 = canvas.bbox(rel_obj.id_num)
+            r_x1, r_y1, r_x2, r_y2 = rel_obj.bbox
 
             # Determine position of CanvasObject on canvas in relation
             # to the rel_obj.
@@ -1435,6 +2266,30 @@ class CanvasObject(object):
         self.pos_x = int(pos_x + offset_x)
         self.pos_y = int(pos_y + offset_y)
 
+    def set_bbox(self, width, height, anchor, fudge=0):
+        """Calculate bounding box of the object the way Tk does.
+
+        Args:
+            width (int): Width of the object.
+            height (int): Height of the object.
+            anchor (str): Anchor of the object on canvas.
+            fudge (int): Extra space added by Tk on the left and right.
+
+        Returns:
+            None
+        """
+        x1 = self.pos_x
+        y1 = self.pos_y
+        if anchor in (tk.N, tk.CENTER, tk.S):
+            x1 -= width // 2
+        elif anchor in (tk.NE, tk.E, tk.SE):
+            x1 -= width
+        if anchor in (tk.W, tk.CENTER, tk.E):
+            y1 -= height // 2
+        elif anchor in (tk.SW, tk.S, tk.SE):
+            y1 -= height
+        self.bbox = (x1 - fudge, y1, x1 + width + fudge, y1 + height)
+
     def move_rel_to_obj_y(self, rel_obj):
         """Move obj relative to rel_obj in y direction. 
         Initially aligning centers of the vertical side of objects is 
@@ -1448,19 +2303,23 @@ class CanvasObject(object):
             None
         """
         # Find y coordinate of the center of rel_obj.
-        r_x1, r_y1, r_x2, r_y2 = self.canvas.bbox(rel_obj.id_num)
+        r_x1, r_y1, r_x2, r_y2 = rel_obj.bbox
         r_center_y = r_y2 - (r_y2 - r_y1) / 2
 
         # Find y coordinate of the center of our object.
-        x1, y1, x2, y2 = self.canvas.bbox(self.id_num)
+        x1, y1, x2, y2 = self.bbox
         center_y = y2 - (y2 - y1) / 2
 
         # Find the delta.
         dy = int(r_center_y - center_y)
 
-        # Move obj.
-        self.canvas.move(self.id_num, 0, dy)
-        self.pos_y += dy
+        # Move obj. Objects in a pool are drawn when the pool is 
+        # finished so only their position changes.
+        if dy:
+            self.pos_y += dy
+            self.bbox = (x1, y1 + dy, x2, y2 + dy)
+            if self.pool is None:
+                self.canvas.move(self.id_num, 0, dy)
 
 
 class CanvasText(CanvasObject):
@@ -1475,7 +2334,7 @@ class CanvasText(CanvasObject):
     """
 
     def __init__(self, canvas, coordinates=None, rel_obj=None,
-                 rel_pos=None, offset=None, **args):
+                 rel_pos=None, offset=None, pool=None, key=None, **args):
         """Initialise class.
 
         Allows positioning in relation to the rel_obj (CanvasText or 
@@ -1506,6 +2365,9 @@ class CanvasText(CanvasObject):
                 BR - bottom-right
             offset (tuple): Offset given as a pair of values to move the
                 newly created text away from the relative object.
+            pool (CanvasItemPool): Pool reusing canvas items between
+                redraws. None creates a new canvas item.
+            key (object): Name of the logical cell of the text in pool.
             **args: All the other arguments we need to pass to 
                 create_text method.
 
@@ -1516,11 +2378,24 @@ class CanvasText(CanvasObject):
         """
         # Initialise base class. Get x-y coordinates for CanvasText
         # object.
-        super().__init__(canvas, coordinates, rel_obj, rel_pos, offset)
-
-        # Create text on canvas.
-        id_num = canvas.create_text(self.pos_x, self.pos_y, **args)
-        self.id_num = id_num
+        super().__init__(canvas, coordinates, rel_obj, rel_pos, offset,
+                         pool, key)
+
+        # Lay out text from font metrics. Every line takes linespace and
+        # the widest one sets the width. Tk adds one pixel on each side
+        # for the insertion cursor.
+        metrics = FontMetrics.get(canvas, args.get("font"))
+        lines = str(args.get("text", "")).split("\n")
+        self.set_bbox(max(metrics.measure(line) for line in lines),
+                      metrics.linespace * len(lines),
+                      args.get("anchor", tk.CENTER), fudge=1)
+
+        # Create text on canvas or leave it to the pool.
+        if pool is None:
+            self.id_num = canvas.create_text(self.pos_x, self.pos_y,
+                                             **args)
+        else:
+            pool.place(key, self, "text", args)
 
 
 class CanvasImg(CanvasObject):
@@ -1535,7 +2410,7 @@ class CanvasImg(CanvasObject):
     """
 
     def __init__(self, canvas, image, coordinates=None, rel_obj=None,
-                 rel_pos=None, offset=None, **args):
+                 rel_pos=None, offset=None, pool=None, key=None, **args):
         """Initialise class.
          
         Allows positioning in relation to the rel_obj (CanvasText or 
@@ -1567,6 +2442,9 @@ class CanvasImg(CanvasObject):
                 BR - bottom-right
             offset (tuple): Offset given as a pair of values to move the
                 newly created text away from the relative object.
+            pool (CanvasItemPool): Pool reusing canvas items between
+                redraws. None creates a new canvas item.
+            key (object): Name of the logical cell of the image in pool.
             **args: All the other arguments we need to pass to 
                 create_text method.
 
@@ -1578,15 +2456,22 @@ class CanvasImg(CanvasObject):
         """
         # Initialise base class. Get x-y coordinates for CanvasImg
         # object.
-        super().__init__(canvas, coordinates, rel_obj, rel_pos, offset)
+        super().__init__(canvas, coordinates, rel_obj, rel_pos, offset,
+                         pool, key)
 
         # Prepare image for insertion. Should work with most image file
-        # formats.
-        img = Image.open(image)
-        self.img = ImageTk.PhotoImage(img)
-        id_num = canvas.create_image(self.pos_x, self.pos_y, image=self.img,
-                                     **args)
-        self.id_num = id_num
+        # formats. Each file is decoded only once per Tk root.
+        self.img = ImageCache.get(canvas, image)
+        self.set_bbox(self.img.width(), self.img.height(),
+                      args.get("anchor", tk.CENTER))
+
+        # Create image on canvas or leave it to the pool.
+        if pool is None:
+            self.id_num = canvas.create_image(self.pos_x, self.pos_y,
+                                              image=self.img, **args)
+        else:
+            args["image"] = self.img
+            pool.place(key, self, "image", args)
 
 
 # Launch application.